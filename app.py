@@ -12,6 +12,9 @@ try:
     import pdf_tools       # (PDF, 텍스트 트렌드 분석 모듈)
     import visual_analyzer      # (시각 분석 모듈)
     import cardnews_generator   # (카드뉴스 텍스트 생성 모듈)
+    import trend_analytics      # (검색 관심도 변화 분석 모듈)
+    from pipeline import run_stages  # (작업 동시 실행기)
+    import instrumentation      # (작업별 시간/토큰 계측)
 except ImportError as e:
     print(f"🚨 [app.py] 모듈 import 실패! {e}")
     print("   파일 이름(analysis_tools.py 등)이 올바른지 확인하세요.")
@@ -21,86 +24,134 @@ except Exception as e:
     exit()
 
 # ----------------------------------------------------
-# 2. (가상) 프론트엔드에서 넘어온 입력 데이터
+# 작업별 제한 시간(초) - 넘기면 그 작업만 실패로 처리하고 나머지는 계속 진행
 # ----------------------------------------------------
-print("--- [메인 서버] 프론트엔드로부터 요청 수신 (시뮬레이션) ---")
-USER_THEME = "2030 연인들을 위한 로맨틱하고 감성적인 크리스마스 축제"
-script_dir = os.path.dirname(os.path.abspath(__file__))
-PDF_FILE_PATH = os.path.join(script_dir, "sample_plan.pdf")
-KEYWORDS = ["양림 산타 축제", "크리스마스 데이트", "따뜻함"]
+STAGE_TIMEOUTS = {
+    "analysis": 240,
+    "trends": 60,
+    "trend_signals": 60,
+    "naver_buzzwords": 30,
+    "visual": 90,
+    "cardnews": 180,
+}
 
-# 최종 결과를 담을 딕셔너리
-final_response_to_frontend = {}
+# 이 작업들이 실패하면 전체 결과를 '실패'로 봅니다. (나머지는 빠져도 카드뉴스는 만들 수 있음)
+REQUIRED_STAGES = ("analysis", "cardnews")
 
-# ----------------------------------------------------
-# 3. 백엔드 모듈 순차 실행 (지휘)
-# ----------------------------------------------------
-try:
-    print("\n--- [메인 서버] 1. 기획서/트렌드 분석 시작 ---")
-    
-    # [호출 1] pdf_tools.py의 analyze_pdf 함수
-    pdf_data = pdf_tools.analyze_pdf(PDF_FILE_PATH)
-    final_response_to_frontend["analysis_summary"] = pdf_data
-    if "error" in pdf_data:
-        raise Exception(f"PDF 분석 실패: {pdf_data['error']}")
-    
-    # [호출 2] pdf_tools.py의 get_google_trends 함수
-    trend_data = pdf_tools.get_google_trends(KEYWORDS)
-    final_response_to_frontend["trend_summary"] = trend_data
-    if "error" in trend_data:
-        raise Exception(f"트렌드 분석 실패: {trend_data['error']}")
-    
-    # [호출 3] pdf_tools.py의 get_naver_buzzwords 함수
-    # (대표 키워드로 Naver 버즈워드를 수집)
-    naver_buzzwords = pdf_tools.get_naver_buzzwords(KEYWORDS[0])
-    final_response_to_frontend["naver_buzzwords"] = naver_buzzwords
-    print(f"    - Naver 버즈워드 수집: {naver_buzzwords[:3]}...")
-    
-    print("    ✅ 1. 분석 완료")
-
-
-    print("\n--- [메인 서버] 2. 시각 트렌드 분석 시작 ---")
-    
-    # [호출 3] visual_analyzer.py의 analyze_visual_trends 함수
-    visual_data = visual_analyzer.analyze_visual_trends(KEYWORDS[0]) # 대표 키워드로 검색
-    final_response_to_frontend["visual_summary"] = visual_data
-    print("    ✅ 2. 시각 분석 완료")
-    
-    
-    print("\n--- [메인 서버] 3. 최종 카드뉴스 텍스트 생성 시작 ---")
-    
-    # 'cardnews_generator'에 전달할 재료 가공
-    # (트렌드 결과에서 '키워드 리스트'만 추출)
-    trend_keywords_list = trend_data.get("top_related_queries", {}).get(KEYWORDS[0], [])
-    
-    # [호출 4] cardnews_generator.py의 create_cardnews_text 함수
-    cardnews_text_json = cardnews_generator.create_cardnews_text(
-        USER_THEME, 
-        pdf_data,                # PDF 요약본 (딕셔너리)
-        trend_keywords_list,      # 트렌드 연관 키워드 (리스트)
-        naver_buzzwords
-    )
-    final_response_to_frontend["cardnews_draft"] = cardnews_text_json
-    if "error" in cardnews_text_json:
-        raise Exception(f"카드뉴스 생성 실패: {cardnews_text_json['error']}")
-        
-    print("    ✅ 3. 카드뉴스 텍스트 생성 완료")
+# 작업 이름 → 프론트엔드로 보내는 JSON 키
+RESPONSE_KEYS = {
+    "analysis": "analysis_summary",
+    "trends": "trend_summary",
+    "trend_signals": "trend_signals",
+    "naver_buzzwords": "naver_buzzwords",
+    "visual": "visual_summary",
+    "cardnews": "cardnews_draft",
+}
+
+
+def run_pipeline(user_theme, pdf_file_path, keywords, on_stage_done=None):
+    """
+    기획서 분석 → 트렌드/시각 분석 → 카드뉴스 생성까지 전체 흐름을 실행하고,
+    프론트엔드에 보낼 '최종 종합 딕셔너리'를 반환합니다.
+
+    카드뉴스 생성만 다른 결과가 필요하므로, 나머지 4개 작업은 동시에 실행됩니다.
+    (전체 시간 = 가장 느린 작업 + 카드뉴스 생성)
+    on_stage_done(name, result, error) 을 주면 작업이 하나 끝날 때마다 호출합니다. (진행 상황 표시용)
+    """
+
+    # (시각 분석은 이미지가 하나 분석될 때마다 중간 결과를 여기에 갱신 - 카드뉴스는 끝날 때까지 기다리지 않고 있는 만큼 사용)
+    visual_progress = {}
+
+    def create_cardnews(analysis, trends, naver_buzzwords, trend_signals):
+        # 'cardnews_generator'에 전달할 재료 가공
+        if analysis is None:
+            raise Exception("PDF 분석 결과가 없어 카드뉴스를 만들 수 없습니다.")
+        # (트렌드 결과에서 '키워드 리스트'만 추출 - 트렌드가 실패했으면 빈 리스트)
+        trend_keywords_list = (trends or {}).get("top_related_queries", {}).get(keywords[0], [])
+        return cardnews_generator.create_cardnews_text(
+            user_theme,
+            analysis,                 # PDF 요약본 (딕셔너리)
+            trend_keywords_list,      # 트렌드 연관 키워드 (리스트)
+            naver_buzzwords or [],
+            visual_colors=visual_progress.get("latest", {}).get("recommended_colors"),
+            trend_signals=(trend_signals or {}).get("summary_lines"),
+        )
+
+    stages = {
+        # [호출 1] pdf_tools.py의 analyze_pdf 함수
+        "analysis": {"func": lambda: pdf_tools.analyze_pdf(pdf_file_path)},
+        # [호출 2] pdf_tools.py의 get_google_trends 함수
+        "trends": {"func": lambda: pdf_tools.get_google_trends(keywords)},
+        # [호출 2-1] trend_analytics.py의 keyword_signals 함수 (키워드별 최근 관심도 증가율)
+        "trend_signals": {"func": lambda: trend_analytics.keyword_signals(keywords)},
+        # [호출 3] 대표 키워드로 Naver 버즈워드를 수집
+        "naver_buzzwords": {"func": lambda: pdf_tools.get_naver_buzzwords(keywords[0])},
+        # [호출 4] visual_analyzer.py의 analyze_visual_trends 함수 (대표 키워드로 검색)
+        "visual": {"func": lambda: visual_analyzer.analyze_visual_trends(
+            keywords[0], on_partial=lambda partial: visual_progress.update(latest=partial)
+        )},
+        # [호출 5] 위 결과가 모이면 cardnews_generator.py의 create_cardnews_text 함수
+        "cardnews": {"func": create_cardnews, "deps": ["analysis", "trends", "naver_buzzwords", "trend_signals"]},
+    }
+    for name, spec in stages.items():
+        spec["timeout"] = STAGE_TIMEOUTS.get(name)
+
+    def report(name, result, error):
+        if error:
+            print(f"    ⚠️ [{name}] 실패: {error}")
+        else:
+            print(f"    ✅ [{name}] 완료")
+        if on_stage_done:
+            on_stage_done(name, result, error)
+
+    print("\n--- [메인 서버] 분석 작업 동시 실행 시작 ---")
+    metric_records = instrumentation.start_run()
+    outcome = run_stages(stages, on_stage_done=report)
+
+    final_response = {}
+    for name, key in RESPONSE_KEYS.items():
+        final_response[key] = outcome["results"].get(name)
+
+    failed_required = [name for name in REQUIRED_STAGES if name in outcome["errors"]]
+    if failed_required:
+        final_response["status"] = "error"
+        final_response["message"] = "; ".join(f"{name}: {outcome['errors'][name]}" for name in failed_required)
+    else:
+        final_response["status"] = "success"
+    if outcome["errors"]:
+        final_response["stage_errors"] = outcome["errors"]
+    final_response["stage_timings"] = outcome["timings"]
+    # (작업별 소요 시간, 읽은 페이지 수, 토큰 수, 다운로드 바이트, 캐시 적중 등)
+    final_response["metrics"] = instrumentation.summarize(metric_records)
+    return final_response
+
+
+if __name__ == "__main__":
+    # ----------------------------------------------------
+    # 2. (가상) 프론트엔드에서 넘어온 입력 데이터
+    # ----------------------------------------------------
+    print("--- [메인 서버] 프론트엔드로부터 요청 수신 (시뮬레이션) ---")
+    USER_THEME = "2030 연인들을 위한 로맨틱하고 감성적인 크리스마스 축제"
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    PDF_FILE_PATH = os.path.join(script_dir, "sample_plan.pdf")
+    KEYWORDS = ["양림 산타 축제", "크리스마스 데이트", "따뜻함"]
 
     # ----------------------------------------------------
-    # 4. 프론트엔드에 보낼 '최종 종합 JSON' 생성
+    # 3. 백엔드 모듈 실행 (지휘)
     # ----------------------------------------------------
-    final_response_to_frontend["status"] = "success"
+    final_response_to_frontend = run_pipeline(USER_THEME, PDF_FILE_PATH, KEYWORDS)
 
-    print("\n--- ✅ [메인 서버] 모든 작업 완료! ---")
+    # ----------------------------------------------------
+    # 4. 프론트엔드에 보낼 '최종 종합 JSON' 출력
+    # ----------------------------------------------------
+    if final_response_to_frontend["status"] == "success":
+        print("\n--- ✅ [메인 서버] 모든 작업 완료! ---")
+    else:
+        print(f"\n🚨 [메인 서버] 작업 중단! 심각한 오류 발생: {final_response_to_frontend['message']}")
     print("--- 프론트엔드로 전송할 최종 종합 JSON 데이터 ---")
-    
+
     # indent=2를 주면 JSON을 예쁘게 출력해 줍니다.
     print(json.dumps(final_response_to_frontend, indent=2, ensure_ascii=False))
 
-
-except Exception as e:
-    print(f"\n🚨 [메인 서버] 작업 중단! 심각한 오류 발생: {e}")
-    # 프론트엔드에는 에러 상태를 JSON으로 보냅니다
-    final_response_to_frontend["status"] = "error"
-    final_response_to_frontend["message"] = str(e)
-    print(json.dumps(final_response_to_frontend, indent=2, ensure_ascii=False))
\ No newline at end of file
+    print("\n--- [메인 서버] 작업별 계측 요약 ---")
+    print(instrumentation.format_table(final_response_to_frontend["metrics"]))
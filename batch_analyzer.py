@@ -0,0 +1,215 @@
+# batch_analyzer.py
+# (여러 기획서 파일을 한 번에 분석하는 비동기 배치 모듈)
+#
+# 사용 예:
+#   python batch_analyzer.py ./plans --out results.jsonl --concurrency 8
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+
+import pdf_tools
+from http_clients import create_async_openai_client
+from hwp_converter import HwpConversionManager
+
+# --- 배치 설정 (.env 또는 환경 변수로 변경 가능) ---
+DEFAULT_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", 4))   # 동시에 보내는 AI 요청 수
+DEFAULT_EXTRACT_WORKERS = int(os.getenv("BATCH_EXTRACT_WORKERS", 4))  # 텍스트 추출 스레드 수
+MAX_RETRIES = int(os.getenv("BATCH_MAX_RETRIES", 5))
+MAX_BACKOFF_SECONDS = 60.0
+
+# 잠시 기다렸다가 다시 시도하면 되는 오류들 (429 Rate Limit, 타임아웃, 서버 오류 등)
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def _retry_delay(error, attempt):
+    """
+    서버가 Retry-After 헤더로 기다릴 시간을 알려주면 그 값을, 아니면 지수 백오프(+무작위) 값을 씁니다.
+    """
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            return float(response.headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+    return min(MAX_BACKOFF_SECONDS, 2 ** attempt) * (0.5 + random.random())
+
+
+async def _request_summary_async(client, text):
+    """
+    (비동기) 기획서 텍스트를 AI에게 보내 요약 JSON을 받아옵니다. 429 등은 백오프 후 재시도.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await client.chat.completions.create(
+                model=pdf_tools.MODEL_NAME,
+                messages=pdf_tools.build_messages(text),
+                response_format={"type": "json_object"},
+                max_tokens=4000
+            )
+            return json.loads(response.choices[0].message.content)
+        except RETRYABLE_ERRORS as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = _retry_delay(e, attempt)
+            print(f"    - [batch] {type(e).__name__} → {delay:.1f}초 후 재시도 ({attempt + 1}/{MAX_RETRIES})")
+            await asyncio.sleep(delay)
+
+
+def _prepare(file_path, use_cache):
+    """
+    (스레드 풀에서 실행) 입력 확인 → 캐시 조회 → 텍스트 추출/선택까지 처리합니다.
+    """
+    prepared = {"result": None, "prompt_text": None, "cache_key": None}
+
+    input_error = pdf_tools.check_input_file(file_path)
+    if input_error:
+        prepared["result"] = input_error
+        return prepared
+
+    if use_cache:
+        cached_result, prepared["cache_key"] = pdf_tools.get_cached_analysis(file_path)
+        if cached_result is not None:
+            print(f"    - [batch] 캐시 적중: {os.path.basename(file_path)}")
+            prepared["result"] = cached_result
+            return prepared
+
+    full_text, _ = pdf_tools.extract_document_text(file_path, max_chars=pdf_tools.extraction_char_limit())
+    prepared["prompt_text"] = pdf_tools.select_prompt_text(full_text)
+    return prepared
+
+
+async def _analyze_one(file_path, client, executor, semaphore, use_cache, converter):
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    try:
+        # (로컬에서 읽을 수 없는 HWP 는 변환을 먼저 걸어두고, 끝나면 캐시된 PDF 로 추출)
+        if await loop.run_in_executor(executor, pdf_tools.needs_cloudconvert, file_path):
+            await converter.convert(file_path)
+        prepared = await loop.run_in_executor(executor, _prepare, file_path, use_cache)
+        result = prepared["result"]
+        if result is None:
+            async with semaphore:
+                result = await _request_summary_async(client, prepared["prompt_text"])
+            if prepared["cache_key"] is not None:
+                pdf_tools.store_cached_analysis(prepared["cache_key"], result)
+    except Exception as e:
+        print(f" [batch] '{file_path}' 분석 중 오류 발생: {e}")
+        result = {"error": f"PDF 분석 오류: {e}"}
+    return file_path, result, time.perf_counter() - started
+
+
+async def analyze_many(file_paths, concurrency=None, extract_workers=None, use_cache=True):
+    """
+    [비동기 배치] 여러 파일을 동시에 분석하고, 끝나는 순서대로 (경로, 결과, 걸린 시간)을 yield 합니다.
+
+    - 텍스트 추출은 스레드 풀(extract_workers)에서, AI 호출은 하나의 비동기 클라이언트로 처리
+    - 동시에 진행되는 AI 요청은 concurrency 개로 제한
+    - 429(Rate Limit) 등은 Retry-After/지수 백오프로 재시도
+    - CloudConvert 가 필요한 HWP 는 변환 관리자(hwp_converter)가 동시에 변환 (스레드를 붙잡지 않음)
+
+    사용 예:
+        async for path, result, elapsed in analyze_many(paths):
+            ...
+    """
+    concurrency = DEFAULT_CONCURRENCY if concurrency is None else max(1, concurrency)
+    extract_workers = DEFAULT_EXTRACT_WORKERS if extract_workers is None else max(1, extract_workers)
+
+    # (재시도는 위에서 직접 처리하므로 SDK 자체 재시도는 끕니다)
+    client = create_async_openai_client(max_retries=0)
+    executor = ThreadPoolExecutor(max_workers=extract_workers)
+    semaphore = asyncio.Semaphore(concurrency)
+    converter = HwpConversionManager()
+    tasks = [
+        asyncio.create_task(_analyze_one(path, client, executor, semaphore, use_cache, converter))
+        for path in file_paths
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await converter.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        await client.close()
+
+
+def expand_input_paths(inputs):
+    """
+    파일/폴더 경로 리스트를 받아, 폴더 안의 지원 파일(PDF, DOCX, HWP)까지 펼친 파일 목록을 반환합니다.
+    """
+    file_paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                if os.path.splitext(name)[1].lower() in pdf_tools.SUPPORTED_EXTENSIONS:
+                    file_paths.append(os.path.join(item, name))
+        else:
+            file_paths.append(item)
+    return file_paths
+
+
+async def run_batch_to_jsonl(file_paths, output_path, **kwargs):
+    """
+    analyze_many 결과를 끝나는 대로 JSONL 파일(한 줄 = 한 파일 결과)에 기록합니다.
+    반환값: {"total": ..., "success": ..., "error": ...}
+    """
+    counts = {"total": len(file_paths), "success": 0, "error": 0}
+    with open(output_path, "w", encoding="utf-8") as f:
+        done = 0
+        async for file_path, result, elapsed in analyze_many(file_paths, **kwargs):
+            done += 1
+            status = "error" if "error" in result else "success"
+            counts[status] += 1
+            f.write(json.dumps({
+                "path": file_path,
+                "status": status,
+                "elapsed_seconds": round(elapsed, 3),
+                "result": result,
+            }, ensure_ascii=False) + "\n")
+            f.flush()
+            print(f"  [batch] ({done}/{len(file_paths)}) {status}: {os.path.basename(file_path)} ({elapsed:.1f}초)")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 축제 기획서를 한 번에 AI로 분석하고 결과를 JSONL로 저장합니다.")
+    parser.add_argument("inputs", nargs="+", help="분석할 파일 또는 폴더 경로")
+    parser.add_argument("--out", default="batch_results.jsonl", help="결과 JSONL 파일 경로")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시에 보내는 AI 요청 수")
+    parser.add_argument("--extract-workers", type=int, default=DEFAULT_EXTRACT_WORKERS, help="텍스트 추출 스레드 수")
+    parser.add_argument("--no-cache", action="store_true", help="분석 결과 캐시를 사용하지 않음")
+    args = parser.parse_args()
+
+    file_paths = expand_input_paths(args.inputs)
+    if not file_paths:
+        print("[batch] 분석할 파일이 없습니다.")
+        return
+
+    print(f"--- [batch] {len(file_paths)}개 파일 분석 시작 (동시 AI 요청 {args.concurrency}개) ---")
+    started = time.perf_counter()
+    counts = asyncio.run(run_batch_to_jsonl(
+        file_paths,
+        args.out,
+        concurrency=args.concurrency,
+        extract_workers=args.extract_workers,
+        use_cache=not args.no_cache,
+    ))
+    print(f"--- [batch] 완료: 성공 {counts['success']}개, 실패 {counts['error']}개 "
+          f"({time.perf_counter() - started:.1f}초) → {args.out} ---")
+
+
+if __name__ == "__main__":
+    main()
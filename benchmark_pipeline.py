@@ -0,0 +1,225 @@
+# benchmark_pipeline.py
+# (오프라인 성능 측정 스크립트 - 진짜 OpenAI/CloudConvert/인터넷 없이 실행)
+#
+# 실행:
+#   python benchmark_pipeline.py                       # 측정 후 기준값(benchmark_baseline.json)과 비교
+#                                                      # (기준값이 없으면 이번 결과를 이 컴퓨터의 기준값으로 저장)
+#   python benchmark_pipeline.py --save-baseline       # 현재 결과를 새 기준값으로 저장
+#   python benchmark_pipeline.py --repeat 5 --llm-latency 0.5
+#
+# 측정 항목:
+#   - 텍스트 추출 속도 (pages/s, chars/s)
+#   - analyze_pdf / create_cardnews_text / app.run_pipeline 소요 시간 (반복 중 중앙값, 최솟값)
+#   - 각 작업의 최대 메모리 사용량 (tracemalloc 기준, 파이썬 객체 메모리)
+# 기준값보다 --tolerance 비율 이상 느려지거나(메모리가 늘어나면) '회귀'로 표시하고 종료 코드 1 을 돌려줍니다.
+# - 시간은 컴퓨터마다 다르므로 기준값 파일은 저장소에 넣지 않고, 각자 컴퓨터에서 처음 실행할 때 만들어집니다.
+# - 시간 비교는 잡음이 적은 '반복 중 최솟값'으로 하고, 1초 미만 작업은 --short-tolerance 로 더 넓게 봅니다.
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# (캐시가 측정을 방해하지 않도록 임시 폴더를 쓰고, 가짜 서비스이므로 API 키는 아무 값이나 넣습니다)
+os.environ.setdefault("FESTIVAL_CACHE_DIR", tempfile.mkdtemp(prefix="festival_bench_"))
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+import app
+import cardnews_generator
+import fake_services
+import pdf_tools
+from text_extractor import extract_page_texts
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_FILES = ["sample_plan.pdf", "sample_plan1.pdf", "sample_plan3.pdf"]
+BASELINE_PATH = os.path.join(SCRIPT_DIR, "benchmark_baseline.json")
+
+USER_THEME = "2030 연인들을 위한 로맨틱하고 감성적인 크리스마스 축제"
+KEYWORDS = ["양림 산타 축제", "크리스마스 데이트", "따뜻함"]
+
+# 기준값과 비교할 항목 (값이 클수록 나쁜 항목 / 값이 작을수록 나쁜 항목)
+LOWER_IS_BETTER = ("min_ms", "peak_kb")
+HIGHER_IS_BETTER = ("pages_per_s", "chars_per_s")
+# (아주 짧은 작업의 측정 잡음은 무시 - 이 값보다 작게 변하면 비율이 커도 회귀로 보지 않음)
+MIN_ABS_CHANGE = {"min_ms": 25.0, "peak_kb": 64.0}
+# (기준값의 소요 시간이 이보다 짧은 작업은 --short-tolerance 를 씀)
+SHORT_TASK_MS = 1000.0
+
+
+def measure(func, repeat):
+    """
+    func 를 repeat 번 실행하고 (중앙값 ms, 최소 ms, 최대 메모리 KB, 마지막 결과) 를 반환합니다.
+    """
+    durations, peaks, result = [], [], None
+    for _ in range(repeat):
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - started) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(durations), 1),
+        "min_ms": round(min(durations), 1),
+        "peak_kb": round(max(peaks), 1),
+    }, result
+
+
+def bench_extraction(path, repeat):
+    stats, pages = measure(lambda: extract_page_texts(path), repeat)
+    seconds = stats["min_ms"] / 1000 or 1e-9
+    chars = sum(len(p) for p in pages)
+    stats.update({
+        "pages": len(pages),
+        "chars": chars,
+        "pages_per_s": round(len(pages) / seconds, 1),
+        "chars_per_s": round(chars / seconds, 1),
+    })
+    return stats
+
+
+def bench_analyze(path, repeat, map_reduce=False):
+    stats, result = measure(lambda: pdf_tools.analyze_pdf(path, use_cache=False, map_reduce=map_reduce), repeat)
+    stats["ok"] = "error" not in result
+    return stats, result
+
+
+def bench_cardnews(analysis, repeat):
+    stats, result = measure(
+        lambda: cardnews_generator.create_cardnews_text(USER_THEME, analysis, ["크리스마스 마켓"], ["#데이트"]),
+        repeat,
+    )
+    stats["ok"] = "error" not in result
+    return stats
+
+
+def bench_pipeline(path, repeat):
+    def run():
+        # (분석 캐시가 두 번째 반복부터 결과를 돌려주지 않도록 매번 끕니다)
+        original = pdf_tools.analyze_pdf
+        pdf_tools.analyze_pdf = lambda p: original(p, use_cache=False)
+        try:
+            return app.run_pipeline(USER_THEME, path, KEYWORDS)
+        finally:
+            pdf_tools.analyze_pdf = original
+
+    stats, result = measure(run, repeat)
+    stats["ok"] = result["status"] == "success"
+    stats["stage_ms"] = {name: round(sec * 1000, 1) for name, sec in result["stage_timings"].items()}
+    return stats
+
+
+def run_benchmarks(files, repeat, llm_latency, http_latency, include_map_reduce):
+    report = {"config": {"repeat": repeat, "llm_latency": llm_latency, "http_latency": http_latency}, "results": {}}
+    with fake_services.installed(llm_latency=llm_latency, http_latency=http_latency):
+        for name in files:
+            path = os.path.join(SCRIPT_DIR, name)
+            if not os.path.exists(path):
+                print(f"  [benchmark] 파일 없음, 건너뜀: {name}")
+                continue
+            print(f"  [benchmark] {name} 측정 중...")
+            entry = {"extract": bench_extraction(path, repeat)}
+            entry["analyze_pdf"], analysis = bench_analyze(path, repeat)
+            if include_map_reduce:
+                entry["analyze_pdf_map_reduce"], _ = bench_analyze(path, repeat, map_reduce=True)
+            entry["create_cardnews_text"] = bench_cardnews(analysis, repeat)
+            entry["run_pipeline"] = bench_pipeline(path, repeat)
+            report["results"][name] = entry
+    return report
+
+
+def compare_with_baseline(report, baseline, tolerance, short_tolerance=None):
+    """
+    기준값 대비 tolerance(예: 0.2 = 20%) 이상 나빠진 항목 목록을 반환합니다.
+    기준값에서 SHORT_TASK_MS 보다 짧았던 작업은 short_tolerance 를 씁니다. (짧을수록 측정 잡음 비율이 큼)
+    """
+    short_tolerance = tolerance if short_tolerance is None else max(tolerance, short_tolerance)
+    regressions = []
+    for file_name, entry in report["results"].items():
+        for bench_name, stats in entry.items():
+            base = baseline.get("results", {}).get(file_name, {}).get(bench_name)
+            if not base:
+                continue
+            # (메모리는 시간만큼 흔들리지 않으므로 항상 tolerance)
+            time_limit = short_tolerance if base.get("min_ms", 0) < SHORT_TASK_MS else tolerance
+            for key in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+                if key not in stats or not base.get(key):
+                    continue
+                if abs(stats[key] - base[key]) < MIN_ABS_CHANGE.get(key, 0):
+                    continue
+                change = (stats[key] - base[key]) / base[key]
+                limit = tolerance if key == "peak_kb" else time_limit
+                if (key in LOWER_IS_BETTER and change > limit) or (key in HIGHER_IS_BETTER and change < -limit):
+                    regressions.append(f"{file_name} / {bench_name} / {key}: {base[key]} → {stats[key]} ({change:+.0%})")
+    return regressions
+
+
+def format_report(report):
+    rows = [["file", "benchmark", "median_ms", "min_ms", "peak_kb", "pages/s", "chars/s"]]
+    for file_name, entry in report["results"].items():
+        for bench_name, stats in entry.items():
+            rows.append([
+                file_name, bench_name, stats["median_ms"], stats["min_ms"], stats["peak_kb"],
+                stats.get("pages_per_s", ""), stats.get("chars_per_s", ""),
+            ])
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(str(cell).ljust(w) for cell, w in zip(row, widths)) for row in rows]
+    for file_name, entry in report["results"].items():
+        stage_ms = entry.get("run_pipeline", {}).get("stage_ms")
+        if stage_ms:
+            lines.append(f"{file_name} 작업별(ms): " + ", ".join(f"{k}={v}" for k, v in stage_ms.items()))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="축제 기획서 분석 흐름 오프라인 벤치마크")
+    parser.add_argument("files", nargs="*", default=SAMPLE_FILES, help="측정할 PDF 파일 (기본: 샘플 3개)")
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 반복 횟수 (비교는 최솟값 사용)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="가짜 OpenAI 응답 지연(초)")
+    parser.add_argument("--http-latency", type=float, default=0.0, help="가짜 HTTP 응답 지연(초)")
+    parser.add_argument("--map-reduce", action="store_true", help="map-reduce 요약도 측정")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="기준값 JSON 파일 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="현재 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀로 볼 변화 비율 (기본 0.2 = 20%%)")
+    parser.add_argument("--short-tolerance", type=float, default=1.0,
+                        help="1초 미만 작업에 쓰는 회귀 비율 (기본 1.0 = 2배 느려지면 회귀)")
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.files, max(1, args.repeat), args.llm_latency, args.http_latency, args.map_reduce)
+    print("\n--- [benchmark] 결과 ---")
+    print(format_report(report))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        # (기준값은 이 컴퓨터에서 잰 값이어야 의미가 있으므로, 없으면 이번 결과로 만듦)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        if not args.save_baseline:
+            print(f"\n⚠️ [benchmark] 기준값 파일이 없어서 이번 결과를 기준값으로 저장했습니다 (이번 실행은 비교 안 함): {args.baseline}")
+            print("   (다음 실행부터 이 값과 비교합니다)")
+            return 0
+        print(f"\n--- [benchmark] 기준값 저장: {args.baseline} ---")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(report, baseline, args.tolerance, args.short_tolerance)
+    if regressions:
+        print(f"\n🚨 [benchmark] 기준값 대비 성능 저하 {len(regressions)}건:")
+        for line in regressions:
+            print(f"   - {line}")
+        return 1
+    print("\n--- ✅ [benchmark] 기준값 대비 성능 저하 없음 ---")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
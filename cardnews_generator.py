@@ -4,6 +4,8 @@ import json
 import openai
 import os
 from dotenv import load_dotenv
+import instrumentation
+from http_clients import get_openai_client
 
 # --- (1. .env 파일에서 API 키 로드) ---
 load_dotenv()
@@ -12,15 +14,17 @@ if not api_key:
     print(" [cardnews_generator] OPENAI_API_KEY를 찾을 수 없습니다.")
     exit()
 openai.api_key = api_key
-client = openai.OpenAI()
 
 # ----------------------------------------------------
 # 기능 1: 카드뉴스 텍스트 생성기
 # (보여주신 코드를 '함수'로 포장했습니다)
 # ----------------------------------------------------
-def create_cardnews_text(user_theme, pdf_data_dict, trends_keywords, naver_buzzwords):
+def create_cardnews_text(user_theme, pdf_data_dict, trends_keywords, naver_buzzwords, visual_colors=None,
+                         trend_signals=None):
     """
     모든 재료를 받아 AI 카피라이터에게 카드뉴스 텍스트 초안(JSON)을 요청합니다.
+    visual_colors: 참고 이미지에서 뽑은 추천 색상(HEX) 리스트 - 시각 분석이 아직 진행 중이면 일부만 있을 수 있음
+    trend_signals: 키워드별 최근 관심도 변화 문장 리스트 (trend_analytics.keyword_signals 의 summary_lines)
     """
     print(f"  [cardnews_generator] 3. AI 카피라이터 호출 시작...")
 
@@ -34,6 +38,19 @@ def create_cardnews_text(user_theme, pdf_data_dict, trends_keywords, naver_buzzw
     """
     # (※ 보여주신 '카피라이터' system_prompt 전체를 여기에 붙여넣으세요!)
 
+    # (시각 분석 결과가 있으면 추천 색상도 참고 정보로 전달)
+    visual_section = f"""
+    [참고 이미지 추천 색상]
+    {', '.join(visual_colors)}
+    """ if visual_colors else ""
+
+    # (관심도 분석 결과가 있으면 '요즘 뜨는' 키워드를 강조할 수 있도록 전달)
+    signal_lines = "\n    ".join(trend_signals or [])
+    signals_section = f"""
+    [키워드별 최근 검색 관심도 변화 (Google, 오르는 순)]
+    {signal_lines}
+    """ if trend_signals else ""
+
     user_prompt = f"""
     [핵심 주제]
     {user_theme}
@@ -48,20 +65,23 @@ def create_cardnews_text(user_theme, pdf_data_dict, trends_keywords, naver_buzzw
     {', '.join(naver_buzzwords)}
 
 ---
-
+{visual_section}{signals_section}
     ---
     위 3가지 정보를 모두 반영하여, 인스타그램 카드뉴스 6장 분량의 JSON을 생성해줘.
     """
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4-turbo", 
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            response_format={"type": "json_object"}
-        )
+        client = get_openai_client()
+        with instrumentation.stage("create_cardnews_text", model="gpt-4-turbo"):
+            response = client.chat.completions.create(
+                model="gpt-4-turbo", 
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format={"type": "json_object"}
+            )
+            instrumentation.add_usage(response)
         
         cardnews_json_string = response.choices[0].message.content
         print("    - 카드뉴스 텍스트 생성 완료.")
@@ -0,0 +1,196 @@
+# chunk_selector.py
+# (AI에게 보낼 기획서 텍스트를 '앞에서부터 자르기' 대신, 중요한 부분을 골라서 채우기)
+
+import math
+import os
+import re
+
+# --- 추출 항목(SYSTEM_PROMPT)별로 근처에 자주 나오는 단어들 ---
+# (한국어는 조사가 붙기 때문에 띄어쓰기 단위가 아니라 '부분 문자열'로 셉니다)
+FIELD_KEYWORDS = {
+    "title": ["축제", "페스티벌", "명칭", "행사명", "제목", "개최"],
+    "date": ["일시", "기간", "날짜", "개최일", "요일"],
+    "location": ["장소", "위치", "개최지", "광장", "공원", "일원"],
+    "host": ["주최"],
+    "organizer": ["주관", "운영"],
+    "targetAudience": ["대상", "타깃", "타겟", "고객", "방문객", "관람객", "가족", "연인"],
+    "summary": ["목적", "개요", "취지", "배경", "비전", "컨셉", "콘셉트"],
+    "programs": ["프로그램", "체험", "공연", "전시", "만들기", "참여", "클래스"],
+    "events": ["이벤트", "퍼포먼스", "개막", "폐막", "퍼레이드", "경품", "특별"],
+    "visualKeywords": ["조명", "포토존", "경관", "트리", "장식", "야간", "디자인", "연출"],
+    "contactInfo": ["문의", "연락처", "전화", "홈페이지", "www", "http", "@"],
+    "directions": ["오시는", "교통", "주차", "버스", "터미널", "IC", "셔틀", "역에서", "도보"],
+}
+
+# --- 단어 대신 정규식으로 세는 항목 ---
+# (날짜는 '월'/'일' 한 글자만 세면 거의 모든 조각에 걸리므로, 숫자와 같이 나온 것만 셉니다)
+FIELD_PATTERNS = {
+    "date": [r"\d+월", r"\d+일", r"\d{4}\.", r"\d{4}년"],
+}
+_COMPILED_PATTERNS = {p: re.compile(p) for patterns in FIELD_PATTERNS.values() for p in patterns}
+
+# 프롬프트에서 '절대 포함하지 말라'고 한 내용 근처는 점수를 깎습니다.
+PENALTY_KEYWORDS = ["예산", "사업비", "금액", "총액", "입찰", "계약", "안전", "보험", "행정", "정산"]
+PENALTY_WEIGHT = 0.5
+
+CHUNK_CHARS = int(os.getenv("CHUNK_CHARS", 800))
+SELECTION_DEBUG = os.getenv("CHUNK_SELECTION_DEBUG", "0") != "0"
+SEPARATOR = "\n...\n"  # 건너뛴 부분이 있다는 것을 AI에게 알려주는 구분자 (원래 이어져 있던 조각 사이에는 넣지 않음)
+
+
+def split_into_chunks(text, chunk_chars=CHUNK_CHARS):
+    """
+    텍스트를 줄 단위로 모아서 약 chunk_chars 글자 크기의 조각 리스트로 나눕니다.
+    (문장이 중간에 잘리지 않도록 줄바꿈 기준으로 자름)
+    """
+    chunks = []
+    current = []
+    current_len = 0
+    for line in text.splitlines(keepends=True):
+        # 한 줄이 너무 길면 강제로 자름
+        while len(line) > chunk_chars:
+            if current:
+                chunks.append("".join(current))
+                current, current_len = [], 0
+            chunks.append(line[:chunk_chars])
+            line = line[chunk_chars:]
+        if current_len + len(line) > chunk_chars and current:
+            chunks.append("".join(current))
+            current, current_len = [], 0
+        current.append(line)
+        current_len += len(line)
+    if current:
+        chunks.append("".join(current))
+    return [c for c in chunks if c.strip()]
+
+
+def _term_counts(chunks, terms):
+    return [
+        [len(_COMPILED_PATTERNS[term].findall(chunk)) if term in _COMPILED_PATTERNS else chunk.count(term)
+         for term in terms]
+        for chunk in chunks
+    ]
+
+
+def _field_terms():
+    # {항목: [단어 또는 정규식...]}
+    return {
+        field: FIELD_KEYWORDS.get(field, []) + FIELD_PATTERNS.get(field, [])
+        for field in dict.fromkeys(list(FIELD_KEYWORDS) + list(FIELD_PATTERNS))
+    }
+
+
+def _gap_count(order):
+    # (정렬된 조각 번호 사이에서 건너뛴 곳의 수 = 들어갈 SEPARATOR 수)
+    return sum(1 for prev, cur in zip(order, order[1:]) if cur != prev + 1)
+
+
+def _join_chunks(chunks, order):
+    parts = []
+    for pos, i in enumerate(order):
+        if pos and i != order[pos - 1] + 1:
+            parts.append(SEPARATOR)
+        parts.append(chunks[i])
+    return "".join(parts)
+
+
+def score_chunks(chunks):
+    """
+    각 조각이 추출 항목과 얼마나 관련 있는지 TF-IDF 방식으로 점수를 매깁니다.
+
+    반환값: [(점수, {항목: 항목별 점수}), ...]  (chunks 와 같은 순서)
+    """
+    n = len(chunks)
+    field_terms = _field_terms()
+    all_terms = sorted({t for terms in field_terms.values() for t in terms} | set(PENALTY_KEYWORDS))
+    term_index = {t: i for i, t in enumerate(all_terms)}
+    counts = _term_counts(chunks, all_terms)
+
+    # IDF: 모든 조각에 다 나오는 단어(예: '축제')는 덜 중요하게
+    doc_freq = [sum(1 for row in counts if row[j] > 0) for j in range(len(all_terms))]
+    idf = [math.log((n + 1) / (df + 1)) + 1.0 for df in doc_freq]
+
+    results = []
+    for pos, row in enumerate(counts):
+        length_norm = 1.0 / math.sqrt(max(1, len(chunks[pos])) / 100.0)
+        field_scores = {}
+        for field, terms in field_terms.items():
+            s = 0.0
+            for term in terms:
+                tf = row[term_index[term]]
+                if tf:
+                    s += (1.0 + math.log(tf)) * idf[term_index[term]]
+            if s:
+                field_scores[field] = s * length_norm
+        penalty = sum(
+            (1.0 + math.log(row[term_index[t]])) * idf[term_index[t]]
+            for t in PENALTY_KEYWORDS if row[term_index[t]]
+        ) * length_norm * PENALTY_WEIGHT
+        results.append((sum(field_scores.values()) - penalty, field_scores))
+    return results
+
+
+def select_chunks(text, budget, chunk_chars=CHUNK_CHARS, debug=None):
+    """
+    텍스트가 budget 글자보다 길면, 점수가 높은 조각부터 budget 안에 채워 넣고
+    원래 문서 순서대로 다시 이어 붙여 반환합니다.
+
+    - 이미 나온 항목만 반복하는 조각보다, 아직 못 채운 항목을 담은 조각을 먼저 고릅니다.
+    - 문서의 첫 조각(보통 제목/개요)은 항상 포함합니다.
+
+    반환값: (선택된 텍스트, 선택 정보 딕셔너리)
+    """
+    debug = SELECTION_DEBUG if debug is None else debug
+    if len(text) <= budget:
+        return text, {"selected": None, "total_chunks": None, "chars": len(text)}
+
+    chunks = split_into_chunks(text, chunk_chars)
+    if not chunks:
+        # (공백/줄바꿈뿐인 텍스트 - 글자 레이어가 빈 스캔 PDF 등)
+        return "", {"selected": [], "total_chunks": 0, "chars": 0, "covered_fields": []}
+    scores = score_chunks(chunks)
+
+    selected = {0}
+    used = len(chunks[0])
+    gaps = 0
+    covered = dict(scores[0][1])
+    remaining = set(range(1, len(chunks)))
+
+    while remaining:
+        # 항목별로 이미 모은 점수가 클수록 같은 항목의 추가 점수는 덜 쳐줍니다.
+        def gain(i):
+            base, fields = scores[i]
+            bonus = sum(v / (1.0 + covered.get(f, 0.0)) for f, v in fields.items())
+            return base + bonus
+
+        best = max(remaining, key=gain)
+        remaining.discard(best)
+        if gain(best) <= 0:
+            break
+        # (바로 옆 조각이 이미 골라져 있으면 구분자 없이 이어 붙으므로 그만큼 덜 씀)
+        new_gaps = _gap_count(sorted(selected | {best}))
+        cost = len(chunks[best]) + len(SEPARATOR) * (new_gaps - gaps)
+        if used + cost > budget:
+            continue
+        selected.add(best)
+        used += cost
+        gaps = new_gaps
+        for f, v in scores[best][1].items():
+            covered[f] = covered.get(f, 0.0) + v
+
+    order = sorted(selected)
+    selected_text = _join_chunks(chunks, order)[:budget]
+
+    if debug:
+        print(f"    - [chunk_selector] {len(chunks)}개 조각 중 {len(order)}개 선택 ({len(selected_text)}자)")
+        for i in order:
+            top_fields = sorted(scores[i][1].items(), key=lambda kv: -kv[1])[:3]
+            fields_str = ", ".join(f"{f}={v:.1f}" for f, v in top_fields)
+            print(f"      #{i:>3} 점수 {scores[i][0]:6.2f} | {fields_str}")
+
+    return selected_text, {
+        "selected": order,
+        "total_chunks": len(chunks),
+        "chars": len(selected_text),
+        "covered_fields": sorted(covered),
+    }
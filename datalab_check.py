@@ -0,0 +1,174 @@
+# datalab_check.py
+# (네이버 데이터랩 클라이언트(naver_datalab) 동작 확인 스크립트 - 진짜 API 대신 로컬 대역 서버로 실행)
+#
+# 실행:
+#   python datalab_check.py
+#
+# 확인 항목:
+#   - 그룹 묶기: 23개 그룹 → 5개씩 요청 5번, 결과 23개 (묶음 번호 포함)
+#   - 동시 요청: 묶음들이 한 번에 하나씩이 아니라 동시에 나가는지
+#   - 재시도: 429 를 받아도 다시 시도해서 성공하고, 다시 보낸 요청도 호출 한도에 기록되는지
+#   - 재시도 한 겹: 기본 세션은 스스로 다시 보내지 않아서, 요청 수가 클라이언트 재시도 횟수를 넘지 않는지
+#   - 빈 그룹 목록: 요청 없이 빈 결과
+#   - 한도 거절: 남은 호출 수보다 많이 필요하면 요청을 하나도 보내지 않는지
+#   - 서버 한도 초과(errorCode 010): 오늘 남은 호출을 0 으로 만들고 이후 요청을 보내지 않는지
+#   - 사용량 기록: 프로그램을 다시 실행해도(새 QuotaTracker) 그날 사용량이 이어지는지
+# 하나라도 실패하면 종료 코드 1 을 돌려줍니다.
+
+import os
+import sys
+import tempfile
+import time
+
+import requests
+
+import fake_services
+from naver_datalab import DatalabClient, DatalabError, QuotaExceededError, QuotaTracker
+
+GROUPS = [[f"축제{i}", f"키워드 {i}", f"축제 {i}"] for i in range(23)]
+START_DATE, END_DATE = "2025-10-01", "2025-12-31"
+
+
+def _client(server, quota, **kwargs):
+    # (기본은 자동 재시도가 없는 새 세션 - session=None 이면 클라이언트 기본값 get_http_session(retries=False))
+    kwargs.setdefault("session", requests.Session())
+    return DatalabClient("check-id", "check-secret", base_url=server.base_url, quota=quota, **kwargs)
+
+
+def check_packing(quota_dir):
+    with fake_services.datalab_stand_in() as server:
+        client = _client(server, QuotaTracker(os.path.join(quota_dir, "packing.json"), daily_limit=100))
+        response = client.search(GROUPS, START_DATE, END_DATE)
+        titles = [result["title"] for result in response["results"]]
+        assert titles == [group[0] for group in GROUPS], "결과 순서/개수가 요청한 그룹과 다릅니다"
+        assert sorted({result["batch"] for result in response["results"]}) == [0, 1, 2, 3, 4], "묶음 번호가 0~4 가 아닙니다"
+        assert server.requests == 5, f"요청 수 {server.requests} (기대값 5)"
+        assert client.remaining() == 95, f"남은 호출 {client.remaining()} (기대값 95)"
+    return "23개 그룹 → 요청 5번"
+
+
+def check_concurrency(quota_dir):
+    latency = 0.3
+    with fake_services.datalab_stand_in(latency=latency) as server:
+        client = _client(server, QuotaTracker(os.path.join(quota_dir, "concurrency.json"), daily_limit=100),
+                         max_concurrency=5)
+        started = time.perf_counter()
+        client.search(GROUPS, START_DATE, END_DATE)
+        elapsed = time.perf_counter() - started
+        assert elapsed < latency * 3, f"{elapsed:.2f}초 - 요청 5번이 동시에 나가지 않았습니다"
+    return f"요청 5번 (각 {latency}초) → {elapsed:.2f}초"
+
+
+def check_retry(quota_dir):
+    with fake_services.datalab_stand_in(rate_limit_every=2) as server:
+        quota = QuotaTracker(os.path.join(quota_dir, "retry.json"), daily_limit=100)
+        client = _client(server, quota, backoff_seconds=0.01, max_concurrency=1)
+        response = client.search(GROUPS[:10], START_DATE, END_DATE)
+        assert len(response["results"]) == 10, "재시도 후 결과가 모자랍니다"
+        assert server.requests == 3, f"서버가 받은 요청 {server.requests} (기대값 3: 성공 2 + 429 1)"
+        assert quota.used() == server.requests, f"기록된 사용량 {quota.used()} ≠ 서버가 받은 요청 {server.requests}"
+    return "429 1번 → 재시도 후 성공, 사용량 3회 기록"
+
+
+def check_single_retry_layer(quota_dir):
+    # (클라이언트 재시도를 끄면 429 는 바로 오류여야 함 - 세션이 몰래 다시 보내면 호출 한도가 더 빨리 닳음)
+    with fake_services.datalab_stand_in(rate_limit_every=2) as server:
+        quota = QuotaTracker(os.path.join(quota_dir, "single_retry.json"), daily_limit=100)
+        client = _client(server, quota, session=None, max_retries=0, max_concurrency=1)
+        try:
+            client.search(GROUPS[:10], START_DATE, END_DATE)
+        except DatalabError:
+            pass
+        else:
+            raise AssertionError("재시도 0회인데 429 를 받고도 성공했습니다 (세션이 다시 보냄)")
+        assert server.requests == 2, f"서버가 받은 요청 {server.requests} (기대값 2: 성공 1 + 429 1)"
+        assert quota.used() == server.requests, f"기록된 사용량 {quota.used()} ≠ 서버가 받은 요청 {server.requests}"
+    return "기본 세션 자동 재시도 없음, 사용량 2회 기록"
+
+
+def check_empty_groups(quota_dir):
+    with fake_services.datalab_stand_in() as server:
+        client = _client(server, QuotaTracker(os.path.join(quota_dir, "empty.json"), daily_limit=100))
+        response = client.search([], START_DATE, END_DATE)
+        assert response["results"] == [], f"빈 그룹 목록인데 결과 {response['results']}"
+        assert server.requests == 0, f"빈 그룹 목록인데 서버가 요청 {server.requests}번을 받았습니다"
+    return "요청 없이 빈 결과"
+
+
+def check_quota_refusal(quota_dir):
+    with fake_services.datalab_stand_in() as server:
+        client = _client(server, QuotaTracker(os.path.join(quota_dir, "refusal.json"), daily_limit=3))
+        try:
+            client.search(GROUPS, START_DATE, END_DATE)
+        except QuotaExceededError:
+            pass
+        else:
+            raise AssertionError("남은 호출(3회)보다 많은 요청(5회)이 필요한데 거절하지 않았습니다")
+        assert server.requests == 0, f"거절했는데 서버가 요청 {server.requests}번을 받았습니다"
+        assert client.remaining() == 3, f"남은 호출 {client.remaining()} (기대값 3)"
+    return "5회 필요 / 3회 남음 → 요청 없이 거절"
+
+
+def check_server_exhaustion(quota_dir):
+    with fake_services.datalab_stand_in(daily_quota=1) as server:
+        client = _client(server, QuotaTracker(os.path.join(quota_dir, "exhaustion.json"), daily_limit=100),
+                         max_concurrency=1)
+        try:
+            client.search(GROUPS[:10], START_DATE, END_DATE)
+        except QuotaExceededError:
+            pass
+        else:
+            raise AssertionError("서버가 한도 초과(010)라고 답했는데 QuotaExceededError 가 나지 않았습니다")
+        assert server.requests == 2, f"서버가 받은 요청 {server.requests} (기대값 2: 010 은 재시도하지 않음)"
+        assert client.remaining() == 0, f"010 을 받은 뒤 남은 호출 {client.remaining()} (기대값 0)"
+        try:
+            client.search(GROUPS[:1], START_DATE, END_DATE)
+        except QuotaExceededError:
+            pass
+        else:
+            raise AssertionError("한도를 다 쓴 뒤에도 요청을 보냈습니다")
+        assert server.requests == 2, "한도를 다 쓴 뒤에도 서버에 요청이 갔습니다"
+    return "010 → 남은 호출 0, 이후 요청 없음"
+
+
+def check_persistence(quota_dir):
+    path = os.path.join(quota_dir, "persistence.json")
+    with fake_services.datalab_stand_in() as server:
+        _client(server, QuotaTracker(path, daily_limit=100)).search(GROUPS[:7], START_DATE, END_DATE)
+    used = QuotaTracker(path, daily_limit=100).used()
+    assert used == 2, f"다시 읽은 사용량 {used} (기대값 2)"
+    return "다시 읽은 사용량 2회"
+
+
+CHECKS = [
+    ("그룹 묶기", check_packing),
+    ("동시 요청", check_concurrency),
+    ("429 재시도", check_retry),
+    ("재시도 한 겹", check_single_retry_layer),
+    ("빈 그룹 목록", check_empty_groups),
+    ("한도 거절", check_quota_refusal),
+    ("서버 한도 초과(010)", check_server_exhaustion),
+    ("사용량 기록", check_persistence),
+]
+
+
+def main():
+    print("--- [datalab_check] 로컬 대역 서버로 데이터랩 클라이언트 확인 ---")
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix="datalab_check_") as quota_dir:
+        for name, check in CHECKS:
+            try:
+                detail = check(quota_dir)
+                print(f"  ✅ {name}: {detail}")
+            except Exception as e:
+                failures += 1
+                print(f"  🚨 {name}: {e}")
+    if failures:
+        print(f"\n🚨 [datalab_check] {failures}/{len(CHECKS)}개 실패")
+        return 1
+    print(f"\n--- ✅ [datalab_check] {len(CHECKS)}개 모두 통과 ---")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+# disk_cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+# --- 캐시 기본 위치 (.env 또는 환경 변수로 변경 가능) ---
+CACHE_ROOT = os.getenv(
+    "FESTIVAL_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+)
+
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    """
+    파일 내용을 청크 단위로 읽어 SHA-256 해시(hex)를 반환합니다.
+    (파일 이름이 바뀌어도 내용이 같으면 같은 키가 나옵니다)
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_key(*parts):
+    """
+    여러 값(해시, 모델명, 프롬프트 버전 등)을 묶어 하나의 캐시 키로 만듭니다.
+    """
+    joined = "\x1f".join(str(p) for p in parts)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    디스크에 저장되는 간단한 키-값 캐시입니다.
+
+    - 값은 JSON(딕셔너리 등) 또는 bytes 로 저장할 수 있습니다.
+    - 전체 용량이 max_bytes 를 넘으면 가장 오래 사용되지 않은 항목부터 지웁니다. (LRU)
+    - 조회할 때마다 파일의 수정 시각을 갱신해서 '최근 사용'을 기록합니다.
+    - hits / misses / writes / evictions 카운터를 stats() 로 확인할 수 있습니다.
+    """
+
+    def __init__(self, namespace, max_bytes=200 * 1024 * 1024, root=None):
+        self.directory = os.path.join(root or CACHE_ROOT, namespace)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    # ---------------------------------
+    # 내부 도우미
+    # ---------------------------------
+    def path_for(self, key, suffix):
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def _touch(self, path):
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def _is_fresh(self, path, max_age):
+        if max_age is None:
+            return True
+        return (time.time() - os.path.getmtime(path)) <= max_age
+
+    def _write_atomic(self, path, data):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    # ---------------------------------
+    # JSON 값
+    # ---------------------------------
+    def get(self, key, max_age=None):
+        """
+        캐시된 JSON 값을 반환합니다. 없거나 max_age(초)보다 오래됐으면 None.
+        """
+        path = self.path_for(key, ".json")
+        with self._lock:
+            try:
+                if not self._is_fresh(path, max_age):
+                    self.misses += 1
+                    return None
+                with open(path, "r", encoding="utf-8") as f:
+                    value = json.load(f)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touch(path)
+            return value
+
+    def set(self, key, value):
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self._write_atomic(self.path_for(key, ".json"), data)
+            self.writes += 1
+            self._evict()
+
+    # ---------------------------------
+    # bytes 값 (이미지, 변환된 PDF 등)
+    # ---------------------------------
+    def get_bytes(self, key, max_age=None):
+        path = self.path_for(key, ".bin")
+        with self._lock:
+            try:
+                if not self._is_fresh(path, max_age):
+                    self.misses += 1
+                    return None
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touch(path)
+            return data
+
+    def set_bytes(self, key, data):
+        with self._lock:
+            self._write_atomic(self.path_for(key, ".bin"), data)
+            self.writes += 1
+            self._evict()
+
+    # ---------------------------------
+    # 파일 값 (큰 데이터를 메모리에 올리지 않고 경로로 다룰 때)
+    # ---------------------------------
+    def get_path(self, key, suffix=".bin", max_age=None):
+        """
+        저장된 파일의 경로를 반환합니다. (내용은 읽지 않음) 없거나 오래됐으면 None.
+        """
+        path = self.path_for(key, suffix)
+        with self._lock:
+            try:
+                fresh = os.path.isfile(path) and self._is_fresh(path, max_age)
+            except OSError:
+                fresh = False
+            if not fresh:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touch(path)
+            return path
+
+    def set_stream(self, key, chunks, suffix=".bin"):
+        """
+        bytes 조각(iterable)을 받는 대로 디스크에 써서 저장하고, 저장된 파일 경로를 반환합니다.
+        (다운로드처럼 큰 데이터를 한 번에 메모리에 올리지 않기 위해 사용)
+        중간에 오류가 나면 쓰던 임시 파일을 지우고 오류를 그대로 전달합니다.
+        """
+        path = self.path_for(key, suffix)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            os.replace(tmp_path, path)
+            self.writes += 1
+            self._evict(keep=path)
+        return path
+
+    def delete(self, key):
+        with self._lock:
+            for suffix in (".json", ".bin"):
+                try:
+                    os.remove(self.path_for(key, suffix))
+                except OSError:
+                    pass
+
+    # ---------------------------------
+    # 용량 관리 (LRU)
+    # ---------------------------------
+    def _evict(self, keep=None):
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            total += st.st_size
+            if path != keep:  # (방금 저장한 파일은 지우지 않음)
+                entries.append((st.st_mtime, st.st_size, path))
+
+        if total <= self.max_bytes:
+            return
+
+        # 가장 오래 사용되지 않은 파일부터 삭제
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+
+    def total_bytes(self):
+        total = 0
+        for name in os.listdir(self.directory):
+            try:
+                total += os.path.getsize(os.path.join(self.directory, name))
+            except OSError:
+                pass
+        return total
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "bytes": self.total_bytes(),
+            "max_bytes": self.max_bytes,
+        }
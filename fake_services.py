@@ -0,0 +1,449 @@
+# fake_services.py
+# (벤치마크/오프라인 실행용 가짜 OpenAI / CloudConvert / HTTP / Google Trends / 네이버 데이터랩 대역 서버)
+#
+# 진짜 API를 부르지 않고 항상 같은 결과를 돌려주므로, 성능 측정이나 흐름 확인을
+# 인터넷/API 키 없이 반복할 수 있습니다.
+#
+# 사용 예:
+#   with fake_services.installed(llm_latency=0.2):
+#       app.run_pipeline(...)
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pandas as pd
+from PIL import Image
+
+import http_clients
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FAKE_PDF_PATH = os.path.join(SCRIPT_DIR, "sample_plan.pdf")  # CloudConvert 가 '변환 결과'로 돌려줄 PDF
+
+
+def _seed(text):
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+# ----------------------------------------------------
+# OpenAI
+# ----------------------------------------------------
+class _FakeCompletions:
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def create(self, model, messages, **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        system = messages[0]["content"]
+        user = messages[-1]["content"]
+        seed = _seed(user)
+
+        if "카피라이터" in system:
+            content = {"cards": [{"page": i + 1, "title": f"카드 {i + 1}", "body": f"본문 {seed % 97}"} for i in range(6)]}
+        else:
+            content = {
+                "title": f"테스트 축제 {seed % 1000}",
+                "date": "2025-12-20 ~ 2025-12-25",
+                "location": "정보 없음" if seed % 2 else "테스트 광장",
+                "host": "테스트시",
+                "organizer": "테스트 문화재단",
+                "targetAudience": "가족 단위 방문객",
+                "summary": user[40:120].replace("\n", " "),
+                "programs": [f"프로그램 {seed % 7}", "포토존 체험"],
+                "events": ["개막 퍼포먼스"],
+                "visualKeywords": ["야간 조명", "트리"],
+                "contactInfo": "000-0000-0000",
+                "directions": "정보 없음",
+            }
+
+        prompt_chars = sum(len(m["content"]) for m in messages)
+        text = json.dumps(content, ensure_ascii=False)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+            # (토큰 수는 대략 한국어 1.5자 = 1토큰으로 계산)
+            usage=SimpleNamespace(prompt_tokens=int(prompt_chars / 1.5), completion_tokens=int(len(text) / 1.5)),
+        )
+
+
+class FakeOpenAIClient:
+    def __init__(self, latency=0.0):
+        self.chat = SimpleNamespace(completions=_FakeCompletions(latency))
+
+    def close(self):
+        pass
+
+
+# ----------------------------------------------------
+# HTTP (이미지 / 네이버 검색 / Pexels 검색 / CloudConvert 다운로드)
+# ----------------------------------------------------
+class FakeResponse:
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size=65536):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def make_fake_image(url, size=(640, 426)):
+    """
+    URL 마다 항상 같은 그라데이션 JPEG 이미지를 만듭니다.
+    """
+    seed = _seed(url)
+    base = ((seed >> 16) & 0xFF, (seed >> 8) & 0xFF, seed & 0xFF)
+    gradient = Image.linear_gradient("L").resize(size)
+    image = Image.merge("RGB", [gradient.point(lambda v, c=c: (c + v // 3) % 256) for c in base])
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+class FakeSession:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.requests = 0
+        self._image_cache = {}
+
+    def request(self, method, url, **kwargs):
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if "search.naver.com" in url:
+            html = "".join(f'<a class="keyword">#키워드{i}</a>' for i in range(12))
+            return FakeResponse(f'<div class="keyword_box_wrap">{html}</div>'.encode("utf-8"))
+        if "datalab/search" in url:
+            return FakeResponse(json.dumps(datalab_search_response(json.loads(kwargs.get("data") or "{}"))).encode("utf-8"))
+        if "openapi.naver.com" in url:
+            return FakeResponse(json.dumps({"results": []}).encode("utf-8"))
+        if "api.pexels.com" in url:
+            return FakeResponse(json.dumps(self._pexels_search(kwargs.get("params") or {})).encode("utf-8"))
+        if url.startswith("fake://cloudconvert/"):
+            with open(FAKE_PDF_PATH, "rb") as f:
+                return FakeResponse(f.read(), headers={"Content-Length": str(os.path.getsize(FAKE_PDF_PATH))})
+        if url not in self._image_cache:
+            self._image_cache[url] = make_fake_image(url)
+        data = self._image_cache[url]
+        etag = '"' + hashlib.md5(data).hexdigest() + '"'
+        if (kwargs.get("headers") or {}).get("If-None-Match") == etag:
+            return FakeResponse(b"", status_code=304, headers={"ETag": etag})
+        return FakeResponse(data, headers={"Content-Type": "image/jpeg", "ETag": etag})
+
+    def _pexels_search(self, params):
+        # (검색어마다 항상 같은 가짜 사진 목록, 한 검색어당 최대 40장)
+        query, page, per_page = params.get("query", ""), int(params.get("page", 1)), int(params.get("per_page", 15))
+        start = (page - 1) * per_page
+        count = max(0, min(per_page, 40 - start))
+        photos = [
+            {"id": start + i, "src": {size: f"https://images.pexels.test/{_seed(query)}/{start + i}-{size}.jpeg"
+                                      for size in ("original", "large", "medium")}}
+            for i in range(count)
+        ]
+        return {"page": page, "per_page": per_page, "photos": photos,
+                "next_page": f"page={page + 1}" if start + count < 40 else None}
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        pass
+
+
+def datalab_search_response(body):
+    # (그룹마다 키워드로 정해지는 '실제 검색량'을 만들고, 한 요청 안에서 최댓값이 100 이 되도록 정규화)
+    periods = pd.date_range(body.get("startDate"), body.get("endDate"), freq="D")
+    volumes = {}
+    for group in body.get("keywordGroups", []):
+        volumes[group["groupName"]] = [
+            sum(values) for values in zip(*(FakeTrendReq.true_volume(keyword, periods) for keyword in group["keywords"]))
+        ]
+    peak = max((max(v) for v in volumes.values() if v), default=1)
+    return {
+        "startDate": body.get("startDate"),
+        "endDate": body.get("endDate"),
+        "timeUnit": body.get("timeUnit"),
+        "results": [
+            {
+                "title": group["groupName"],
+                "keywords": group["keywords"],
+                "data": [{"period": day.strftime("%Y-%m-%d"), "ratio": round(value * 100 / peak, 5)}
+                         for day, value in zip(periods, volumes[group["groupName"]])],
+            }
+            for group in body.get("keywordGroups", [])
+        ],
+    }
+
+
+# ----------------------------------------------------
+# 네이버 데이터랩 로컬 대역 서버 (naver_datalab 클라이언트를 진짜 HTTP 로 시험할 때)
+# ----------------------------------------------------
+@contextmanager
+def datalab_stand_in(latency=0.0, rate_limit_every=0, daily_quota=None):
+    """
+    127.0.0.1 의 빈 포트에 데이터랩 검색 API 흉내 서버를 띄우고 base_url 을 돌려줍니다.
+    - 응답 내용은 FakeSession 과 같음 (datalab_search_response)
+    - rate_limit_every 를 N 으로 두면 N 번째 요청마다 429 (일시적 제한)
+    - daily_quota 를 넘게 요청하면 429 + errorCode "010" (호출 한도 초과)
+    사용 예:
+        with datalab_stand_in() as server:
+            client = naver_datalab.DatalabClient("id", "secret", base_url=server.base_url)
+    """
+    state = SimpleNamespace(requests=0, base_url=None)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, payload):
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            with lock:
+                state.requests += 1
+                count = state.requests
+            if latency:
+                time.sleep(latency)
+            if self.path != "/v1/datalab/search":
+                return self._reply(404, {"errorMessage": "Not Found", "errorCode": "404"})
+            if not self.headers.get("X-Naver-Client-Id") or not self.headers.get("X-Naver-Client-Secret"):
+                return self._reply(401, {"errorMessage": "Authentication failed", "errorCode": "024"})
+            if daily_quota is not None and count > daily_quota:
+                return self._reply(429, {"errorMessage": "Query limit exceeded", "errorCode": "010"})
+            if rate_limit_every and count % rate_limit_every == 0:
+                return self._reply(429, {"errorMessage": "Too many requests", "errorCode": "429"})
+            if not 1 <= len(body.get("keywordGroups", [])) <= 5:
+                return self._reply(400, {"errorMessage": "Invalid keywordGroups", "errorCode": "400"})
+            return self._reply(200, datalab_search_response(body))
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    state.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield state
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+# ----------------------------------------------------
+# CloudConvert
+# ----------------------------------------------------
+class _FakeJob:
+    """
+    작업마다 등록 후 latency 초가 지나야 'finished' 가 됩니다. (그 전에는 Job.show 가 'processing')
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.created = {}
+        self.deleted = []
+        self._lock = threading.Lock()
+
+    def create(self, payload):
+        with self._lock:
+            job_id = f"fake-job-{len(self.created) + 1}"
+            self.created[job_id] = time.monotonic()
+        return {"id": job_id, "tasks": [{"name": "upload-hwp", "operation": "import/upload"}]}
+
+    def wait(self, id):
+        remaining = self.created.get(id, 0) + self.latency - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        return self.show(id)
+
+    def show(self, id):
+        if time.monotonic() < self.created.get(id, 0) + self.latency:
+            return {"id": id, "status": "processing", "tasks": []}
+        return {"id": id, "status": "finished", "tasks": [{
+            "name": "export-pdf",
+            "status": "finished",
+            "result": {"files": [{"filename": "converted.pdf", "url": f"fake://cloudconvert/{id}.pdf"}]},
+        }]}
+
+    def delete(self, id):
+        self.deleted.append(id)
+
+
+class _FakeTask:
+    def upload(self, file_name, task):
+        return True
+
+
+class FakeCloudConvert:
+    def __init__(self, latency=0.0):
+        self.Job = _FakeJob(latency)
+        self.Task = _FakeTask()
+
+    def configure(self, **kwargs):
+        pass
+
+
+# ----------------------------------------------------
+# Google Trends (pytrends)
+# ----------------------------------------------------
+class FakeRateLimitError(Exception):
+    def __init__(self):
+        super().__init__("The request failed: Google returned a response with code 429")
+        self.response = SimpleNamespace(status_code=429, headers={})
+
+
+class FakeTrendReq:
+    """
+    진짜 Google 트렌드처럼 키워드마다 고유한 '실제 검색량'이 있고, 한 번에 요청한 키워드 중 최댓값이 100 이 되도록
+    정규화해서 돌려줍니다. (묶음마다 배율이 달라지는 것까지 흉내)
+    rate_limit_every 를 N 으로 두면 N 번째 요청마다 429 오류를 냅니다.
+    """
+
+    rate_limit_every = 0
+    requests = 0
+    _lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        self.kw_list = []
+        self.timeframe = "today 3-m"
+
+    def build_payload(self, kw_list, cat=0, timeframe="today 3-m", geo="", gprop=""):
+        self.kw_list = list(kw_list)
+        self.timeframe = timeframe
+
+    def _count_request(self):
+        with FakeTrendReq._lock:
+            FakeTrendReq.requests += 1
+            limited = self.rate_limit_every and FakeTrendReq.requests % self.rate_limit_every == 0
+        if limited:
+            raise FakeRateLimitError()
+
+    @staticmethod
+    def true_volume(keyword, dates):
+        # (키워드와 날짜로만 정해지는 '실제 검색량' - 언제 어떤 기간으로 요청해도 같은 날은 같은 값)
+        seed = _seed(keyword)
+        scale = 1 + seed % 50
+        return [scale * (1 + ((seed + day.toordinal() * (seed % 5 + 1)) % 101) / 100) for day in dates]
+
+    def interest_over_time(self):
+        self._count_request()
+        if self.timeframe.startswith("today") or self.timeframe.startswith("now"):
+            index = pd.date_range(end=pd.Timestamp("2025-12-31"), periods=90, freq="D", name="date")
+        else:
+            start, end = self.timeframe.split()  # ("YYYY-MM-DD YYYY-MM-DD" 형식의 기간)
+            index = pd.date_range(start, end, freq="D", name="date")
+        volumes = {kw: self.true_volume(kw, index) for kw in self.kw_list}
+        peak = max((max(v) for v in volumes.values()), default=1)
+        frame = pd.DataFrame({kw: [round(x * 100 / peak) for x in v] for kw, v in volumes.items()}, index=index)
+        frame["isPartial"] = False
+        return frame
+
+    def related_queries(self):
+        self._count_request()
+        return {
+            kw: {
+                "top": pd.DataFrame({"query": [f"{kw} {i}" for i in range(5)], "value": [100, 80, 60, 40, 20]}),
+                "rising": pd.DataFrame({"query": [f"{kw} 신규"], "value": [250]}),
+            }
+            for kw in self.kw_list
+        }
+
+
+# ----------------------------------------------------
+# 설치 / 해제
+# ----------------------------------------------------
+@contextmanager
+def installed(llm_latency=0.0, http_latency=0.0, convert_latency=0.0):
+    """
+    with 블록 안에서는 모든 모듈이 가짜 서비스를 쓰도록 바꿔 끼우고, 끝나면 원래대로 돌려놓습니다.
+    """
+    import naver_datalab
+    import pdf_tools
+    import trend_store
+    import trends_service
+
+    fakes = SimpleNamespace(
+        openai=FakeOpenAIClient(llm_latency),
+        session=FakeSession(http_latency),
+        cloudconvert=FakeCloudConvert(convert_latency),
+    )
+    saved = {
+        "openai": http_clients._openai_client,
+        "session": http_clients._http_session,
+        "no_retry_session": http_clients._no_retry_http_session,
+        "cloudconvert": pdf_tools.cloudconvert,
+        "cloudconvert_key": pdf_tools.CLOUDCONVERT_API_KEY,
+        "trendreq": trends_service.TrendReq,
+        "trends_service": trends_service._service,
+        "trend_store": trend_store._store,
+        "quota_dir": naver_datalab.NAVER_DATALAB_QUOTA_DIR,
+        "quota_trackers": dict(naver_datalab._trackers),
+    }
+    http_clients.set_openai_client(fakes.openai)
+    http_clients.set_http_session(fakes.session)
+    http_clients.set_http_session(fakes.session, retries=False)
+    pdf_tools.cloudconvert = fakes.cloudconvert
+    pdf_tools.CLOUDCONVERT_API_KEY = pdf_tools.CLOUDCONVERT_API_KEY or "fake-key"
+    trends_service.TrendReq = FakeTrendReq
+    # (속도 제한 없이, 가짜 응답이 진짜 캐시에 섞이지 않도록 임시 폴더에 캐시)
+    trends_cache = tempfile.TemporaryDirectory()
+    fakes.trends = trends_service.TrendsService(rate_per_minute=0, cache_root=trends_cache.name)
+    trends_service.set_trends_service(fakes.trends)
+    fakes.store = trend_store.TrendStore(os.path.join(trends_cache.name, "trend_store.sqlite"))
+    trend_store.set_trend_store(fakes.store)
+    naver_datalab.NAVER_DATALAB_QUOTA_DIR = os.path.join(trends_cache.name, "quota")  # (진짜 호출 기록에 섞이지 않도록)
+    naver_datalab._trackers.clear()
+    try:
+        yield fakes
+    finally:
+        trends_service.TrendReq = saved["trendreq"]
+        trends_service.set_trends_service(saved["trends_service"])
+        trend_store.set_trend_store(saved["trend_store"])
+        naver_datalab.NAVER_DATALAB_QUOTA_DIR = saved["quota_dir"]
+        naver_datalab._trackers.clear()
+        naver_datalab._trackers.update(saved["quota_trackers"])
+        fakes.store.close()
+        trends_cache.cleanup()
+        http_clients.set_openai_client(saved["openai"])
+        http_clients.set_http_session(saved["session"])
+        http_clients.set_http_session(saved["no_retry_session"], retries=False)
+        pdf_tools.cloudconvert = saved["cloudconvert"]
+        pdf_tools.CLOUDCONVERT_API_KEY = saved["cloudconvert_key"]
@@ -1,7 +1,5 @@
 # 필요한 라이브러리를 불러옵니다.
-from pytrends.request import TrendReq
-import pandas as pd
-import datetime
+from trends_service import get_trends_service
 
 def get_google_trends(keywords_list):
     """
@@ -11,34 +9,20 @@ def get_google_trends(keywords_list):
         keywords_list (list): 분석할 키워드 리스트 (예: ["담양산TA축제", "겨울 축제"])
     """
     
-    # Google Trends에 연결합니다.
-    # hl='ko-KR' (한국어), tz=540 (한국 시간대, UTC+9*60)
-    pytrends = TrendReq(hl='ko-KR', tz=540)
-
-    # 검색 조건을 설정합니다.
+    # 검색 조건:
     # timeframe: 'today 3-m' (오늘 기준 최근 3개월)
     # geo: 'KR' (대한민국)
-    # 
+    #
     # 네이버와 달리, 구글은 '그룹' 개념이 아닌 개별 키워드를 리스트로 전달합니다.
-    pytrends.build_payload(kw_list=keywords_list,
-                           cat=0,
-                           timeframe='today 3-m',
-                           geo='KR',
-                           gprop='')
-
-    # 'Interest Over Time' (시간에 따른 관심도 변화) 데이터를 가져옵니다.
-    # 이 데이터는 'pandas DataFrame'이라는 표(테이블) 형태로 반환됩니다.
+    # (키워드가 5개를 넘어도 trends_service 가 묶음으로 나눠 요청한 뒤 하나의 축으로 합쳐 줍니다.
+    #  같은 조회는 캐시에서 바로 가져오고, 요청 속도 제한/429 재시도도 처리합니다)
     print("Google Trends 데이터 가져오는 중...")
     try:
-        interest_data = pytrends.interest_over_time()
+        interest_data = get_trends_service().interest_over_time(keywords_list, timeframe='today 3-m', geo='KR')
         
         if interest_data.empty:
             print("데이터가 없습니다. (키워드가 너무 적게 검색되었을 수 있습니다)")
             return None
-        
-        # 'isPartial' 컬럼은 "데이터가 부분적인가?"라는 뜻이라 제외하고 출력합니다.
-        if 'isPartial' in interest_data.columns:
-            interest_data = interest_data.drop(columns=['isPartial'])
             
         return interest_data
 
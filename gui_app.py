@@ -2,6 +2,8 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
 import json
+import queue
+import threading
 import pdf_tools  # 1. 우리의 '엔진' 파일을 import
 from dotenv import load_dotenv
 
@@ -15,6 +17,53 @@ if not api_key:
 # --- 전역 변수 (선택된 파일 경로 저장용) ---
 selected_file_path = ""
 
+# --- 작업 스레드 → 화면(메인 스레드)으로 결과를 넘기는 통로 ---
+# (Tk 위젯은 메인 스레드에서만 만져야 하므로, 작업 스레드는 결과를 여기에 넣기만 합니다)
+result_queue = queue.Queue()
+POLL_INTERVAL_MS = 200
+
+
+def run_analysis_in_background(file_path, user_inputs):
+    """
+    (작업 스레드에서 실행) 기획서를 분석하고 결과를 result_queue 에 넣습니다.
+    HWP 변환/AI 응답을 기다리는 동안에도 창이 멈추지 않습니다.
+    """
+    try:
+        # (5)'pdf_tools 호출
+        pdf_analysis_result = pdf_tools.analyze_pdf(file_path)
+
+        if "error" in pdf_analysis_result:
+            raise Exception(pdf_analysis_result['error'])
+
+        # (6) 최종 보고서 조합
+        final_report = {
+            "analysis_summary": pdf_analysis_result,
+            "user_inputs": user_inputs
+        }
+        result_queue.put(("success", final_report))
+    except Exception as e:
+        result_queue.put(("error", e))
+
+
+def poll_analysis_result():
+    """
+    (메인 스레드) root.after 로 주기적으로 불려서, 분석이 끝났으면 결과를 화면에 표시합니다.
+    """
+    try:
+        status, payload = result_queue.get_nowait()
+    except queue.Empty:
+        root.after(POLL_INTERVAL_MS, poll_analysis_result)
+        return
+
+    result_text.delete('1.0', tk.END)
+    if status == "success":
+        # (7) 결과창에 최종 JSON 출력
+        result_text.insert(tk.END, json.dumps(payload, indent=2, ensure_ascii=False))
+    else:
+        # (8) 오류 발생 시 결과창에 오류 메시지 출력
+        result_text.insert(tk.END, f"--- 분석 실패 ---\n\n오류: {payload}")
+    btn_start.config(state='normal')
+
 # --- 2. "분석 시작" 버튼을 눌렀을 때 실행될 함수 ---
 def start_analysis():
     global selected_file_path
@@ -46,33 +95,20 @@ def start_analysis():
     # (4) 결과창 비우기 및 '분석 중' 메시지 표시
     result_text.delete('1.0', tk.END)
     result_text.insert(tk.END, f"'{os.path.basename(selected_file_path)}' 파일 분석 중...\n\n(AI가 응답할 때까지 1~2분 정도 걸릴 수 있습니다...)")
-    root.update_idletasks() # 화면 즉시 새로고침
-
-    try:
-        # (5)'pdf_tools 호출
-        pdf_analysis_result = pdf_tools.analyze_pdf(selected_file_path)
-
-        if "error" in pdf_analysis_result:
-            raise Exception(pdf_analysis_result['error'])
-
-        # (6) 최종 보고서 조합
-        final_report = {
-            "analysis_summary": pdf_analysis_result,
-            "user_inputs": {
-                "title": user_title,
-                "theme": user_theme,
-                "keywords": user_keywords_list
-            }
-        }
-        
-        # (7) 결과창에 최종 JSON 출력
-        result_text.delete('1.0', tk.END)
-        result_text.insert(tk.END, json.dumps(final_report, indent=2, ensure_ascii=False))
-        
-    except Exception as e:
-        # (8) 오류 발생 시 결과창에 오류 메시지 출력
-        result_text.delete('1.0', tk.END)
-        result_text.insert(tk.END, f"--- 분석 실패 ---\n\n오류: {e}")
+    btn_start.config(state='disabled')  # (분석이 끝날 때까지 중복 실행 방지)
+
+    user_inputs = {
+        "title": user_title,
+        "theme": user_theme,
+        "keywords": user_keywords_list
+    }
+    worker = threading.Thread(
+        target=run_analysis_in_background,
+        args=(selected_file_path, user_inputs),
+        daemon=True,
+    )
+    worker.start()
+    root.after(POLL_INTERVAL_MS, poll_analysis_result)
 
 # --- 1. "파일 선택" 버튼을 눌렀을 때 실행될 함수 ---
 def select_file():
@@ -98,53 +134,55 @@ def select_file():
         file_label.config(text=f"선택된 파일: {os.path.basename(file_path)}")
         print(f"--- 파일 선택됨: {file_path} ---")
 
-# --- 3. GUI 윈도우 생성 ---
-root = tk.Tk()
-root.title("ACC AI : 기획서 분석기 v1.0")
-root.geometry("700x800") # 창 크기
+# (※ pdf_tools 의 텍스트 추출은 프로세스 풀을 쓰므로, GUI 생성 코드는 main 가드 안에 둡니다)
+if __name__ == "__main__":
+    # --- 3. GUI 윈도우 생성 ---
+    root = tk.Tk()
+    root.title("ACC AI : 기획서 분석기 v1.0")
+    root.geometry("700x800") # 창 크기
 
-# (프레임: 입력 영역)
-input_frame = ttk.Frame(root, padding="10")
-input_frame.pack(fill='x')
+    # (프레임: 입력 영역)
+    input_frame = ttk.Frame(root, padding="10")
+    input_frame.pack(fill='x')
 
-# (1) 제목 입력
-ttk.Label(input_frame, text="축제 제목:").pack(anchor='w', padx=5)
-entry_title = ttk.Entry(input_frame)
-entry_title.pack(fill='x', padx=5, pady=2)
+    # (1) 제목 입력
+    ttk.Label(input_frame, text="축제 제목:").pack(anchor='w', padx=5)
+    entry_title = ttk.Entry(input_frame)
+    entry_title.pack(fill='x', padx=5, pady=2)
 
-# (2) 테마(기획의도) 입력 (여러 줄)
-ttk.Label(input_frame, text="테마/기획의도:").pack(anchor='w', padx=5, pady=(10, 0))
-entry_theme = tk.Text(input_frame, height=5, width=60)
-entry_theme.pack(fill='x', padx=5, pady=2)
+    # (2) 테마(기획의도) 입력 (여러 줄)
+    ttk.Label(input_frame, text="테마/기획의도:").pack(anchor='w', padx=5, pady=(10, 0))
+    entry_theme = tk.Text(input_frame, height=5, width=60)
+    entry_theme.pack(fill='x', padx=5, pady=2)
 
-# (3) 키워드 입력
-ttk.Label(input_frame, text="핵심 키워드 (콤마,로 구분):").pack(anchor='w', padx=5, pady=(10, 0))
-entry_keywords = ttk.Entry(input_frame)
-entry_keywords.pack(fill='x', padx=5, pady=2)
+    # (3) 키워드 입력
+    ttk.Label(input_frame, text="핵심 키워드 (콤마,로 구분):").pack(anchor='w', padx=5, pady=(10, 0))
+    entry_keywords = ttk.Entry(input_frame)
+    entry_keywords.pack(fill='x', padx=5, pady=2)
 
-# (4) 파일 선택 버튼(끌어오기 대체)
-file_frame = ttk.Frame(input_frame)
-file_frame.pack(fill='x', pady=(15, 5))
+    # (4) 파일 선택 버튼(끌어오기 대체)
+    file_frame = ttk.Frame(input_frame)
+    file_frame.pack(fill='x', pady=(15, 5))
 
-btn_select_file = ttk.Button(file_frame, text="기획서 파일 선택 (.pdf, .docx, .hwp)", command=select_file)
-btn_select_file.pack(side='left', padx=5)
+    btn_select_file = ttk.Button(file_frame, text="기획서 파일 선택 (.pdf, .docx, .hwp)", command=select_file)
+    btn_select_file.pack(side='left', padx=5)
 
-file_label = ttk.Label(file_frame, text="파일이 선택되지 않았습니다.", foreground="grey")
-file_label.pack(side='left', padx=10)
+    file_label = ttk.Label(file_frame, text="파일이 선택되지 않았습니다.", foreground="grey")
+    file_label.pack(side='left', padx=10)
 
-# (5) 분석 시작 버튼
-btn_start = ttk.Button(root, text="기획서 분석 시작", command=start_analysis)
-btn_start.pack(fill='x', padx=15, pady=10)
+    # (5) 분석 시작 버튼
+    btn_start = ttk.Button(root, text="기획서 분석 시작", command=start_analysis)
+    btn_start.pack(fill='x', padx=15, pady=10)
 
-# (프레임: 결과 영역)
-result_frame = ttk.Frame(root, padding="10")
-result_frame.pack(fill='both', expand=True)
+    # (프레임: 결과 영역)
+    result_frame = ttk.Frame(root, padding="10")
+    result_frame.pack(fill='both', expand=True)
 
-ttk.Label(result_frame, text="--- 분석 결과 (JSON) ---").pack(anchor='w')
+    ttk.Label(result_frame, text="--- 분석 결과 (JSON) ---").pack(anchor='w')
 
-# (6) 결과 출력창 (스크롤 가능)
-result_text = scrolledtext.ScrolledText(result_frame, wrap=tk.WORD, width=80, height=25)
-result_text.pack(fill='both', expand=True)
+    # (6) 결과 출력창 (스크롤 가능)
+    result_text = scrolledtext.ScrolledText(result_frame, wrap=tk.WORD, width=80, height=25)
+    result_text.pack(fill='both', expand=True)
 
-# (윈도우 실행)
-root.mainloop()
\ No newline at end of file
+    # (윈도우 실행)
+    root.mainloop()
\ No newline at end of file
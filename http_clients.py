@@ -0,0 +1,163 @@
+# http_clients.py
+# (모든 모듈이 같이 쓰는 OpenAI 클라이언트 / HTTP 세션 - 연결을 재사용해서 매번 TLS 연결을 새로 맺지 않음)
+
+import os
+import threading
+
+import openai
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx  # (openai SDK 가 쓰는 HTTP 라이브러리 - 연결 풀 크기를 직접 지정할 때 필요)
+except ImportError:
+    httpx = None
+
+# --- 연결 풀 / 타임아웃 / 재시도 설정 (.env 또는 환경 변수로 변경 가능) ---
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 20))        # 호스트당 유지할 연결 수
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 30))          # 일반 HTTP 요청 타임아웃(초)
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))     # 429/5xx 자동 재시도 횟수
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", 0.5))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", 120))     # AI 응답은 오래 걸릴 수 있음
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", 2))
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_lock = threading.Lock()
+_openai_client = None
+_http_session = None
+_no_retry_http_session = None
+
+
+class _TimeoutSession(requests.Session):
+    """
+    timeout 을 따로 주지 않은 요청에도 기본 타임아웃(HTTP_TIMEOUT)을 적용하는 세션입니다.
+    """
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", HTTP_TIMEOUT)
+        return super().request(method, url, **kwargs)
+
+
+def _openai_http_client(is_async=False):
+    """
+    연결 풀 크기(HTTP_POOL_SIZE)를 지정한 httpx 클라이언트를 만듭니다.
+    (httpx 를 찾을 수 없으면 None → openai SDK 기본 연결 풀 사용)
+    """
+    if httpx is None:
+        return None
+    limits = httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE)
+    client_class = httpx.AsyncClient if is_async else httpx.Client
+    return client_class(limits=limits, timeout=OPENAI_TIMEOUT)
+
+
+def get_openai_client():
+    """
+    프로그램 전체에서 하나만 만들어 같이 쓰는 openai.OpenAI 클라이언트를 반환합니다.
+    (여러 스레드에서 동시에 써도 안전합니다)
+    """
+    global _openai_client
+    if _openai_client is None:
+        with _lock:
+            if _openai_client is None:
+                _openai_client = openai.OpenAI(
+                    timeout=OPENAI_TIMEOUT,
+                    max_retries=OPENAI_MAX_RETRIES,
+                    http_client=_openai_http_client(),
+                )
+    return _openai_client
+
+
+def create_async_openai_client(max_retries=None):
+    """
+    같은 연결 풀 설정을 쓰는 openai.AsyncOpenAI 클라이언트를 새로 만듭니다.
+    (비동기 클라이언트는 이벤트 루프에 묶이므로, 배치 작업마다 하나 만들고 끝나면 close 하세요)
+    """
+    return openai.AsyncOpenAI(
+        timeout=OPENAI_TIMEOUT,
+        max_retries=OPENAI_MAX_RETRIES if max_retries is None else max_retries,
+        http_client=_openai_http_client(is_async=True),
+    )
+
+
+def _create_http_session(retries):
+    if retries:
+        max_retries = Retry(
+            total=HTTP_MAX_RETRIES,
+            backoff_factor=HTTP_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=None,  # POST 도 재시도
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+    else:
+        max_retries = 0
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=max_retries)
+    session = _TimeoutSession()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session(retries=True):
+    """
+    프로그램 전체에서 같이 쓰는 requests.Session 을 반환합니다.
+    - keep-alive 연결 풀 (HTTP_POOL_SIZE)
+    - 기본 타임아웃 (HTTP_TIMEOUT)
+    - 429/5xx 응답은 지수 백오프로 자동 재시도 (HTTP_MAX_RETRIES)
+
+    retries=False 면 자동 재시도가 없는 세션을 반환합니다.
+    (데이터랩처럼 요청마다 호출 한도를 쓰고 클라이언트가 직접 재시도하는 API 용 - 재시도가 두 겹으로 쌓이지 않게)
+    """
+    global _http_session, _no_retry_http_session
+    if retries:
+        if _http_session is None:
+            with _lock:
+                if _http_session is None:
+                    _http_session = _create_http_session(retries=True)
+        return _http_session
+    if _no_retry_http_session is None:
+        with _lock:
+            if _no_retry_http_session is None:
+                _no_retry_http_session = _create_http_session(retries=False)
+    return _no_retry_http_session
+
+
+def close_clients():
+    """
+    공유 클라이언트/세션의 연결을 모두 닫습니다. (프로그램 종료 시 호출)
+    """
+    global _openai_client, _http_session, _no_retry_http_session
+    with _lock:
+        if _openai_client is not None:
+            _openai_client.close()
+            _openai_client = None
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+        if _no_retry_http_session is not None:
+            _no_retry_http_session.close()
+            _no_retry_http_session = None
+
+
+def set_openai_client(client):
+    """
+    공유 OpenAI 클라이언트를 바꿔 끼웁니다. (벤치마크/테스트에서 가짜 클라이언트를 쓸 때)
+    """
+    global _openai_client
+    with _lock:
+        _openai_client = client
+
+
+def set_http_session(session, retries=True):
+    """
+    공유 HTTP 세션을 바꿔 끼웁니다. (벤치마크/테스트에서 가짜 세션을 쓸 때)
+    retries=False 면 자동 재시도가 없는 세션(get_http_session(retries=False)) 자리를 바꿉니다.
+    """
+    global _http_session, _no_retry_http_session
+    with _lock:
+        if retries:
+            _http_session = session
+        else:
+            _no_retry_http_session = session
@@ -0,0 +1,149 @@
+# hwp_converter.py
+# (여러 HWP 파일의 CloudConvert 변환을 한꺼번에 걸어두고 동시에 기다리는 비동기 변환 관리자)
+#
+# cloudconvert.Job.wait 는 변환이 끝날 때까지 스레드를 붙잡고 있어서, 파일이 여러 개면 하나씩 순서대로 처리됩니다.
+# 이 모듈은 작업을 먼저 모두 등록한 뒤 Job.show 로 상태를 (점점 간격을 늘려가며) 확인하고,
+# 끝난 파일부터 PDF 를 받아 다음 단계(텍스트 추출)로 넘깁니다.
+#
+# 사용 예:
+#   async with HwpConversionManager(max_in_flight=4) as manager:
+#       async for hwp_path, pdf_path, error in manager.convert_many(paths):
+#           ...
+
+import asyncio
+import functools
+import os
+import time
+
+import pdf_tools
+
+# --- 변환 설정 (.env 또는 환경 변수로 변경 가능) ---
+HWP_MAX_IN_FLIGHT = int(os.getenv("HWP_MAX_IN_FLIGHT", 4))          # 동시에 진행하는 변환 작업 수
+HWP_POLL_INITIAL = float(os.getenv("HWP_POLL_INITIAL", 1.0))        # 첫 상태 확인 간격(초)
+HWP_POLL_MAX = float(os.getenv("HWP_POLL_MAX", 10.0))               # 상태 확인 간격 상한(초)
+HWP_CONVERT_TIMEOUT = float(os.getenv("HWP_CONVERT_TIMEOUT", 300))  # 파일 하나당 변환 제한 시간(초)
+
+FINISHED_STATUSES = ("finished", "error")
+
+
+class ConversionError(Exception):
+    pass
+
+
+class HwpConversionManager:
+    """
+    HWP → PDF 변환 작업을 동시에 관리합니다.
+
+    - 동시에 CloudConvert 에 올라가 있는 작업 수는 max_in_flight 개로 제한
+    - 상태 확인은 poll_initial 초부터 1.5배씩 늘려 poll_max 초까지 (지수 백오프)
+    - 이미 변환된 PDF 가 캐시에 있으면 CloudConvert 를 부르지 않음
+    - 같은 파일을 여러 번 요청하면 하나의 작업을 같이 기다림
+    - cancel() 또는 async with 블록이 끝나면 남은 작업을 취소하고 CloudConvert 쪽 작업도 삭제
+    """
+
+    def __init__(self, max_in_flight=None, poll_initial=None, poll_max=None, timeout=None, progress=None):
+        self.max_in_flight = max(1, max_in_flight or HWP_MAX_IN_FLIGHT)
+        self.poll_initial = poll_initial or HWP_POLL_INITIAL
+        self.poll_max = poll_max or HWP_POLL_MAX
+        self.timeout = timeout or HWP_CONVERT_TIMEOUT
+        self.progress = progress
+        self._semaphore = None
+        self._tasks = {}
+        self._remote_jobs = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.cancel()
+
+    # (CloudConvert SDK 는 pdf_tools 에서 API 키로 설정한 것을 그대로 사용)
+    async def _call(self, func, *args, **kwargs):
+        # (cloudconvert SDK 는 동기 함수라서 스레드에서 실행)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    async def _wait_for_job(self, job_id):
+        deadline = time.monotonic() + self.timeout
+        delay = self.poll_initial
+        while True:
+            job = await self._call(pdf_tools.cloudconvert.Job.show, id=job_id)
+            if job.get("status") in FINISHED_STATUSES:
+                return job
+            if time.monotonic() + delay > deadline:
+                raise ConversionError(f"CloudConvert 변환 시간 초과 ({self.timeout:g}초)")
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, self.poll_max)
+
+    async def _convert(self, hwp_file_path):
+        cached_path = await self._call(pdf_tools.get_converted_pdf_path, hwp_file_path)
+        if cached_path is not None:
+            return cached_path
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        async with self._semaphore:
+            name = os.path.basename(hwp_file_path)
+            print(f"  [hwp_converter] 변환 작업 등록: {name}")
+            job = await self._call(pdf_tools.start_cloudconvert_job, hwp_file_path)
+            job_id = job["id"]
+            self._remote_jobs.add(job_id)
+            try:
+                job = await self._wait_for_job(job_id)
+            except asyncio.CancelledError:
+                raise  # (CloudConvert 쪽 작업은 cancel() 에서 삭제)
+            except Exception:
+                await self._delete_remote_job(job_id)
+                raise
+            self._remote_jobs.discard(job_id)
+            pdf_url = pdf_tools.get_export_url(job)
+            pdf_path = await self._call(pdf_tools.download_converted_pdf, hwp_file_path, pdf_url, self.progress)
+            print(f"  [hwp_converter] 변환 완료: {name}")
+            return pdf_path
+
+    def convert(self, hwp_file_path):
+        """
+        변환을 시작하고 asyncio.Task 를 반환합니다. (await 하면 변환된 PDF 경로)
+        """
+        key = os.path.abspath(hwp_file_path)
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._convert(hwp_file_path))
+            self._tasks[key] = task
+        return task
+
+    async def convert_many(self, hwp_file_paths):
+        """
+        모든 파일의 변환을 한꺼번에 시작하고, 끝나는 순서대로 (HWP 경로, PDF 경로, 오류) 를 yield 합니다.
+        (실패한 파일은 PDF 경로가 None, 오류에 예외 객체)
+        """
+        tasks = {self.convert(path): path for path in hwp_file_paths}
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled():
+                    yield tasks[task], None, asyncio.CancelledError()
+                elif task.exception() is not None:
+                    yield tasks[task], None, task.exception()
+                else:
+                    yield tasks[task], task.result(), None
+
+    async def cancel(self):
+        """
+        아직 끝나지 않은 변환을 모두 취소하고, CloudConvert 쪽에 남은 작업도 삭제합니다.
+        """
+        running = [task for task in self._tasks.values() if not task.done()]
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        for job_id in list(self._remote_jobs):
+            await self._delete_remote_job(job_id)
+
+    async def _delete_remote_job(self, job_id):
+        self._remote_jobs.discard(job_id)
+        try:
+            await self._call(pdf_tools.cloudconvert.Job.delete, id=job_id)
+        except Exception as e:
+            print(f"  [hwp_converter] CloudConvert 작업 삭제 실패 ({job_id}): {e}")
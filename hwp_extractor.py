@@ -0,0 +1,204 @@
+# hwp_extractor.py
+# (한글 HWP 5.x 파일에서 본문 텍스트를 직접 추출 - CloudConvert 없이 로컬에서 처리)
+#
+# HWP 5.x 파일 구조 (OLE 복합 문서):
+#   FileHeader         서명/버전/속성 (bit0 = 압축, bit1 = 암호, bit2 = 배포용 문서)
+#   BodyText/Section0  본문 (압축 시 zlib raw deflate), 레코드들의 연속
+#   BodyText/Section1  ...
+# 레코드 헤더(4바이트): tag 10비트 | level 10비트 | size 12비트 (size 가 0xFFF 면 뒤 4바이트가 실제 크기)
+# 문단 텍스트는 HWPTAG_PARA_TEXT(67) 레코드에 UTF-16LE 로 들어 있고, 중간에 제어 문자가 섞여 있습니다.
+#
+# 암호/배포용/손상된 문서처럼 읽을 수 없는 파일은 HwpParseError 를 발생시킵니다. (호출하는 쪽에서 CloudConvert 로 대체)
+
+import io
+import struct
+import zlib
+
+import numpy as np
+
+try:
+    import olefile
+except ImportError:  # (olefile 이 없으면 로컬 추출을 쓰지 않고 CloudConvert 만 사용)
+    olefile = None
+
+HWP_SIGNATURE = b"HWP Document File"
+HWPTAG_BEGIN = 0x10
+HWPTAG_PARA_TEXT = HWPTAG_BEGIN + 51  # 67
+
+FLAG_COMPRESSED = 0x01
+FLAG_ENCRYPTED = 0x02
+FLAG_DISTRIBUTION = 0x04
+
+# 제어 문자 중 1글자(2바이트)짜리. 나머지(1~9, 11~12, 14~23)는 8글자(16바이트)를 차지합니다.
+CHAR_CONTROLS = frozenset([0, 10, 13] + list(range(24, 32)))
+CONTROL_REPLACEMENTS = {9: "\t", 10: "\n", 13: "\n", 30: " ", 31: " "}
+EXTENDED_CONTROL_WCHARS = 8
+
+
+class HwpParseError(Exception):
+    pass
+
+
+def is_available():
+    return olefile is not None
+
+
+def is_readable(source):
+    """
+    본문을 읽지 않고 헤더/섹션 목록만 확인해서, 로컬 추출이 가능한 HWP 파일인지 판단합니다.
+    """
+    try:
+        ole = _open_ole(source)
+    except HwpParseError:
+        return False
+    try:
+        _read_header_flags(ole)
+        _section_streams(ole)
+        return True
+    except HwpParseError:
+        return False
+    finally:
+        ole.close()
+
+
+def _open_ole(source):
+    if olefile is None:
+        raise HwpParseError("olefile 패키지가 설치되어 있지 않습니다.")
+    data = source if isinstance(source, (bytes, bytearray)) else None
+    if data is not None:
+        source = io.BytesIO(data)
+    try:
+        if not olefile.isOleFile(source if data is None else data):
+            raise HwpParseError("HWP 5.x(OLE) 형식이 아닙니다. (HWPX 또는 HWP 3.x 일 수 있음)")
+        return olefile.OleFileIO(source)
+    except (OSError, ValueError) as e:
+        raise HwpParseError(f"HWP 파일을 열 수 없습니다: {e}")
+
+
+def _read_stream(ole, name):
+    # (섹터 연결이 깨진 파일은 olefile 이 OSError 등을 내므로, 호출하는 쪽이 CloudConvert 로 대체할 수 있게 바꿔서 전달)
+    try:
+        return ole.openstream(name).read()
+    except (OSError, ValueError, struct.error) as e:
+        raise HwpParseError(f"'{name}' 스트림을 읽을 수 없습니다. (손상된 파일): {e}")
+
+
+def _read_header_flags(ole):
+    if not ole.exists("FileHeader"):
+        raise HwpParseError("FileHeader 스트림이 없습니다.")
+    header = _read_stream(ole, "FileHeader")
+    if len(header) < 40 or not header.startswith(HWP_SIGNATURE):
+        raise HwpParseError("HWP 서명이 올바르지 않습니다.")
+    flags = struct.unpack_from("<I", header, 36)[0]
+    if flags & FLAG_ENCRYPTED:
+        raise HwpParseError("암호가 걸린 HWP 문서입니다.")
+    if flags & FLAG_DISTRIBUTION:
+        raise HwpParseError("배포용 HWP 문서입니다. (본문이 암호화되어 있음)")
+    return flags
+
+
+def _section_streams(ole):
+    sections = []
+    for entry in ole.listdir(streams=True, storages=False):
+        if len(entry) == 2 and entry[0] == "BodyText" and entry[1].startswith("Section"):
+            try:
+                sections.append((int(entry[1][len("Section"):]), "/".join(entry)))
+            except ValueError:
+                continue
+    if not sections:
+        raise HwpParseError("BodyText 섹션이 없습니다.")
+    return [name for _, name in sorted(sections)]
+
+
+def _inflate(data):
+    try:
+        return zlib.decompressobj(-15).decompress(data)
+    except zlib.error as e:
+        raise HwpParseError(f"본문 압축 해제 실패: {e}")
+
+
+def iter_records(data):
+    """
+    섹션 데이터에서 (tag, level, payload) 를 순서대로 꺼냅니다.
+    """
+    offset, length = 0, len(data)
+    while offset + 4 <= length:
+        header = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+        tag = header & 0x3FF
+        level = (header >> 10) & 0x3FF
+        size = (header >> 20) & 0xFFF
+        if size == 0xFFF:
+            if offset + 4 > length:
+                break
+            size = struct.unpack_from("<I", data, offset)[0]
+            offset += 4
+        if offset + size > length:
+            raise HwpParseError("레코드 크기가 섹션 길이를 넘습니다. (손상된 파일)")
+        yield tag, level, data[offset:offset + size]
+        offset += size
+
+
+def decode_para_text(payload):
+    """
+    HWPTAG_PARA_TEXT 레코드(UTF-16LE)를 문자열로 바꿉니다.
+    표/그림 등 확장 제어 문자(8글자)는 건너뛰고, 탭/줄바꿈만 남깁니다.
+    """
+    if len(payload) % 2:
+        payload = payload[:-1]
+    codes = np.frombuffer(payload, dtype="<u2")
+    controls = np.flatnonzero(codes < 32)
+    if controls.size == 0:
+        return payload.decode("utf-16le", errors="ignore")
+
+    parts, start = [], 0
+    for position in controls.tolist():
+        if position < start:
+            continue  # (앞 확장 제어 문자의 데이터 영역)
+        if start < position:
+            parts.append(payload[start * 2:position * 2].decode("utf-16le", errors="ignore"))
+        code = int(codes[position])
+        parts.append(CONTROL_REPLACEMENTS.get(code, ""))
+        start = position + (1 if code in CHAR_CONTROLS else EXTENDED_CONTROL_WCHARS)
+    if start < len(codes):
+        parts.append(payload[start * 2:].decode("utf-16le", errors="ignore"))
+    return "".join(parts)
+
+
+def _section_text(data):
+    return "".join(decode_para_text(payload) for tag, _, payload in iter_records(data) if tag == HWPTAG_PARA_TEXT)
+
+
+def extract_hwp_text(source, max_chars=None):
+    """
+    HWP 5.x 파일(경로 또는 bytes)에서 본문 텍스트를 추출합니다.
+    max_chars 를 주면 그 글자 수를 채우는 순간 남은 섹션은 읽지 않습니다.
+
+    반환값: (텍스트, {"sections_read": 읽은 섹션 수, "section_count": 전체 섹션 수})
+    읽을 수 없는 파일이면 HwpParseError 를 발생시킵니다.
+    """
+    ole = _open_ole(source)
+    try:
+        flags = _read_header_flags(ole)
+        sections = _section_streams(ole)
+        texts, total, sections_read = [], 0, 0
+        for name in sections:
+            data = _read_stream(ole, name)
+            if flags & FLAG_COMPRESSED:
+                data = _inflate(data)
+            try:
+                text = _section_text(data)
+            except struct.error as e:
+                raise HwpParseError(f"'{name}' 레코드를 읽을 수 없습니다. (손상된 파일): {e}")
+            texts.append(text)
+            total += len(text)
+            sections_read += 1
+            if max_chars is not None and total >= max_chars:
+                break
+    finally:
+        ole.close()
+
+    full_text = "".join(texts)
+    if max_chars is not None:
+        full_text = full_text[:max_chars]
+    return full_text, {"sections_read": sections_read, "section_count": len(sections)}
@@ -0,0 +1,125 @@
+# image_cache.py
+# (참고 이미지와 그 색상 팔레트를 로컬에 보관하는 캐시)
+#
+# - 이미지: URL 기준으로 저장. ETag / Last-Modified 도 같이 보관해서, TTL 이 지나면
+#   조건부 요청(If-None-Match / If-Modified-Since)으로 '바뀌었는지만' 확인합니다. (304 면 다시 받지 않음)
+# - 팔레트: 이미지 '내용 해시' 기준으로 저장. URL 이 달라도 같은 이미지면 색상 계산을 다시 하지 않습니다.
+# - 두 캐시 모두 용량 한도를 넘으면 오래 쓰지 않은 것부터 지웁니다. (disk_cache.DiskCache)
+
+import hashlib
+import os
+import time
+
+from disk_cache import DiskCache, make_key
+
+# --- 캐시 설정 (.env 또는 환경 변수로 변경 가능) ---
+IMAGE_CACHE_TTL = int(os.getenv("IMAGE_CACHE_TTL", 24 * 60 * 60))  # 이 시간(초)이 지나면 서버에 변경 여부 확인
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", 300 * 1024 * 1024))
+PALETTE_CACHE_MAX_BYTES = int(os.getenv("PALETTE_CACHE_MAX_BYTES", 20 * 1024 * 1024))
+
+
+class ImageCache:
+    """
+    URL → (이미지 bytes, 내용 해시) / 내용 해시 → 팔레트 를 보관합니다.
+    palette_key 에는 팔레트 계산 방식(색상 수, 분석 크기 등)을 넣어서, 설정이 바뀌면 다시 계산되도록 합니다.
+    """
+
+    def __init__(self, palette_key="", ttl=None, root=None):
+        self.ttl = IMAGE_CACHE_TTL if ttl is None else ttl
+        self.palette_key = palette_key
+        self.images = DiskCache("images", max_bytes=IMAGE_CACHE_MAX_BYTES, root=root)
+        self.palettes = DiskCache("palettes", max_bytes=PALETTE_CACHE_MAX_BYTES, root=root)
+
+    # ---------------------------------
+    # 이미지
+    # ---------------------------------
+    def _meta(self, url):
+        key = make_key(url)
+        meta = self.images.get(key)
+        if meta is None or self.images.get_path(key) is None:
+            return None  # (메타 정보나 이미지 파일 중 하나가 지워졌으면 없는 것으로 처리)
+        return meta
+
+    def _is_fresh(self, meta):
+        return time.time() - meta.get("fetched_at", 0) <= self.ttl
+
+    def _store(self, url, data, headers):
+        key = make_key(url)
+        meta = {
+            "url": url,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        self.images.set_bytes(key, data)
+        self.images.set(key, meta)
+        return meta
+
+    def fetch(self, session, url, timeout=None):
+        """
+        이미지를 가져옵니다. 반환값: (이미지 bytes, 내용 해시, 상태)
+        상태: "fresh"(TTL 안이라 확인 없이 사용) / "revalidated"(304, 그대로 사용) / "downloaded"(새로 받음)
+        """
+        key = make_key(url)
+        meta = self._meta(url)
+        if meta is not None and self._is_fresh(meta):
+            data = self.images.get_bytes(key)
+            if data is not None:
+                return data, meta["sha256"], "fresh"
+
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = session.get(url, timeout=timeout, headers=headers or None)
+        if response.status_code == 304 and meta is not None:
+            data = self.images.get_bytes(key)
+            if data is not None:
+                meta["fetched_at"] = time.time()
+                self.images.set(key, meta)
+                return data, meta["sha256"], "revalidated"
+            # (확인하는 사이 이미지 파일이 지워졌으면 조건 없이 다시 받음)
+            response = session.get(url, timeout=timeout)
+
+        response.raise_for_status()
+        meta = self._store(url, response.content, response.headers)
+        return response.content, meta["sha256"], "downloaded"
+
+    # ---------------------------------
+    # 팔레트
+    # ---------------------------------
+    def _palette_cache_key(self, sha256):
+        return make_key(sha256, self.palette_key)
+
+    def get_palette(self, sha256):
+        return self.palettes.get(self._palette_cache_key(sha256))
+
+    def set_palette(self, sha256, palette):
+        self.palettes.set(self._palette_cache_key(sha256), palette)
+
+    def cached_palette_for_url(self, url):
+        """
+        TTL 안에 있는 URL 이고 팔레트도 계산해 둔 적이 있으면 (네트워크/디코딩 없이) (내용 해시, 팔레트) 를,
+        아니면 None 을 반환합니다.
+        """
+        meta = self._meta(url)
+        if meta is None or not self._is_fresh(meta):
+            return None
+        palette = self.get_palette(meta["sha256"])
+        return None if palette is None else (meta["sha256"], palette)
+
+    # ---------------------------------
+    # 지각 해시 (중복 이미지 판별용, image_dedup)
+    # ---------------------------------
+    def get_hashes(self, sha256):
+        return self.palettes.get(make_key(sha256, "phash"))
+
+    def set_hashes(self, sha256, hashes):
+        self.palettes.set(make_key(sha256, "phash"), hashes)
+
+    def stats(self):
+        return {"images": self.images.stats(), "palettes": self.palettes.stats()}
@@ -0,0 +1,96 @@
+# image_dedup.py
+# (거의 같은 이미지(크기만 다른 포스터, 재압축본 등)를 찾아내는 지각 해시(perceptual hash) 색인)
+#
+# - aHash: 8x8 흑백으로 줄인 뒤 '평균보다 밝은가' 64비트
+# - dHash: 9x8 흑백으로 줄인 뒤 '오른쪽 픽셀보다 밝은가' 64비트
+# - 평균 색: 두 해시는 밝기 구조만 보므로, 구도는 같고 색만 다른 이미지(색상 변형 포스터 등)를 구분하기 위해 같이 비교
+# 두 해시의 해밍 거리가 모두 DEDUP_MAX_DISTANCE 이하이고 평균 색 차이가 DEDUP_MAX_COLOR_DIFF 이하이면 같은 이미지로 봅니다.
+# (JPEG 는 draft 모드로 디코딩 단계에서 1/8 크기로 읽으므로, 해시 계산은 전체 디코딩보다 훨씬 가볍습니다)
+
+import io
+import os
+
+import numpy as np
+from PIL import Image
+
+DEDUP_MAX_DISTANCE = int(os.getenv("DEDUP_MAX_DISTANCE", 6))  # 64비트 중 다른 비트 수 허용치
+DEDUP_MAX_COLOR_DIFF = int(os.getenv("DEDUP_MAX_COLOR_DIFF", 24))  # 평균 색 채널별 차이 허용치 (0~255)
+HASH_SIZE = 8
+
+
+def _small_rgb(image_bytes, width, height):
+    image = Image.open(io.BytesIO(image_bytes))
+    image.draft("RGB", (width * 8, height * 8))
+    return image.convert("RGB").resize((width, height), Image.BILINEAR)
+
+
+def _bits_to_int(bits):
+    return int("".join("1" if b else "0" for b in bits.ravel()), 2)
+
+
+def image_hashes(image_bytes):
+    """
+    이미지의 aHash / dHash / 평균 색을 계산합니다. 반환값: {"ahash": int, "dhash": int, "color": [r, g, b]}
+    """
+    small = _small_rgb(image_bytes, HASH_SIZE + 1, HASH_SIZE)
+    pixels = np.asarray(small.convert("L"), dtype=np.int16)
+    dhash = _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+    square = pixels[:, :HASH_SIZE]
+    ahash = _bits_to_int(square > square.mean())
+    color = np.asarray(small, dtype=np.float64).reshape(-1, 3).mean(axis=0)
+    return {"ahash": ahash, "dhash": dhash, "color": [int(round(c)) for c in color]}
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateIndex:
+    """
+    이미지 해시를 하나씩 넣으면서, 이미 들어온 이미지와 거의 같은지 확인합니다.
+
+    index = NearDuplicateIndex()
+    index.add("a", hashes_a)  # → None (처음 보는 이미지)
+    index.add("b", hashes_b)  # → "a"  (a 와 거의 같음)
+    index.groups()            # → {"a": ["a", "b"]}
+    """
+
+    def __init__(self, max_distance=None, max_color_diff=None):
+        self.max_distance = DEDUP_MAX_DISTANCE if max_distance is None else max_distance
+        self.max_color_diff = DEDUP_MAX_COLOR_DIFF if max_color_diff is None else max_color_diff
+        self._keys = []
+        self._hashes = np.empty((0, 2), dtype=np.uint64)
+        self._colors = np.empty((0, 3), dtype=np.float64)
+        self._groups = {}
+
+    def _distances(self, hashes):
+        # (모든 대표 이미지와의 해밍 거리를 한 번에 계산)
+        probe = np.array([hashes["ahash"], hashes["dhash"]], dtype=np.uint64)
+        xor = np.bitwise_xor(self._hashes, probe)
+        return np.unpackbits(xor.view(np.uint8), axis=1).reshape(len(self._keys), 2, 64).sum(axis=2)
+
+    def add(self, key, hashes):
+        """
+        key 를 색인에 넣습니다. 거의 같은 이미지가 이미 있으면 그 대표 key 를, 없으면 None 을 반환합니다.
+        """
+        if self._keys:
+            distances = self._distances(hashes)
+            color_diff = np.abs(self._colors - np.asarray(hashes["color"], dtype=np.float64)).max(axis=1)
+            matches = np.flatnonzero((distances <= self.max_distance).all(axis=1) & (color_diff <= self.max_color_diff))
+            if matches.size:
+                best = matches[np.argmin(distances[matches].sum(axis=1))]
+                representative = self._keys[best]
+                self._groups[representative].append(key)
+                return representative
+
+        self._keys.append(key)
+        self._hashes = np.vstack([self._hashes, np.array([[hashes["ahash"], hashes["dhash"]]], dtype=np.uint64)])
+        self._colors = np.vstack([self._colors, np.asarray([hashes["color"]], dtype=np.float64)])
+        self._groups[key] = [key]
+        return None
+
+    def groups(self, include_singletons=False):
+        """
+        {대표 key: [대표 key, 같은 이미지로 묶인 key...]} 를 반환합니다.
+        """
+        return {k: list(v) for k, v in self._groups.items() if include_singletons or len(v) > 1}
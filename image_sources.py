@@ -0,0 +1,160 @@
+# image_sources.py
+# (키워드로 참고 이미지 URL 을 모아 오는 '이미지 소스' 모음 - 시각 분석(visual_analyzer)의 1단계)
+#
+# 소스마다 iter_image_urls(keyword, limit) 가 URL 을 '찾는 대로' 하나씩 yield 합니다.
+# (페이지 단위로 받는 API 라도 첫 페이지가 오자마자 다운로드/색상 추출을 시작할 수 있도록)
+#
+# - "pexels"  : Pexels 검색 API (PEXELS_API_KEY 필요)
+# - "sample"  : 고정된 샘플 이미지 3장 (키워드 무시, API 키가 없을 때 기본값)
+# - "fixture" : 테스트용. JSON 파일/딕셔너리의 {키워드: [URL...]} 또는 키워드로 만든 가짜 URL
+#
+# 사용 예:
+#   source = get_image_source("pexels")
+#   for url in source.iter_image_urls("담양 산타 축제", limit=12):
+#       ...
+# 새 소스는 register_image_source("이름", 팩토리) 로 추가합니다.
+
+import json
+import os
+import time
+from urllib.parse import quote
+
+from dotenv import load_dotenv
+
+from http_clients import get_http_session
+
+load_dotenv()
+
+# --- 이미지 소스 설정 (.env 또는 환경 변수로 변경 가능) ---
+PEXELS_API_KEY = os.getenv("PEXELS_API_KEY")
+IMAGE_SOURCE = os.getenv("IMAGE_SOURCE")                      # 비워 두면 Pexels 키가 있으면 pexels, 없으면 sample
+IMAGE_SOURCE_LIMIT = int(os.getenv("IMAGE_SOURCE_LIMIT", 12))  # 키워드당 모을 이미지 수
+IMAGE_FIXTURE_PATH = os.getenv("IMAGE_FIXTURE_PATH")           # fixture 소스가 읽을 JSON 파일
+SOURCE_REQUEST_TIMEOUT = float(os.getenv("IMAGE_SOURCE_TIMEOUT", 10))
+
+PEXELS_SEARCH_URL = "https://api.pexels.com/v1/search"
+# (색상 분석은 긴 변 256px 로 줄여서 하므로, 원본 대신 작은 크기를 받아 다운로드 양을 줄임)
+PEXELS_IMAGE_SIZE = os.getenv("PEXELS_IMAGE_SIZE", "medium")
+
+# 크롤링을 시뮬레이션할 테스트용 이미지 URL 리스트
+SAMPLE_IMAGE_URLS = [
+    # 1. 따뜻한 베이지/갈색 톤의 실내 이미지
+    "https://images.pexels.com/photos/271816/pexels-photo-271816.jpeg",
+    # 2. 파란색/녹색 톤의 자연(폭포) 이미지
+    "https://images.pexels.com/photos/3225517/pexels-photo-3225517.jpeg",
+    # 3. 강렬한 붉은색/검은색 톤의 도시(네온) 이미지
+    "https://images.pexels.com/photos/1654498/pexels-photo-1654498.jpeg"
+]
+
+
+class SampleImageSource:
+    """
+    키워드와 상관없이 SAMPLE_IMAGE_URLS 를 돌려줍니다.
+    """
+
+    name = "sample"
+
+    def __init__(self, urls=None):
+        self.urls = list(urls or SAMPLE_IMAGE_URLS)
+
+    def iter_image_urls(self, keyword, limit=None):
+        yield from self.urls[:limit or IMAGE_SOURCE_LIMIT]
+
+
+class FixtureImageSource:
+    """
+    (테스트용) 미리 정해 둔 URL 을 돌려줍니다.
+
+    fixture: {키워드: [URL...], "*": [기본 URL...]} 딕셔너리 또는 그 JSON 파일 경로
+             (없으면 키워드로 https://fixture.local/<키워드>/<번호>.jpg 형태의 URL 을 만듦)
+    delay:   URL 하나를 내보낼 때마다 기다릴 시간(초) - 느린 검색 API 흉내
+    """
+
+    name = "fixture"
+
+    def __init__(self, fixture=None, delay=0.0):
+        fixture = fixture if fixture is not None else IMAGE_FIXTURE_PATH
+        if isinstance(fixture, str):
+            with open(fixture, "r", encoding="utf-8") as f:
+                fixture = json.load(f)
+        self.fixture = fixture or {}
+        self.delay = delay
+
+    def iter_image_urls(self, keyword, limit=None):
+        limit = limit or IMAGE_SOURCE_LIMIT
+        urls = self.fixture.get(keyword) or self.fixture.get("*")
+        if urls is None:
+            urls = [f"https://fixture.local/{quote(keyword)}/{i + 1}.jpg" for i in range(limit)]
+        for url in urls[:limit]:
+            if self.delay:
+                time.sleep(self.delay)
+            yield url
+
+
+class PexelsImageSource:
+    """
+    Pexels 검색 API 로 키워드 이미지를 찾습니다. (한 페이지를 받을 때마다 바로 yield)
+    """
+
+    name = "pexels"
+
+    def __init__(self, api_key=None, per_page=15, image_size=None):
+        self.api_key = api_key or PEXELS_API_KEY
+        if not self.api_key:
+            raise ValueError("PEXELS_API_KEY가 없어 Pexels 이미지 검색을 사용할 수 없습니다.")
+        self.per_page = per_page
+        self.image_size = image_size or PEXELS_IMAGE_SIZE
+
+    def iter_image_urls(self, keyword, limit=None):
+        limit = limit or IMAGE_SOURCE_LIMIT
+        session = get_http_session()
+        per_page = min(self.per_page, limit)  # (페이지 크기가 바뀌면 페이지 위치도 바뀌므로 끝까지 같은 값 사용)
+        found, page = 0, 1
+        while found < limit:
+            response = session.get(
+                PEXELS_SEARCH_URL,
+                params={"query": keyword, "per_page": per_page, "page": page},
+                headers={"Authorization": self.api_key},
+                timeout=SOURCE_REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+            data = response.json()
+            photos = data.get("photos") or []
+            for photo in photos:
+                src = photo.get("src") or {}
+                url = src.get(self.image_size) or src.get("original")
+                if url:
+                    found += 1
+                    yield url
+                    if found >= limit:
+                        return
+            if not photos or not data.get("next_page"):
+                return
+            page += 1
+
+
+IMAGE_SOURCES = {
+    "sample": SampleImageSource,
+    "fixture": FixtureImageSource,
+    "pexels": PexelsImageSource,
+}
+
+
+def register_image_source(name, factory):
+    """
+    이미지 소스를 추가합니다. factory() 는 iter_image_urls(keyword, limit) 가 있는 객체를 반환해야 합니다.
+    """
+    IMAGE_SOURCES[name] = factory
+
+
+def get_image_source(source=None):
+    """
+    이름(또는 이미 만든 소스 객체)으로 이미지 소스를 반환합니다.
+    이름이 없으면 IMAGE_SOURCE 설정, 그것도 없으면 Pexels 키가 있을 때 pexels, 없으면 sample 을 씁니다.
+    """
+    if source is not None and not isinstance(source, str):
+        return source
+    name = source or IMAGE_SOURCE or ("pexels" if PEXELS_API_KEY else "sample")
+    if name not in IMAGE_SOURCES:
+        raise ValueError(f"알 수 없는 이미지 소스입니다: {name} (가능: {', '.join(IMAGE_SOURCES)})")
+    return IMAGE_SOURCES[name]()
@@ -0,0 +1,134 @@
+# instrumentation.py
+# (작업별 소요 시간 / 토큰 / 다운로드 바이트 / 캐시 적중 등을 기록하는 계측 모듈)
+#
+# 사용 예:
+#   with instrumentation.stage("analyze_pdf", file=path):
+#       ...
+#       instrumentation.add_counters(pages_parsed=12, prompt_tokens=3000)
+#
+# - METRICS_LOG_PATH 환경 변수를 주면 모든 기록을 JSON Lines 파일에 한 줄씩 추가합니다.
+# - start_run() 으로 '한 번의 실행' 단위로 기록을 모으고, summarize() 로 작업별 합계를 만듭니다.
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+METRICS_LOG_PATH = os.getenv("METRICS_LOG_PATH")
+
+_current_run = contextvars.ContextVar("metrics_run", default=None)
+_current_stage = contextvars.ContextVar("metrics_stage", default=None)
+_log_lock = threading.Lock()
+
+
+def start_run():
+    """
+    새 실행(run) 기록을 시작하고, 기록이 쌓일 리스트를 반환합니다.
+    (같은 컨텍스트에서 실행되는 stage 기록이 이 리스트에 모입니다)
+    """
+    records = []
+    _current_run.set(records)
+    return records
+
+
+def submit_with_context(executor, func, *args, **kwargs):
+    """
+    executor.submit 과 같지만, 현재 실행(run) 정보를 작업 스레드에도 넘겨줍니다.
+    (스레드 풀에서 돈 작업의 기록도 같은 run 에 모이도록)
+    """
+    return executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+def _emit(record):
+    records = _current_run.get()
+    if records is not None:
+        records.append(record)
+    if METRICS_LOG_PATH:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with _log_lock:
+            with open(METRICS_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+@contextmanager
+def stage(name, **fields):
+    """
+    with 블록의 실행 시간을 재서 기록합니다. 블록 안에서 add_counters() 로 숫자를 더할 수 있습니다.
+    """
+    record = {"stage": name, "parent": (_current_stage.get() or {}).get("stage"), **fields}
+    token = _current_stage.set(record)
+    started = time.perf_counter()
+    record["ok"] = True
+    try:
+        yield record
+    except Exception:
+        record["ok"] = False
+        raise
+    finally:
+        record["wall_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        record["ts"] = round(time.time(), 3)
+        _current_stage.reset(token)
+        _emit(record)
+
+
+def add_counters(**counters):
+    """
+    현재 진행 중인 stage 기록에 숫자(바이트 수, 토큰 수 등)를 더합니다.
+    (stage 밖에서 부르면 아무 일도 하지 않습니다)
+    """
+    record = _current_stage.get()
+    if record is None:
+        return
+    for key, value in counters.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            record[key] = value
+        else:
+            record[key] = record.get(key, 0) + value
+
+
+def add_usage(response):
+    """
+    OpenAI 응답의 토큰 사용량(prompt/completion)을 현재 stage 에 더합니다.
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    add_counters(
+        prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+    )
+
+
+def summarize(records):
+    """
+    기록 리스트를 작업(stage) 이름별로 합칩니다.
+    반환값: {이름: {"calls": 횟수, "wall_ms": 합계, "errors": 실패 수, <숫자 카운터 합계>...}}
+    """
+    summary = {}
+    for record in records:
+        entry = summary.setdefault(record["stage"], {"calls": 0, "wall_ms": 0.0, "errors": 0})
+        entry["calls"] += 1
+        entry["wall_ms"] = round(entry["wall_ms"] + record.get("wall_ms", 0.0), 1)
+        if not record.get("ok", True):
+            entry["errors"] += 1
+        for key, value in record.items():
+            if key in ("stage", "parent", "wall_ms", "ts", "ok") or isinstance(value, bool):
+                continue
+            if isinstance(value, (int, float)):
+                entry[key] = entry.get(key, 0) + value
+    return summary
+
+
+def format_table(summary):
+    """
+    summarize() 결과를 사람이 보기 쉬운 표(문자열)로 만듭니다.
+    """
+    counter_keys = sorted({k for entry in summary.values() for k in entry} - {"calls", "wall_ms", "errors"})
+    header = ["stage", "calls", "wall_ms", "errors"] + counter_keys
+    rows = [header]
+    for name, entry in sorted(summary.items(), key=lambda kv: -kv[1]["wall_ms"]):
+        rows.append([name] + [str(entry.get(k, "")) for k in header[1:]])
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(header))]
+    return "\n".join("  ".join(str(cell).ljust(w) for cell, w in zip(row, widths)) for row in rows)
@@ -0,0 +1,303 @@
+# naver_datalab.py
+# (네이버 데이터랩 검색어 트렌드 API 클라이언트 - 여러 키워드 그룹을 묶어서 동시에 요청하고, 하루 호출 한도를 관리)
+#
+# 데이터랩은 한 요청에 키워드 그룹을 5개까지 넣을 수 있고, 애플리케이션마다 하루 호출 한도(기본 1,000회)가 있습니다.
+# - 그룹이 많으면 5개씩 꽉 채워 묶고, 묶음들을 공유 HTTP 연결 풀로 동시에 보냅니다.
+# - 429(요청 제한) / 5xx / 연결 오류는 지수 백오프로 다시 시도합니다. (한도 초과 응답은 재시도하지 않음)
+#   (재시도는 이 클라이언트에서만 - 자동 재시도가 없는 get_http_session(retries=False) 세션을 씀)
+# - 보낸 요청 수를 날짜(한국 시간)별로 로컬 파일에 기록해서, 한도를 넘기게 되는 요청은 보내기 전에 거절합니다.
+#   (주의: ratio 는 '같은 요청(묶음)에 들어간 그룹 중 최댓값 = 100' 기준이라 묶음끼리는 배율이 다름)
+#
+# 사용 예:
+#   client = DatalabClient(client_id, client_secret)
+#   response = client.search([["축제A", "담양 산타 축제"], ["축제B", "겨울 축제"], ...])
+#   print(client.remaining())
+# 로컬 대역 서버로 시험할 때는 NAVER_DATALAB_BASE_URL (또는 base_url=) 을 그 서버 주소로 바꿉니다.
+
+import datetime
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from dotenv import load_dotenv
+
+import instrumentation
+from disk_cache import CACHE_ROOT, make_key
+from http_clients import get_http_session
+
+load_dotenv()
+
+# --- 데이터랩 설정 (.env 또는 환경 변수로 변경 가능) ---
+NAVER_DATALAB_BASE_URL = os.getenv("NAVER_DATALAB_BASE_URL", "https://openapi.naver.com")
+NAVER_DATALAB_DAILY_QUOTA = int(os.getenv("NAVER_DATALAB_DAILY_QUOTA", 1000))      # 하루 호출 한도
+NAVER_DATALAB_MAX_CONCURRENCY = int(os.getenv("NAVER_DATALAB_MAX_CONCURRENCY", 4))  # 동시에 보내는 요청 수
+NAVER_DATALAB_MAX_RETRIES = int(os.getenv("NAVER_DATALAB_MAX_RETRIES", 3))
+NAVER_DATALAB_BACKOFF_SECONDS = float(os.getenv("NAVER_DATALAB_BACKOFF_SECONDS", 1))
+NAVER_DATALAB_TIMEOUT = float(os.getenv("NAVER_DATALAB_TIMEOUT", 15))
+NAVER_DATALAB_QUOTA_DIR = os.getenv("NAVER_DATALAB_QUOTA_DIR", os.path.join(CACHE_ROOT, "quota"))
+
+SEARCH_PATH = "/v1/datalab/search"
+MAX_GROUPS_PER_REQUEST = 5     # (데이터랩 제한)
+MAX_KEYWORDS_PER_GROUP = 20    # (데이터랩 제한)
+QUOTA_EXCEEDED_CODE = "010"    # (네이버 오픈 API '호출 한도 초과' 오류 코드)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+KST = datetime.timezone(datetime.timedelta(hours=9))  # (호출 한도는 한국 시간 자정에 초기화)
+
+
+class QuotaExceededError(RuntimeError):
+    """
+    하루 호출 한도를 넘기게 되어 요청을 보내지 않았을 때 (또는 서버가 한도 초과로 거절했을 때)
+    """
+
+
+class DatalabError(RuntimeError):
+    """
+    재시도해도 성공하지 못했거나, 재시도할 수 없는 오류 응답을 받았을 때
+    """
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _today():
+    return datetime.datetime.now(KST).date().isoformat()
+
+
+class QuotaTracker:
+    """
+    하루에 보낸 요청 수를 파일에 기록합니다. (프로그램을 다시 실행해도 그날 사용량이 이어짐)
+    여러 스레드에서 같이 써도 됩니다.
+    """
+
+    def __init__(self, path, daily_limit=None):
+        self.path = path
+        self.daily_limit = NAVER_DATALAB_DAILY_QUOTA if daily_limit is None else daily_limit
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        return state if state.get("date") == _today() else {"date": _today(), "used": 0}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f)
+        os.replace(tmp_path, self.path)
+
+    def _roll(self):
+        if self._state["date"] != _today():
+            self._state = {"date": _today(), "used": 0}
+
+    def used(self):
+        with self._lock:
+            self._roll()
+            return self._state["used"]
+
+    def remaining(self):
+        with self._lock:
+            self._roll()
+            return max(0, self.daily_limit - self._state["used"])
+
+    def reserve(self, count=1):
+        """
+        요청 count 회를 사용한 것으로 기록합니다. 한도를 넘기게 되면 기록하지 않고 QuotaExceededError.
+        """
+        with self._lock:
+            self._roll()
+            if self._state["used"] + count > self.daily_limit:
+                raise QuotaExceededError(
+                    f"데이터랩 하루 호출 한도를 넘게 됩니다. (필요 {count}회, 남은 횟수 {self.daily_limit - self._state['used']}회)"
+                )
+            self._state["used"] += count
+            self._save()
+
+    def record(self, count):
+        """
+        (한도 확인 없이) 이미 보낸 요청 count 회를 더합니다. (HTTP 세션이 자동으로 재시도한 요청 등)
+        """
+        if count <= 0:
+            return
+        with self._lock:
+            self._roll()
+            self._state["used"] += count
+            self._save()
+
+    def exhaust(self):
+        """
+        서버가 한도 초과라고 답했을 때 - 오늘은 더 보내지 않도록 사용량을 한도까지 채웁니다.
+        """
+        with self._lock:
+            self._roll()
+            self._state["used"] = max(self._state["used"], self.daily_limit)
+            self._save()
+
+
+class DatalabClient:
+    """
+    네이버 데이터랩 검색어 트렌드 클라이언트입니다.
+    """
+
+    def __init__(self, client_id=None, client_secret=None, base_url=None, daily_quota=None, max_concurrency=None,
+                 max_retries=None, backoff_seconds=None, timeout=None, quota=None, session=None):
+        self.client_id = client_id or os.getenv("NAVER_CLIENT_ID")
+        self.client_secret = client_secret or os.getenv("NAVER_CLIENT_SECRET")
+        if not self.client_id or not self.client_secret:
+            raise ValueError("NAVER_CLIENT_ID / NAVER_CLIENT_SECRET이 없어 데이터랩을 사용할 수 없습니다.")
+        self.url = (base_url or NAVER_DATALAB_BASE_URL).rstrip("/") + SEARCH_PATH
+        self.max_concurrency = max(1, max_concurrency or NAVER_DATALAB_MAX_CONCURRENCY)
+        self.max_retries = NAVER_DATALAB_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_seconds = NAVER_DATALAB_BACKOFF_SECONDS if backoff_seconds is None else backoff_seconds
+        self.timeout = timeout or NAVER_DATALAB_TIMEOUT
+        self.quota = quota or get_quota_tracker(self.client_id, daily_quota)
+        self.session = session
+
+    def remaining(self):
+        """
+        오늘 더 보낼 수 있는 요청 수
+        """
+        return self.quota.remaining()
+
+    def requests_needed(self, keyword_groups):
+        """
+        keyword_groups 를 모두 조회하는 데 필요한 요청 수 (재시도 제외)
+        """
+        return -(-len(keyword_groups) // MAX_GROUPS_PER_REQUEST)
+
+    # ---------------------------------
+    # 내부 도우미
+    # ---------------------------------
+    def _post(self, body):
+        """
+        묶음 하나를 요청합니다. (요청을 보낼 때마다 호출 한도를 1회씩 사용)
+        """
+        session = self.session or get_http_session(retries=False)
+        headers = {
+            "X-Naver-Client-Id": self.client_id,
+            "X-Naver-Client-Secret": self.client_secret,
+            "Content-Type": "application/json",
+        }
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        for attempt in range(self.max_retries + 1):
+            self.quota.reserve(1)
+            try:
+                response = session.post(self.url, headers=headers, data=data, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = DatalabError(f"데이터랩 요청 중 연결 오류: {e}")
+            else:
+                # (session= 으로 넘긴 세션이 429/5xx 를 알아서 재시도했으면 그 요청 수도 사용량에 더함)
+                history = getattr(getattr(getattr(response, "raw", None), "retries", None), "history", None)
+                self.quota.record(len(history or ()))
+                instrumentation.add_counters(bytes_downloaded=len(response.content))
+                if response.status_code == 200:
+                    return response.json()
+                try:
+                    detail = response.json()
+                except ValueError:
+                    detail = {}
+                if detail.get("errorCode") == QUOTA_EXCEEDED_CODE:
+                    self.quota.exhaust()
+                    raise QuotaExceededError(f"데이터랩 하루 호출 한도 초과 (서버 응답: {detail.get('errorMessage')})")
+                error = DatalabError(
+                    f"데이터랩 오류 {response.status_code}: {detail.get('errorMessage') or response.text[:200]}",
+                    response.status_code,
+                )
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise error
+            if attempt == self.max_retries:
+                raise error
+            delay = self.backoff_seconds * 2 ** attempt * (0.5 + random.random())
+            instrumentation.add_counters(datalab_retries=1)
+            print(f"    - [naver_datalab] {error} → {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+
+    # ---------------------------------
+    # 조회
+    # ---------------------------------
+    def search(self, keyword_groups, start_date=None, end_date=None, time_unit="date", **filters):
+        """
+        키워드 그룹 목록([[그룹 이름, 키워드...], ...])의 검색량 추이를 조회합니다. (기간을 주지 않으면 최근 90일)
+        그룹이 5개를 넘으면 5개씩 나눠 동시에 요청하고, 결과를 하나의 응답 형식으로 합칩니다.
+        (results 의 각 항목에 몇 번째 묶음이었는지 "batch" 를 붙임 - 같은 batch 끼리만 ratio 를 직접 비교 가능)
+        filters: device / gender / ages 등 데이터랩 요청 옵션
+        필요한 요청 수가 남은 호출 한도보다 많으면 아무것도 보내지 않고 QuotaExceededError.
+        """
+        end_date = str(end_date or datetime.date.today())
+        start_date = str(start_date or datetime.date.fromisoformat(end_date) - datetime.timedelta(days=90))
+        groups = [list(group) for group in keyword_groups]
+        for group in groups:
+            if len(group) < 2 or len(group) - 1 > MAX_KEYWORDS_PER_GROUP:
+                raise ValueError(f"키워드 그룹은 [그룹 이름, 키워드 1~{MAX_KEYWORDS_PER_GROUP}개] 형식이어야 합니다: {group}")
+        batches = _chunks(groups, MAX_GROUPS_PER_REQUEST)
+        if not batches:
+            return {"startDate": start_date, "endDate": end_date, "timeUnit": time_unit, "results": []}
+        if len(batches) > self.remaining():
+            raise QuotaExceededError(
+                f"데이터랩 요청 {len(batches)}회가 필요하지만 오늘 남은 횟수는 {self.remaining()}회입니다."
+            )
+
+        def request(batch):
+            body = {
+                "startDate": start_date,
+                "endDate": end_date,
+                "timeUnit": time_unit,
+                "keywordGroups": [{"groupName": group[0], "keywords": group[1:]} for group in batch],
+                **filters,
+            }
+            return self._post(body)
+
+        with instrumentation.stage("naver_datalab", keyword_groups=len(groups), requests=len(batches)):
+            if len(batches) == 1:
+                responses = [request(batches[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                    futures = [instrumentation.submit_with_context(pool, request, batch) for batch in batches]
+                    responses = [future.result() for future in futures]
+
+        return {
+            "startDate": start_date,
+            "endDate": end_date,
+            "timeUnit": time_unit,
+            "results": [
+                dict(result, batch=index)
+                for index, response in enumerate(responses)
+                for result in response.get("results", [])
+            ],
+        }
+
+
+# ----------------------------------------------------
+# 공유 호출 한도 기록 (애플리케이션(client_id)마다 하나)
+# ----------------------------------------------------
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+
+def get_quota_tracker(client_id, daily_limit=None):
+    path = os.path.join(NAVER_DATALAB_QUOTA_DIR, f"naver_datalab-{make_key(client_id)[:16]}.json")
+    with _trackers_lock:
+        tracker = _trackers.get(path)
+        if tracker is None:
+            tracker = _trackers[path] = QuotaTracker(path, daily_limit)
+        elif daily_limit is not None:
+            tracker.daily_limit = daily_limit
+        return tracker
+
+
+if __name__ == "__main__":
+    client = DatalabClient()
+    print(f"오늘 남은 데이터랩 호출: {client.remaining()}회 / {client.quota.daily_limit}회")
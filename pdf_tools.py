@@ -2,13 +2,20 @@ import fitz  # PyMuPDF
 import openai
 import os
 from dotenv import load_dotenv
-from pytrends.request import TrendReq
 import pandas as pd
 import json
 import requests
 from bs4 import BeautifulSoup
 import docx  # .docx 파일용
 import cloudconvert
+from concurrent.futures import ThreadPoolExecutor
+import instrumentation
+from http_clients import get_http_session, get_openai_client
+from disk_cache import DiskCache, file_sha256, make_key
+from chunk_selector import select_chunks, split_into_chunks
+from text_extractor import extract_page_texts, extract_text_within_budget
+import hwp_extractor
+import trends_service
 
 # --- API 키 설정 (OpenAI + CloudConvert) ---
 load_dotenv()
@@ -22,306 +29,703 @@ else:
 CLOUDCONVERT_API_KEY = os.getenv("CLOUDCONVERT_API_KEY")
 if not CLOUDCONVERT_API_KEY:
     print("[pdf_tools] 경고: .env 파일에 CLOUDCONVERT_API_KEY가 없습니다.")
-    print("    (HWP 파일 변환이 불가능합니다)")
+    print("    (로컬에서 읽을 수 없는 HWP 파일(암호/배포용/HWPX 등)은 변환이 불가능합니다)")
 else:
     cloudconvert.configure(api_key=CLOUDCONVERT_API_KEY)
 # ----------------------------------------------------
 
-def analyze_pdf(pdf_file_path):
+# --- AI 요약 설정 ---
+# (프롬프트나 모델을 바꾸면 PROMPT_VERSION 도 올려주세요. 캐시 키에 포함됩니다)
+MODEL_NAME = "gpt-4-turbo"  # (테스트 결과 gpt-3.5-turbo보다 gpt-4-turbo가 훨씬 안정적입니다)
+PROMPT_VERSION = "v1"
+PROMPT_CHAR_BUDGET = 10000  # AI에게 보내는 기획서 텍스트 최대 글자 수
+
+# --- 분석 결과 캐시 (같은 파일 + 같은 프롬프트/모델이면 AI를 다시 호출하지 않음) ---
+ANALYSIS_CACHE_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+_analysis_cache = DiskCache("analysis", max_bytes=ANALYSIS_CACHE_MAX_BYTES)
+
+SYSTEM_PROMPT = """
+당신은 축제 기획서 분석 전문가입니다.
+사용자가 제공하는 기획서 텍스트를 분석하여,
+아래 항목에 해당하는 '구체적인 상세 내용'을 추출하고
+반드시 JSON 형식으로만 응답해주세요.
+
+[중요 규칙]
+1. 오직 아래 목록에서 요청된 항목('title', 'date', 'location' 등)만 추출하세요.
+2. '예산', '사업비', '총금액' 등 **금액(돈)과 관련된 모든 정보**는 
+   그것이 어떤 항목이든 **절대로** 요약에 포함하지 마세요.
+3. '안전 대책(Safety Measures)', '행정 사항', '입찰' 등 
+   목록에 없는 다른 정보도 **절대로** 요약에 포함하지 마세요.
+
+--- (추출할 항목 목록) ---
+- "title": 축제 공식 제목
+- "date": 축제가 열리는 정확한 날짜와 기간
+- "location": 축제가 열리는 구체적인 장소
+- "host": 주최 기관
+- "organizer": 주관 기관
+- "targetAudience": 축제의 주요 대상 고객 (예: '가족 단위 방문객', '2030 연인', '어린이'). '주요 타깃' 또는 '고객층' 같은 단어 근처를 찾아보세요.
+- "summary": 축제의 목적과 핵심 내용을 요약
+- "programs": 방문객이 '체험'할 수 있는 주요 프로그램의 '구체적인 내용' (리스트). (주의: '프로그램'이라는 제목의 목차뿐만 아니라, 그 '상세 내용'을 찾아주세요.)
+- "events": 축제 기간 중 열리는 '특별 이벤트'의 '구체적인 내용' (리스트). (예: '개막 퍼포먼스', '산타 이벤트 운영'). (주의: '이벤트'라는 제목의 목차뿐만 아니라, 그 '상세 내용'을 찾아주세요.)
+- "visualKeywords": 카드뉴스 디자인에 참고할 만한 시각적 키워드 (예: "야간 조명", "크리스마스 트리", "산타") (리스트)
+- "contactInfo": 방문객이 문의할 수 있는 전화번호 또는 공식 웹사이트 주소
+- "directions": 방문객이 축제 장소에 '오시는 길' (예: 'xx IC에서 10분', '담양 버스터미널에서 5번 버스', '주차: 메타랜드 주차장 이용').
+               (주의: '사업 지시'나 '제안서 접수' 내용이 아님. 방문객용 교통/주차 정보가 명확히 없으면 "정보 없음"으로 표기)
+
+만약 텍스트에서 특정 정보를 찾을 수 없다면, 해당 값은 "정보 없음"으로 표기하세요.
+
+[최종 확인 규칙]
+응답하기 전, 당신이 생성한 JSON을 다시 한번 확인하세요.
+JSON 내부에 '예산', '사업비' 등 **금액(돈)과 관련된 내용**이나, 
+'안전 대책' 등 --- (추출할 항목 목록) ---에 없었던 항목이 포함되어 있나요?
+만약 그렇다면, 그 항목들을 **반드시 삭제**하고
+오직 'title'부터 'directions'까지의 항목만 포함해서 응답하세요.
+"""
+
+
+def _analysis_cache_key(file_hash, map_reduce=False):
+    # (추출 방식이 바뀌면 AI 에 들어가는 텍스트도 달라지므로 키에 포함: 스트리밍/전체 추출, 로컬 HWP/CloudConvert)
+    return make_key(file_hash, MODEL_NAME, PROMPT_VERSION, SYSTEM_PROMPT, PROMPT_CHAR_BUDGET,
+                    CHUNK_SELECTION, SCAN_CHAR_LIMIT, map_reduce and MAP_REDUCE_MAX_CHUNKS,
+                    STREAMING_EXTRACTION, HWP_NATIVE_EXTRACTION)
+
+
+def get_cache_stats():
     """
-    PDF, DOCX, HWP 파일 경로를 받아서, AI로 요약한 JSON을 반환합니다.
-    (HWP는 CloudConvert API를 통해 PDF로 변환하여 처리)
+    분석 결과 캐시의 적중/실패 횟수와 사용 용량을 딕셔너리로 반환합니다.
     """
-    print(f"  [pdf_tools] 1. 파일 분석 시작: {pdf_file_path}")
+    return _analysis_cache.stats()
+
+
+def get_hwp_cache_stats():
+    """
+    HWP 변환 결과(PDF/텍스트) 캐시의 적중/실패 횟수와 사용 용량을 딕셔너리로 반환합니다.
+    """
+    return _hwp_cache.stats()
+
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.hwp')
+
+# 켜져 있으면 PDF를 앞에서부터 읽다가 AI 입력 한도(PROMPT_CHAR_BUDGET)를 채우면 멈춥니다.
+# (페이지가 많은 PDF 는 이때도 페이지 묶음을 여러 프로세스에서 병렬로 추출 - text_extractor)
+STREAMING_EXTRACTION = os.getenv("STREAMING_EXTRACTION", "1") != "0"
+
+# 켜져 있으면 앞 10,000자만 자르는 대신, 문서에서 중요한 조각을 골라 PROMPT_CHAR_BUDGET 을 채웁니다.
+# (이때 스트리밍 추출은 SCAN_CHAR_LIMIT 글자까지 읽습니다)
+CHUNK_SELECTION = os.getenv("CHUNK_SELECTION", "1") != "0"
+SCAN_CHAR_LIMIT = int(os.getenv("SCAN_CHAR_LIMIT", 200000))
+
+# --- Map-Reduce 요약 모드 (아주 긴 기획서용) ---
+# 문서를 PROMPT_CHAR_BUDGET 크기 조각으로 나눠 동시에 요약(map)한 뒤, 결과를 하나로 합칩니다(reduce).
+MAP_REDUCE = os.getenv("MAP_REDUCE", "0") != "0"
+MAP_REDUCE_WORKERS = int(os.getenv("MAP_REDUCE_WORKERS", 4))   # 동시에 보내는 AI 요청 수
+MAP_REDUCE_MAX_CHUNKS = int(os.getenv("MAP_REDUCE_MAX_CHUNKS", 20))  # 비용 상한 (조각 수)
+
+# --- HWP 처리 ---
+# 켜져 있으면 HWP 5.x 파일은 로컬에서 바로 텍스트를 뽑고, 읽을 수 없는 파일(암호/배포용/HWPX 등)만 CloudConvert 로 보냅니다.
+HWP_NATIVE_EXTRACTION = os.getenv("HWP_NATIVE_EXTRACTION", "1") != "0"
+
+# CloudConvert 로 변환한 PDF 와 추출 텍스트를 HWP 파일 내용(해시) 기준으로 보관합니다.
+# (같은 HWP 를 다시 분석하면 업로드/변환/다운로드를 모두 건너뜀. 프롬프트/모델이 바뀌어도 재사용)
+HWP_CACHE_MAX_BYTES = int(os.getenv("HWP_CACHE_MAX_BYTES", 500 * 1024 * 1024))
+_hwp_cache = DiskCache("hwp_converted", max_bytes=HWP_CACHE_MAX_BYTES)
+
+# 변환된 PDF 는 이 크기 조각으로 받아 바로 디스크에 씁니다. (메모리에는 조각 하나만 올라감)
+DOWNLOAD_CHUNK_BYTES = int(os.getenv("DOWNLOAD_CHUNK_BYTES", 1024 * 1024))
+MAX_CONVERTED_PDF_BYTES = int(os.getenv("MAX_CONVERTED_PDF_BYTES", 500 * 1024 * 1024))
+
+MISSING_VALUE = "정보 없음"
+SUMMARY_FIELDS = ["title", "date", "location", "host", "organizer", "targetAudience", "summary",
+                  "programs", "events", "visualKeywords", "contactInfo", "directions"]
+LIST_FIELDS = ("programs", "events", "visualKeywords")
+
+
+def _print_download_progress(done, total):
+    if total:
+        print(f"    - (CloudConvert) 다운로드 {done * 100 // total}% ({done // 1024}KB / {total // 1024}KB)")
+    else:
+        print(f"    - (CloudConvert) 다운로드 {done // 1024}KB")
+
+
+def _iter_download(url, progress=None, chunk_size=None):
+    """
+    URL 을 스트리밍으로 받아 bytes 조각을 차례로 돌려줍니다.
+    progress(받은 바이트, 전체 바이트 또는 None) 는 약 10% 마다 호출됩니다.
+    """
+    chunk_size = chunk_size or DOWNLOAD_CHUNK_BYTES
+    with get_http_session().get(url, stream=True) as response:
+        response.raise_for_status()
+        total = int(response.headers.get("Content-Length") or 0) or None
+        if total and total > MAX_CONVERTED_PDF_BYTES:
+            raise Exception(f"변환된 PDF가 너무 큽니다. ({total // (1024 * 1024)}MB)")
+        done, next_report = 0, 0
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+            done += len(chunk)
+            if done > MAX_CONVERTED_PDF_BYTES:
+                raise Exception(f"변환된 PDF가 너무 큽니다. ({MAX_CONVERTED_PDF_BYTES // (1024 * 1024)}MB 초과)")
+            yield chunk
+            if progress and done >= next_report:
+                progress(done, total)
+                next_report = done + (total // 10 if total else 10 * chunk_size)
+        instrumentation.add_counters(bytes_downloaded=done)
+        if progress:
+            progress(done, total)
+
+
+def _converted_pdf_key(file_hash):
+    return make_key(file_hash, "pdf")
+
+
+def get_converted_pdf_path(hwp_file_path):
+    """
+    이 HWP 파일을 변환한 PDF 가 캐시에 있으면 그 경로를, 없으면 None 을 반환합니다.
+    """
+    return _hwp_cache.get_path(_converted_pdf_key(file_sha256(hwp_file_path)))
+
+
+def download_converted_pdf(hwp_file_path, pdf_url, progress=None):
+    """
+    변환이 끝난 PDF 를 캐시 폴더에 스트리밍으로 받아 저장하고, 그 경로를 반환합니다.
+    """
+    cache_key = _converted_pdf_key(file_sha256(hwp_file_path))
+    return _hwp_cache.set_stream(cache_key, _iter_download(pdf_url, progress or _print_download_progress))
+
+
+def needs_cloudconvert(file_path):
+    """
+    로컬에서 읽을 수 없고, 변환된 PDF 도 캐시에 없는 HWP 파일이면 True.
+    (배치/GUI 에서 변환을 미리 걸어둘 파일을 고를 때 사용)
+    """
+    if os.path.splitext(file_path)[1].lower() != '.hwp':
+        return False
+    if HWP_NATIVE_EXTRACTION and hwp_extractor.is_available() and hwp_extractor.is_readable(file_path):
+        return False
+    return get_converted_pdf_path(file_path) is None
+
+
+def _convert_hwp_to_pdf_file(hwp_file_path, cache_key, progress=None):
+    """
+    CloudConvert API로 HWP 파일을 PDF로 변환하고, 변환된 PDF 를 캐시 폴더에 스트리밍으로 저장한 뒤
+    그 파일 경로를 반환합니다. (PDF 전체를 메모리에 올리지 않음)
+    """
+    with instrumentation.stage("cloudconvert"):
+        pdf_url = _run_cloudconvert_job(hwp_file_path)
+        # (5) 변환된 PDF 를 조각 단위로 받아 바로 디스크에 저장
+        print("    - (CloudConvert) PDF 변환 완료. PDF 데이터 다운로드 중...")
+        return _hwp_cache.set_stream(cache_key, _iter_download(pdf_url, progress or _print_download_progress))
+
+
+def start_cloudconvert_job(hwp_file_path):
+    """
+    CloudConvert 변환 작업(Job)을 만들고 HWP 파일을 업로드한 뒤, 작업 정보(job 딕셔너리)를 반환합니다.
+    (변환이 끝나기를 기다리지는 않습니다)
+    """
+    # (1) API 작업(Job) 생성: HWP -> PDF 변환
+    job = cloudconvert.Job.create(payload={
+        "tasks": {
+            'upload-hwp': { 'operation': 'import/upload' },
+            'convert-to-pdf': { 'operation': 'convert', 'input': 'upload-hwp', 'output_format': 'pdf', 'engine': 'office' },
+            'export-pdf': { 'operation': 'export/url', 'input': 'convert-to-pdf', 'inline': True }
+        }
+    })
+
+    # (2) HWP 파일 업로드
+    upload_task = job['tasks'][0]
+    cloudconvert.Task.upload(file_name=hwp_file_path, task=upload_task)
+    return job
+
+
+def _run_cloudconvert_job(hwp_file_path):
+    job = start_cloudconvert_job(hwp_file_path)
+
+    # (3) 작업 완료 대기
+    print("    - (CloudConvert) HWP 파일 업로드 완료. PDF로 변환 중...")
+    job = cloudconvert.Job.wait(id=job['id'])
+    return get_export_url(job)
+
+
+def get_export_url(job):
+    """
+    끝난 CloudConvert 작업 정보에서 변환된 PDF 의 다운로드 URL 을 꺼냅니다. (실패한 작업이면 예외)
+    """
+    # (오류 상태 확인 강화)
+    if job.get("status") == "error":
+        error_message = job.get('message', '알 수 없는 오류')
+        for task in job.get("tasks", []):
+            if task.get("status") == "error":
+                error_message = f"Task '{task.get('name', 'unknown')}' failed: {task.get('message', 'No details')}"
+                break
+        raise Exception(f"CloudConvert API 오류: {error_message}")
+
+    # (4) 변환된 PDF의 다운로드 URL 가져오기 (더 안전한 방식)
+    export_task = None
+    for task in job.get("tasks", []):
+        # 이름으로 'export-pdf' 작업을 찾음
+        if task.get("name") == "export-pdf":
+            export_task = task
+            break
     
-    full_text = ""
-    if not os.path.exists(pdf_file_path):
-        print(f" 오류: '{pdf_file_path}' 파일을 찾을 수 없습니다.")
-        return {"error": "PDF 파일을 찾을 수 없습니다."}
+    if not export_task:
+         raise Exception("CloudConvert job result does not contain the 'export-pdf' task.")
 
-    try:
-        print(f"    - 파일 타입 감지 중...")
-        file_extension = os.path.splitext(pdf_file_path)[1].lower()
-
-        # ---------------------------------
-        # PDF / DOCX 처리 
-        # ---------------------------------
-        if file_extension == '.pdf':
-            print("    - PDF 파일 감지. PyMuPDF로 텍스트 추출...")
-            doc = fitz.open(pdf_file_path)
-            for page_num in range(doc.page_count):
-                page = doc.load_page(page_num)
-                full_text += page.get_text("text")
-            doc.close()
-        
-        elif file_extension == '.docx':
-            print("    - DOCX 파일 감지. python-docx로 텍스트 추출...")
-            doc = docx.Document(pdf_file_path)
-            for para in doc.paragraphs:
-                full_text += para.text + "\n"
-        
-        # ---------------------------------
-        # 3. HWP 처리 (CloudConvert API로 완전 교체)
-        # ---------------------------------
-        elif file_extension == '.hwp':
-            print("    - HWP 파일 감지. CloudConvert API로 PDF 변환 시작...")
+    if export_task.get("status") != "finished":
+         raise Exception(f"CloudConvert 'export-pdf' task did not finish successfully. Status: {export_task.get('status')}")
+
+    result = export_task.get("result")
+    if not result or not result.get("files"):
+         raise Exception("CloudConvert 'export-pdf' task result is missing or does not contain files.")
+
+    files = result.get("files")
+    if not files: # files 리스트가 비어있는지 확인
+         raise Exception("CloudConvert 'export-pdf' task result contains an empty 'files' list.")
+
+    # '.get()'을 사용하여 'url' 키에 안전하게 접근
+    pdf_url = files[0].get('url') 
+    if not pdf_url:
+         # 'url' 키가 없을 경우 명확한 오류 발생
+         raise KeyError("The key 'url' was not found in the first file result of the 'export-pdf' task.")
+    
+    return pdf_url
+
+
+def _extract_pdf_source(source, max_chars):
+    """
+    PDF(경로 또는 bytes)에서 텍스트를 추출합니다.
+    max_chars 가 있으면 스트리밍 모드로 필요한 페이지까지만 읽습니다. (두 경우 모두 긴 문서는 병렬 추출)
+    """
+    if max_chars is not None:
+        text, pages_read, page_count = extract_text_within_budget(source, max_chars)
+        return text, {"pages_read": pages_read, "page_count": page_count}
+    page_texts = extract_page_texts(source)
+    return "".join(page_texts), {"pages_read": len(page_texts), "page_count": len(page_texts)}
+
+
+def _extract_hwp_via_cloudconvert(hwp_file_path, max_chars, progress=None):
+    """
+    HWP 를 CloudConvert 로 PDF 변환한 뒤 텍스트를 추출합니다.
+    변환된 PDF 와 추출 텍스트는 파일 해시 기준으로 캐시해서, 같은 파일은 다시 변환하지 않습니다.
+    """
+    file_hash = file_sha256(hwp_file_path)
+    text_key = make_key(file_hash, "text", max_chars)
+    pdf_key = _converted_pdf_key(file_hash)
+
+    cached = _hwp_cache.get(text_key)
+    if cached is not None:
+        print("    - (HWP 캐시) 이전에 변환/추출한 텍스트를 사용합니다.")
+        instrumentation.add_counters(hwp_cache_hits=1)
+        return cached["text"], {**cached["info"], "extractor": "cloudconvert-cache"}
+
+    pdf_path = _hwp_cache.get_path(pdf_key)
+    if pdf_path is not None:
+        print("    - (HWP 캐시) 이전에 변환한 PDF를 사용합니다. (CloudConvert 건너뜀)")
+        instrumentation.add_counters(hwp_cache_hits=1)
+    else:
+        instrumentation.add_counters(hwp_cache_misses=1)
+        print("    - HWP 파일을 CloudConvert API로 PDF 변환 시작...")
+        pdf_path = _convert_hwp_to_pdf_file(hwp_file_path, pdf_key, progress)
+
+    # (6) 저장된 PDF 파일을 'fitz'가 경로로 직접 열어서 분석
+    print("    - (CloudConvert) PDF 데이터 분석 시작...")
+    full_text, page_info = _extract_pdf_source(pdf_path, max_chars)
+    _hwp_cache.set(text_key, {"text": full_text, "info": page_info})
+    return full_text, {**page_info, "extractor": "cloudconvert"}
+
+
+def extract_document_text(file_path, max_chars=None, progress=None):
+    """
+    PDF, DOCX, HWP 파일에서 텍스트를 추출합니다.
+
+    반환값: (전체 텍스트, 추출 정보 딕셔너리)
+    - 추출 정보: file_type, pages_read(실제로 읽은 페이지 수), page_count, chars
+    - max_chars 를 주면 그 글자 수를 채우는 순간 읽기를 멈춥니다.
+    - progress(받은 바이트, 전체 바이트) 는 HWP 를 CloudConvert 로 변환할 때 다운로드 진행 상황을 알려줍니다.
+    """
+    file_extension = os.path.splitext(file_path)[1].lower()
+    info = {"file_type": file_extension, "pages_read": None, "page_count": None}
+
+    # ---------------------------------
+    # PDF / DOCX 처리 
+    # ---------------------------------
+    if file_extension == '.pdf':
+        print("    - PDF 파일 감지. PyMuPDF로 텍스트 추출...")
+        full_text, page_info = _extract_pdf_source(file_path, max_chars)
+        info.update(page_info)
+    
+    elif file_extension == '.docx':
+        print("    - DOCX 파일 감지. python-docx로 텍스트 추출...")
+        doc = docx.Document(file_path)
+        full_text = "".join(para.text + "\n" for para in doc.paragraphs)
+        if max_chars is not None:
+            full_text = full_text[:max_chars]
+    
+    # ---------------------------------
+    # 3. HWP 처리 (CloudConvert API로 완전 교체)
+    # ---------------------------------
+    elif file_extension == '.hwp':
+        full_text = None
+        if HWP_NATIVE_EXTRACTION and hwp_extractor.is_available():
+            print("    - HWP 파일 감지. 로컬에서 본문 텍스트 추출...")
+            try:
+                with instrumentation.stage("hwp_native"):
+                    native_text, section_info = hwp_extractor.extract_hwp_text(file_path, max_chars)
+                if native_text.strip():
+                    full_text = native_text
+                    info.update({"pages_read": section_info["sections_read"], "page_count": section_info["section_count"],
+                                 "extractor": "native"})
+                else:
+                    # (본문이 그림/개체로만 되어 있으면 텍스트가 비어 있음 → 읽지 못한 것으로 보고 변환)
+                    print("    - 로컬 HWP 추출 결과가 비어 있습니다. CloudConvert로 대체합니다.")
+            except hwp_extractor.HwpParseError as e:
+                print(f"    - 로컬 HWP 추출 실패 ({e}). CloudConvert로 대체합니다.")
 
+        if full_text is None:
             if not CLOUDCONVERT_API_KEY:
-                return {"error": "HWP 파일을 처리하려면 .env에 CLOUDCONVERT_API_KEY가 필요합니다."}
-
-            # (1) API 작업(Job) 생성: HWP -> PDF 변환
-            job = cloudconvert.Job.create(payload={
-                "tasks": {
-                    'upload-hwp': { 'operation': 'import/upload' },
-                    'convert-to-pdf': { 'operation': 'convert', 'input': 'upload-hwp', 'output_format': 'pdf', 'engine': 'office' },
-                    'export-pdf': { 'operation': 'export/url', 'input': 'convert-to-pdf', 'inline': True }
-                }
-            })
-
-            # (2) HWP 파일 업로드
-            upload_task = job['tasks'][0]
-            cloudconvert.Task.upload(file_name=pdf_file_path, task=upload_task)
-
-            # (3) 작업 완료 대기
-            print("    - (CloudConvert) HWP 파일 업로드 완료. PDF로 변환 중...")
-            job = cloudconvert.Job.wait(id=job['id'])
-
-            # (오류 상태 확인 강화)
-            if job.get("status") == "error":
-                error_message = job.get('message', '알 수 없는 오류')
-                for task in job.get("tasks", []):
-                    if task.get("status") == "error":
-                        error_message = f"Task '{task.get('name', 'unknown')}' failed: {task.get('message', 'No details')}"
-                        break
-                raise Exception(f"CloudConvert API 오류: {error_message}")
-
-            # (4) 변환된 PDF의 다운로드 URL 가져오기 (더 안전한 방식)
-            export_task = None
-            for task in job.get("tasks", []):
-                # 이름으로 'export-pdf' 작업을 찾음
-                if task.get("name") == "export-pdf":
-                    export_task = task
-                    break
-            
-            if not export_task:
-                 raise Exception("CloudConvert job result does not contain the 'export-pdf' task.")
+                raise ValueError("이 HWP 파일은 로컬에서 읽을 수 없어 CloudConvert가 필요하지만, CLOUDCONVERT_API_KEY가 없습니다.")
+            full_text, page_info = _extract_hwp_via_cloudconvert(file_path, max_chars, progress)
+            info.update(page_info)
 
-            if export_task.get("status") != "finished":
-                 raise Exception(f"CloudConvert 'export-pdf' task did not finish successfully. Status: {export_task.get('status')}")
+    else:
+        raise ValueError(f"지원하지 않는 파일 형식: {file_extension}. (PDF, DOCX, HWP만 지원)")
 
-            result = export_task.get("result")
-            if not result or not result.get("files"):
-                 raise Exception("CloudConvert 'export-pdf' task result is missing or does not contain files.")
+    info["chars"] = len(full_text)
+    instrumentation.add_counters(pages_parsed=info["pages_read"] or 0, pages_total=info["page_count"] or 0, chars=info["chars"])
+    return full_text, info
 
-            files = result.get("files")
-            if not files: # files 리스트가 비어있는지 확인
-                 raise Exception("CloudConvert 'export-pdf' task result contains an empty 'files' list.")
 
-            # '.get()'을 사용하여 'url' 키에 안전하게 접근
-            pdf_url = files[0].get('url') 
-            if not pdf_url:
-                 # 'url' 키가 없을 경우 명확한 오류 발생
-                 raise KeyError("The key 'url' was not found in the first file result of the 'export-pdf' task.")
-            
-            # (5) 변환된 PDF 데이터를 메모리로 다운로드
-            print("    - (CloudConvert) PDF 변환 완료. PDF 데이터 다운로드 중...")
-            pdf_response = requests.get(pdf_url)
-            pdf_response.raise_for_status()
-
-            # (6) 다운로드한 PDF 데이터를 'fitz'에게 전달
-            print("    - (CloudConvert) PDF 데이터 분석 시작...")
-            doc = fitz.open(stream=pdf_response.content, filetype="pdf")
-            for page_num in range(doc.page_count):
-                page = doc.load_page(page_num)
-                full_text += page.get_text("text")
-            doc.close()
-        # --- ⭐️ HWP 처리 (디버깅 버전) 끝 ⭐️ ---
-        # ---------------------------------
-        
-        else:
-            print(f"지원하지 않는 파일 형식입니다: {file_extension}")
-            return {"error": f"지원하지 않는 파일 형식: {file_extension}. (PDF, DOCX, HWP만 지원)"}
-
-        print(f"    - 텍스트 추출 완료. (총 {len(full_text)}자)")
-
-        # ---------------------------------
-        # AI 요약 요청 (기존과 동일)
-        # ---------------------------------
-        system_prompt = """
-        당신은 축제 기획서 분석 전문가입니다.
-        사용자가 제공하는 기획서 텍스트를 분석하여,
-        아래 항목에 해당하는 '구체적인 상세 내용'을 추출하고
-        반드시 JSON 형식으로만 응답해주세요.
-        
-        [중요 규칙]
-        1. 오직 아래 목록에서 요청된 항목('title', 'date', 'location' 등)만 추출하세요.
-        2. '예산', '사업비', '총금액' 등 **금액(돈)과 관련된 모든 정보**는 
-           그것이 어떤 항목이든 **절대로** 요약에 포함하지 마세요.
-        3. '안전 대책(Safety Measures)', '행정 사항', '입찰' 등 
-           목록에 없는 다른 정보도 **절대로** 요약에 포함하지 마세요.
-        
-        --- (추출할 항목 목록) ---
-        - "title": 축제 공식 제목
-        - "date": 축제가 열리는 정확한 날짜와 기간
-        - "location": 축제가 열리는 구체적인 장소
-        - "host": 주최 기관
-        - "organizer": 주관 기관
-        - "targetAudience": 축제의 주요 대상 고객 (예: '가족 단위 방문객', '2030 연인', '어린이'). '주요 타깃' 또는 '고객층' 같은 단어 근처를 찾아보세요.
-        - "summary": 축제의 목적과 핵심 내용을 요약
-        - "programs": 방문객이 '체험'할 수 있는 주요 프로그램의 '구체적인 내용' (리스트). (주의: '프로그램'이라는 제목의 목차뿐만 아니라, 그 '상세 내용'을 찾아주세요.)
-        - "events": 축제 기간 중 열리는 '특별 이벤트'의 '구체적인 내용' (리스트). (예: '개막 퍼포먼스', '산타 이벤트 운영'). (주의: '이벤트'라는 제목의 목차뿐만 아니라, 그 '상세 내용'을 찾아주세요.)
-        - "visualKeywords": 카드뉴스 디자인에 참고할 만한 시각적 키워드 (예: "야간 조명", "크리스마스 트리", "산타") (리스트)
-        - "contactInfo": 방문객이 문의할 수 있는 전화번호 또는 공식 웹사이트 주소
-        - "directions": 방문객이 축제 장소에 '오시는 길' (예: 'xx IC에서 10분', '담양 버스터미널에서 5번 버스', '주차: 메타랜드 주차장 이용').
-                       (주의: '사업 지시'나 '제안서 접수' 내용이 아님. 방문객용 교통/주차 정보가 명확히 없으면 "정보 없음"으로 표기)
-        
-        만약 텍스트에서 특정 정보를 찾을 수 없다면, 해당 값은 "정보 없음"으로 표기하세요.
-
-        [최종 확인 규칙]
-        응답하기 전, 당신이 생성한 JSON을 다시 한번 확인하세요.
-        JSON 내부에 '예산', '사업비' 등 **금액(돈)과 관련된 내용**이나, 
-        '안전 대책' 등 --- (추출할 항목 목록) ---에 없었던 항목이 포함되어 있나요?
-        만약 그렇다면, 그 항목들을 **반드시 삭제**하고
-        오직 'title'부터 'directions'까지의 항목만 포함해서 응답하세요.
-        """
-        
-        user_prompt = f"다음 텍스트를 분석하여 JSON으로 요약해줘:\n\n{full_text[:10000]}"
+def check_input_file(file_path):
+    """
+    분석할 수 있는 파일인지 확인합니다. 문제가 있으면 {"error": ...} 딕셔너리, 없으면 None.
+    """
+    if not os.path.exists(file_path):
+        print(f" 오류: '{file_path}' 파일을 찾을 수 없습니다.")
+        return {"error": "PDF 파일을 찾을 수 없습니다."}
+
+    print(f"    - 파일 타입 감지 중...")
+    file_extension = os.path.splitext(file_path)[1].lower()
+    if file_extension not in SUPPORTED_EXTENSIONS:
+        print(f"지원하지 않는 파일 형식입니다: {file_extension}")
+        return {"error": f"지원하지 않는 파일 형식: {file_extension}. (PDF, DOCX, HWP만 지원)"}
 
-        client = openai.OpenAI()
+    if file_extension == '.hwp' and not CLOUDCONVERT_API_KEY and not (HWP_NATIVE_EXTRACTION and hwp_extractor.is_available()):
+        return {"error": "HWP 파일을 처리하려면 .env에 CLOUDCONVERT_API_KEY가 필요합니다."}
+    return None
+
+
+def build_messages(text):
+    """
+    기획서 텍스트로 AI 요청 메시지(system + user)를 만듭니다.
+    """
+    user_prompt = f"다음 텍스트를 분석하여 JSON으로 요약해줘:\n\n{text}"
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def select_prompt_text(full_text):
+    """
+    AI에게 보낼 텍스트를 고릅니다. (한도보다 길면 중요한 조각 위주로, 또는 앞부분만)
+    """
+    if CHUNK_SELECTION:
+        prompt_text, selection = select_chunks(full_text, PROMPT_CHAR_BUDGET)
+        if selection["selected"] is not None:
+            print(f"    - 관련도 높은 조각 {len(selection['selected'])}/{selection['total_chunks']}개 선택 ({selection['chars']}자)")
+        return prompt_text
+    return full_text[:PROMPT_CHAR_BUDGET]
+
+
+def extraction_char_limit(map_reduce=False):
+    """
+    현재 설정에서 텍스트를 몇 글자까지 추출하면 되는지 반환합니다. (None = 전체)
+    """
+    if map_reduce:
+        return PROMPT_CHAR_BUDGET * MAP_REDUCE_MAX_CHUNKS
+    if STREAMING_EXTRACTION:
+        return SCAN_CHAR_LIMIT if CHUNK_SELECTION else PROMPT_CHAR_BUDGET
+    return None
+
+
+def get_cached_analysis(file_path, map_reduce=False):
+    """
+    캐시에 저장된 분석 결과를 반환합니다. 없으면 None. (반환값 두 번째는 저장할 때 쓸 키)
+    """
+    cache_key = _analysis_cache_key(file_sha256(file_path), map_reduce)
+    cached_result = _analysis_cache.get(cache_key)
+    instrumentation.add_counters(**{"cache_hits" if cached_result is not None else "cache_misses": 1})
+    return cached_result, cache_key
+
+
+def store_cached_analysis(cache_key, result):
+    _analysis_cache.set(cache_key, result)
+
+
+def _request_summary(text):
+    """
+    기획서 텍스트(PROMPT_CHAR_BUDGET 이내)를 AI에게 보내 요약 JSON(딕셔너리)을 받아옵니다.
+    """
+    client = get_openai_client()
+    with instrumentation.stage("llm_call", model=MODEL_NAME):
         response = client.chat.completions.create(
-            model="gpt-4-turbo",  # (테스트 결과 gpt-3.5-turbo보다 gpt-4-turbo가 훨씬 안정적입니다)
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+            model=MODEL_NAME,
+            messages=build_messages(text),
             response_format={"type": "json_object"},
             max_tokens= 4000
         )
-        
-        ai_response_json_string = response.choices[0].message.content
-        print("    - AI 요약 완료.")
-        
-        # JSON 문자열을 Python 딕셔너리로 변환해서 반환
-        return json.loads(ai_response_json_string) 
+        instrumentation.add_usage(response)
+    
+    # JSON 문자열을 Python 딕셔너리로 변환해서 반환
+    return json.loads(response.choices[0].message.content)
 
-    except Exception as e:
-        print(f" PDF 분석 중 오류 발생: {e}")
-        return {"error": f"PDF 분석 오류: {e}"}
-
-# # ----------------------------------------------------
-# # 기능 2: 트렌드 분석기 (trend_test.py에서 가져옴)
-# # ----------------------------------------------------
-# def get_google_trends(keywords_list):
-#     """
-#     키워드 리스트를 받아서, Google 트렌드 데이터를 딕셔너리로 반환합니다.
-#     """
-#     print(f"  [analysis_tools] 2. Google 트렌드 분석 시작: {keywords_list}")
+
+def _is_missing(value):
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip() or value.strip() == MISSING_VALUE
+    if isinstance(value, (list, dict)):
+        return len(value) == 0
+    return False
+
+
+def merge_partial_summaries(partials):
+    """
+    조각별 요약 결과(같은 스키마의 딕셔너리 리스트)를 하나로 합칩니다. (항상 같은 입력 → 같은 결과)
+
+    - programs / events / visualKeywords: 문서 순서대로 모은 뒤 중복 제거
+    - 나머지 항목: 앞 조각부터 보면서 "정보 없음"이 아닌 첫 번째 값
+    - 어디에도 없으면 "정보 없음"
+    """
+    merged = {}
+    for field in SUMMARY_FIELDS:
+        if field in LIST_FIELDS:
+            items = []
+            seen = set()
+            for partial in partials:
+                value = partial.get(field)
+                if _is_missing(value):
+                    continue
+                for item in (value if isinstance(value, list) else [value]):
+                    if _is_missing(item):
+                        continue
+                    key = " ".join(str(item).split()) if isinstance(item, str) else json.dumps(item, ensure_ascii=False, sort_keys=True)
+                    if key not in seen:
+                        seen.add(key)
+                        items.append(item)
+            merged[field] = items if items else MISSING_VALUE
+        else:
+            merged[field] = next(
+                (p[field] for p in partials if not _is_missing(p.get(field))),
+                MISSING_VALUE
+            )
+    return merged
+
+
+def summarize_map_reduce(full_text, max_workers=None):
+    """
+    [Map-Reduce 모드] 긴 텍스트를 조각으로 나눠 동시에 요약하고, 결과를 합쳐서 반환합니다.
+    (동시 요청 수는 max_workers 로 제한 → 전체 시간은 AI 호출 1~2번 정도)
+    일부 조각만 실패하면 나머지로 합친 결과에 "failed_chunks" (실패한 조각 번호, 1부터) 를 붙여 반환합니다.
+    (문서 일부가 빠진 결과이므로 캐시하지 않음)
+    """
+    max_workers = MAP_REDUCE_WORKERS if max_workers is None else max(1, max_workers)
+    chunks = split_into_chunks(full_text, chunk_chars=PROMPT_CHAR_BUDGET)[:MAP_REDUCE_MAX_CHUNKS]
+    print(f"    - [Map-Reduce] {len(chunks)}개 조각을 최대 {max_workers}개씩 동시에 요약합니다...")
+
+    def summarize_chunk(index_and_text):
+        index, text = index_and_text
+        try:
+            return _request_summary(text)
+        except Exception as e:
+            print(f"    - [Map-Reduce] 조각 {index + 1} 요약 실패: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 입력 순서대로 결과를 모으므로 병합 결과가 항상 같습니다.
+        futures = [instrumentation.submit_with_context(executor, summarize_chunk, item) for item in enumerate(chunks)]
+        partials = [future.result() for future in futures]
+
+    failed_chunks = [index + 1 for index, p in enumerate(partials) if p is None]
+    partials = [p for p in partials if p is not None]
+    if not partials:
+        raise Exception("Map-Reduce 요약: 모든 조각 요약에 실패했습니다.")
+    print(f"    - [Map-Reduce] {len(partials)}/{len(chunks)}개 조각 요약 병합 완료.")
+    merged = merge_partial_summaries(partials)
+    if failed_chunks:
+        merged["failed_chunks"] = failed_chunks
+    return merged
+
+
+def analyze_pdf(pdf_file_path, use_cache=True, map_reduce=None):
+    """
+    PDF, DOCX, HWP 파일 경로를 받아서, AI로 요약한 JSON을 반환합니다.
+    (HWP는 CloudConvert API를 통해 PDF로 변환하여 처리)
+
+    같은 내용의 파일을 다시 분석하면 디스크 캐시에서 바로 결과를 돌려줍니다.
+    use_cache=False 로 호출하면 캐시를 건너뛰고 항상 새로 분석합니다.
+    map_reduce=True 면 문서 전체를 조각별로 요약해서 합칩니다. (기본값: MAP_REDUCE 설정)
+    """
+    print(f"  [pdf_tools] 1. 파일 분석 시작: {pdf_file_path}")
+    map_reduce = MAP_REDUCE if map_reduce is None else map_reduce
     
-#     try:
-#         pytrends = TrendReq(hl='ko-KR', tz=540)
-#         pytrends.build_payload(keywords_list, cat=0, timeframe='today 12-m', geo='KR')
-        
-#         # (1) 시간별 관심도
-#         interest_df = pytrends.interest_over_time()
-        
-#         # (2) 연관 검색어
-#         related_queries_dict = pytrends.related_queries()
+    with instrumentation.stage("analyze_pdf", file=os.path.basename(pdf_file_path)) as metrics:
+        input_error = check_input_file(pdf_file_path)
+        if input_error:
+            metrics["ok"] = False
+            return input_error
+
+        try:
+            cache_key = None
+            if use_cache:
+                cached_result, cache_key = get_cached_analysis(pdf_file_path, map_reduce)
+                if cached_result is not None:
+                    print("    - 캐시 적중! 이전 분석 결과를 사용합니다.")
+                    return cached_result
+
+            with instrumentation.stage("extract_text"):
+                full_text, info = extract_document_text(pdf_file_path, max_chars=extraction_char_limit(map_reduce))
+
+            if info["page_count"] is not None:
+                unit = "섹션" if info.get("extractor") == "native" else "페이지"
+                print(f"    - 텍스트 추출 완료. (총 {len(full_text)}자, {info['page_count']}{unit} 중 {info['pages_read']}{unit} 읽음)")
+            else:
+                print(f"    - 텍스트 추출 완료. (총 {len(full_text)}자)")
+
+            if map_reduce and len(full_text) > PROMPT_CHAR_BUDGET:
+                result = summarize_map_reduce(full_text)
+            else:
+                # ---------------------------------
+                # AI 요약 요청 (한도보다 길면 중요한 조각 위주로 골라서 보냄)
+                # ---------------------------------
+                result = _request_summary(select_prompt_text(full_text))
+
+            print("    - AI 요약 완료.")
+            if result.get("failed_chunks"):
+                # (일시적인 429/시간 초과로 빠진 조각이 있으면 다음에 다시 요약하도록 캐시하지 않음)
+                print(f"    - ⚠️ 조각 {result['failed_chunks']} 요약 실패 → 일부가 빠진 결과이므로 캐시하지 않습니다.")
+            elif cache_key is not None:
+                store_cached_analysis(cache_key, result)
+            return result
+
+        except Exception as e:
+            print(f" PDF 분석 중 오류 발생: {e}")
+            metrics["ok"] = False
+            return {"error": f"PDF 분석 오류: {e}"}
+
+# ----------------------------------------------------
+# 기능 2: 트렌드 분석기 (trend_test.py에서 가져옴)
+# ----------------------------------------------------
+def get_google_trends(keywords_list):
+    """
+    키워드 리스트를 받아서, Google 트렌드 데이터를 딕셔너리로 반환합니다.
+    """
+    print(f"  [analysis_tools] 2. Google 트렌드 분석 시작: {keywords_list}")
+    
+    try:
+        with instrumentation.stage("google_trends", keywords=len(keywords_list)):
+            # (5개씩 묶음 요청 + 캐시 + 속도 제한/429 재시도는 trends_service 가 처리)
+            # (시간별 관심도는 지금 쓰지 않으므로 요청하지 않음 - 필요하면 service.interest_over_time)
+            related_queries_dict = trends_service.get_trends_service().related_queries(
+                keywords_list, timeframe='today 12-m', geo='KR'
+            )
         
-#         print("    - 트렌드 분석 완료.")
+        print("    - 트렌드 분석 완료.")
         
-#         # (※ DataFrame은 JSON으로 바로 보내기 까다로우므로,
-#         #    나중에 필요한 '연관 검색어'만 먼저 가공해서 반환합니다.)
+        # (※ DataFrame은 JSON으로 바로 보내기 까다로우므로,
+        #    나중에 필요한 '연관 검색어'만 먼저 가공해서 반환합니다.)
         
-#         top_related = {}
-#         for kw in keywords_list:
-#             top_queries = related_queries_dict.get(kw, {}).get('top')
-#             if top_queries is not None and not top_queries.empty:
-#                 # 'query' 컬럼의 상위 5개만 리스트로 변환
-#                 top_related[kw] = top_queries['query'].head(5).tolist()
-#             else:
-#                 top_related[kw] = []
-
-#         return {
-#             "analyzed_keywords": keywords_list,
-#             "top_related_queries": top_related
-#             # "interest_data": interest_df.to_dict() # (필요하다면 나중에 추가)
-#         }
-
-#     except Exception as e:
-#         # (429 오류 등이 발생할 수 있음)
-#         print(f"    ❌ 트렌드 분석 중 오류 발생: {e}")
-#         return {"error": f"트렌드 분석 오류: {e}"}
+        top_related = {}
+        for kw in keywords_list:
+            top_queries = related_queries_dict.get(kw, {}).get('top') or []
+            # 'query' 의 상위 5개만 리스트로 변환
+            top_related[kw] = [row['query'] for row in top_queries[:5]]
+
+        return {
+            "analyzed_keywords": keywords_list,
+            "top_related_queries": top_related
+            # "interest_data": interest_df.to_dict() # (필요하다면 나중에 추가)
+        }
+
+    except Exception as e:
+        # (429 오류 등이 발생할 수 있음)
+        print(f"    ❌ 트렌드 분석 중 오류 발생: {e}")
+        return {"error": f"트렌드 분석 오류: {e}"}
     
-# # ----------------------------------------------------
-# # 기능 3: 트렌드 분석기 (trend_test.py에서 가져옴)
-# # ----------------------------------------------------
-# # analysis_tools.py 파일에 이어서 추가하는 함수
-
-# def get_naver_buzzwords(keyword):
-#     """
-#     네이버 VIEW(블로그/카페) 탭을 크롤링하여
-#     '함께 찾는 키워드' (연관 태그) 리스트를 반환합니다.
-#     """
-#     print(f"  [analysis_tools] 3. Naver VIEW 탭 연관 키워드 분석 시작: {keyword}")
+# ----------------------------------------------------
+# 기능 3: 트렌드 분석기 (trend_test.py에서 가져옴)
+# ----------------------------------------------------
+# analysis_tools.py 파일에 이어서 추가하는 함수
+
+def get_naver_buzzwords(keyword):
+    """
+    네이버 VIEW(블로그/카페) 탭을 크롤링하여
+    '함께 찾는 키워드' (연관 태그) 리스트를 반환합니다.
+    """
+    print(f"  [analysis_tools] 3. Naver VIEW 탭 연관 키워드 분석 시작: {keyword}")
     
-#     # 1. 네이버 VIEW 탭 검색 URL
-#     # (where=view는 블로그/카페 탭을 의미)
-#     url = f"https://search.naver.com/search.naver?where=view&sm=tab_jum&query={keyword}"
+    # 1. 네이버 VIEW 탭 검색 URL
+    # (where=view는 블로그/카페 탭을 의미)
+    url = f"https://search.naver.com/search.naver?where=view&sm=tab_jum&query={keyword}"
     
-#     # 2. (⭐️중요) 크롤링 차단을 피하기 위한 'User-Agent' 헤더 설정
-#     # (우리가 '브라우저'인 척 접속합니다)
-#     headers = {
-#         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-#     }
-
-#     try:
-#         # 3. 'requests'로 HTML 페이지 가져오기
-#         response = requests.get(url, headers=headers, timeout=10)
-#         response.raise_for_status() # 200(성공) 코드가 아니면 오류 발생
+    # 2. (⭐️중요) 크롤링 차단을 피하기 위한 'User-Agent' 헤더 설정
+    # (우리가 '브라우저'인 척 접속합니다)
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+
+    try:
+        # 3. 'requests'로 HTML 페이지 가져오기
+        with instrumentation.stage("naver_buzzwords"):
+            response = get_http_session().get(url, headers=headers, timeout=10)
+            response.raise_for_status() # 200(성공) 코드가 아니면 오류 발생
+            instrumentation.add_counters(bytes_downloaded=len(response.content))
         
-#         # 4. 'BeautifulSoup'로 HTML 파싱(분석) 준비
-#         soup = BeautifulSoup(response.text, 'html.parser')
+        # 4. 'BeautifulSoup'로 HTML 파싱(분석) 준비
+        soup = BeautifulSoup(response.text, 'html.parser')
         
-#         # 5. (⭐️가장 중요/취약) "함께 찾는 키워드"가 있는 영역 찾기
-#         #    네이버는 이 CSS 선택자(selector)를 자주 바꿉니다.
-#         #    '.keyword_box_wrap .keyword' 또는 '.total_tag_area .link_tag' 등을 시도합니다.
-#         related_tags_elements = soup.select('.keyword_box_wrap .keyword')
+        # 5. (⭐️가장 중요/취약) "함께 찾는 키워드"가 있는 영역 찾기
+        #    네이버는 이 CSS 선택자(selector)를 자주 바꿉니다.
+        #    '.keyword_box_wrap .keyword' 또는 '.total_tag_area .link_tag' 등을 시도합니다.
+        related_tags_elements = soup.select('.keyword_box_wrap .keyword')
         
-#         if not related_tags_elements:
-#             # 만약 위 선택자가 작동 안 하면, '연관 태그' 영역을 시도
-#             related_tags_elements = soup.select('.total_tag_area .link_tag')
-
-#         buzzwords = []
-#         for tag_element in related_tags_elements:
-#             # 태그에서 텍스트만 추출
-#             buzzword = tag_element.get_text(strip=True)
-#             # '#광주맛집' 같은 # 기호 제거 (선택 사항)
-#             buzzwords.append(buzzword.replace('#', ''))
+        if not related_tags_elements:
+            # 만약 위 선택자가 작동 안 하면, '연관 태그' 영역을 시도
+            related_tags_elements = soup.select('.total_tag_area .link_tag')
+
+        buzzwords = []
+        for tag_element in related_tags_elements:
+            # 태그에서 텍스트만 추출
+            buzzword = tag_element.get_text(strip=True)
+            # '#광주맛집' 같은 # 기호 제거 (선택 사항)
+            buzzwords.append(buzzword.replace('#', ''))
             
-#         if not buzzwords:
-#             print("    - (참고) 연관 키워드를 찾지 못했습니다. (네이버 구조가 변경되었거나 키워드 데이터가 없음)")
-#             return []
+        if not buzzwords:
+            print("    - (참고) 연관 키워드를 찾지 못했습니다. (네이버 구조가 변경되었거나 키워드 데이터가 없음)")
+            return []
 
-#         print(f"    - Naver 연관 키워드 수집 완료: {buzzwords[:5]}...") # (로그에는 5개만)
+        print(f"    - Naver 연관 키워드 수집 완료: {buzzwords[:5]}...") # (로그에는 5개만)
         
-#         # 중복 제거 후 상위 10개만 반환
-#         return list(dict.fromkeys(buzzwords))[:10]
-
-#     except Exception as e:
-#         print(f"    ❌ Naver 크롤링 중 오류 발생: {e}")
-#         return []
-# # --- (이 파일 자체를 테스트하기 위한 코드) ---
-# if __name__ == "__main__":
-#     import json
+        # 중복 제거 후 상위 10개만 반환
+        return list(dict.fromkeys(buzzwords))[:10]
+
+    except Exception as e:
+        print(f"    ❌ Naver 크롤링 중 오류 발생: {e}")
+        return []
+
+
+# --- (이 파일 자체를 테스트하기 위한 코드) ---
+if __name__ == "__main__":
+    import json
     
-#     print("--- 🚀 'analysis_tools.py' 파일 단독 테스트 실행 ---")
+    print("--- 🚀 'analysis_tools.py' 파일 단독 테스트 실행 ---")
     
-#     # 1. PDF 분석 테스트
-#     pdf_result = analyze_pdf("sample_plan.pdf")
-#     print("\n[PDF 분석 결과 (JSON)]")
-#     print(json.dumps(pdf_result, indent=2, ensure_ascii=False))
+    # 1. PDF 분석 테스트
+    pdf_result = analyze_pdf("sample_plan.pdf")
+    print("\n[PDF 분석 결과 (JSON)]")
+    print(json.dumps(pdf_result, indent=2, ensure_ascii=False))
     
-#     # 2. 트렌드 분석 테스트
-#     trend_result = get_google_trends(["담양 산타 축제", "크리스마스",])
-#     print("\n[트렌드 분석 결과 (딕셔너리)]")
-#     print(json.dumps(trend_result, indent=2, ensure_ascii=False))
\ No newline at end of file
+    # 2. 트렌드 분석 테스트
+    trend_result = get_google_trends(["담양 산타 축제", "크리스마스",])
+    print("\n[트렌드 분석 결과 (딕셔너리)]")
+    print(json.dumps(trend_result, indent=2, ensure_ascii=False))
\ No newline at end of file
@@ -0,0 +1,98 @@
+# pipeline.py
+# (서로 의존하지 않는 작업(stage)은 동시에 실행하는 작은 의존성 그래프 실행기)
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import instrumentation
+
+
+class StageTimeout(Exception):
+    pass
+
+
+def _is_failure(result):
+    # (우리 모듈들은 실패하면 {"error": ...} 딕셔너리를 돌려줍니다)
+    return isinstance(result, dict) and "error" in result
+
+
+def run_stages(stages, max_workers=None, on_stage_done=None):
+    """
+    작업 그래프를 실행합니다. 의존하는 작업이 모두 끝난 작업부터 스레드 풀에서 동시에 실행됩니다.
+
+    stages 형식 (딕셔너리, 키 = 작업 이름):
+        {
+            "analysis": {"func": 함수, "timeout": 180},
+            "cardnews": {"func": 함수, "deps": ["analysis"], "timeout": 120},
+        }
+    - func 는 deps 작업들의 결과를 '키워드 인자'로 받습니다. (예: func(analysis=...))
+      실패한 작업의 결과는 None 으로 전달됩니다.
+    - timeout(초)을 넘긴 작업은 실패로 처리하고 기다리지 않습니다. (나머지 작업은 계속 진행)
+    - on_stage_done(name, result, error) 을 주면 작업이 끝날 때마다 호출합니다.
+
+    반환값: {"results": {이름: 결과}, "errors": {이름: 오류 메시지}, "timings": {이름: 초}}
+    """
+    for name, spec in stages.items():
+        for dep in spec.get("deps", []):
+            if dep not in stages:
+                raise ValueError(f"작업 '{name}' 의 의존 작업 '{dep}' 이(가) 없습니다.")
+
+    results, errors, timings = {}, {}, {}
+    pending = dict(stages)
+    running = {}  # future -> (name, 시작 시각, 마감 시각)
+
+    def finish(name, result, error, started):
+        timings[name] = round(time.perf_counter() - started, 3)
+        if error is None and _is_failure(result):
+            error = result["error"]
+        if error is not None:
+            errors[name] = str(error)
+            results[name] = result if _is_failure(result) else None
+        else:
+            results[name] = result
+        if on_stage_done:
+            on_stage_done(name, results[name], errors.get(name))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or max(1, len(stages)))
+    try:
+        while pending or running:
+            # (1) 의존 작업이 모두 끝난 작업을 시작
+            for name in [n for n, s in pending.items() if all(d in timings for d in s.get("deps", []))]:
+                spec = pending.pop(name)
+                kwargs = {dep: (None if dep in errors else results[dep]) for dep in spec.get("deps", [])}
+                started = time.perf_counter()
+                deadline = started + spec["timeout"] if spec.get("timeout") else None
+                future = instrumentation.submit_with_context(executor, spec["func"], **kwargs)
+                running[future] = (name, started, deadline)
+
+            if not running:
+                # (순환 의존 등으로 더 이상 시작할 수 있는 작업이 없음)
+                for name in pending:
+                    errors[name] = "의존 작업을 실행할 수 없습니다. (순환 의존?)"
+                    results[name] = None
+                break
+
+            # (2) 작업 하나가 끝나거나, 가장 가까운 마감 시각이 될 때까지 대기
+            deadlines = [d for _, _, d in running.values() if d is not None]
+            wait_for = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+            done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name, started, _ = running.pop(future)
+                try:
+                    finish(name, future.result(), None, started)
+                except Exception as e:
+                    finish(name, None, e, started)
+
+            # (3) 마감 시각이 지난 작업은 실패 처리 (스레드는 멈출 수 없으므로 결과만 버림)
+            now = time.perf_counter()
+            for future, (name, started, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    running.pop(future)
+                    future.cancel()
+                    finish(name, None, StageTimeout(f"{round(deadline - started, 1):g}초 시간 초과"), started)
+    finally:
+        # 시간 초과로 버린 작업이 있어도 기다리지 않고 돌아갑니다.
+        executor.shutdown(wait=False)
+
+    return {"results": results, "errors": errors, "timings": timings}
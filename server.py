@@ -0,0 +1,298 @@
+# server.py
+# (app.py 의 전체 분석 흐름을 계속 켜져 있는 로컬 HTTP 서비스로 제공합니다)
+#
+# 실행:
+#   python server.py --port 8000
+#
+# API:
+#   POST /jobs               작업 등록 → {"job_id": ..., "status": "queued"}
+#       - JSON: {"theme": "...", "keywords": ["..."], "filename": "plan.pdf", "file_base64": "..."}
+#       - 또는 파일 자체를 body 로: POST /jobs?theme=...&keywords=a,b&filename=plan.pdf
+#   GET  /jobs/<id>          작업 상태/결과 조회 (폴링)
+#   GET  /jobs/<id>/events   상태 변화를 한 줄씩(JSON Lines) 스트리밍, 작업이 끝나면 연결 종료
+#   GET  /health             서버 상태 (대기 중인 작업 수, 캐시 통계)
+#
+# (※ AI 없이 테스트하려면 OPENAI_BASE_URL 을 로컬 가짜 서버 주소로 지정하세요.
+#     openai SDK 가 이 환경 변수를 그대로 사용합니다)
+
+import argparse
+import base64
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import app  # (모듈/클라이언트/캐시를 서버 시작 시 한 번만 로드하고 계속 재사용)
+import pdf_tools
+from disk_cache import CACHE_ROOT
+
+# --- 서버 설정 (.env 또는 환경 변수로 변경 가능) ---
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", 2))          # 동시에 실행하는 작업 수
+MAX_QUEUED_JOBS = int(os.getenv("MAX_QUEUED_JOBS", 20))       # 대기열 최대 길이 (넘으면 503)
+MAX_STORED_JOBS = int(os.getenv("MAX_STORED_JOBS", 200))      # 메모리에 보관하는 완료 작업 수
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", 50 * 1024 * 1024))
+UPLOAD_DIR = os.path.join(CACHE_ROOT, "uploads")
+
+_executor = ThreadPoolExecutor(max_workers=SERVER_WORKERS)
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+# ----------------------------------------------------
+# 작업(Job) 관리
+# ----------------------------------------------------
+def _new_job(params):
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "status": "queued",
+        "created_at": time.time(),
+        "params": params,
+        "events": [],
+        "result": None,
+        "condition": threading.Condition(),
+    }
+    _add_event(job, {"status": "queued"})
+    return job
+
+
+def _add_event(job, event, status=None):
+    with job["condition"]:
+        event["time"] = round(time.time(), 3)
+        job["events"].append(event)
+        if status is not None:
+            # (이벤트를 먼저 넣고 같은 잠금 안에서 상태를 바꿔야, /events 가 '끝남'을 보고 마지막 줄을 빠뜨린 채 닫지 않음)
+            job["status"] = status
+        job["condition"].notify_all()
+
+
+def _public_view(job):
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "created_at": job["created_at"],
+        "stages": [e for e in job["events"] if "stage" in e],
+        "result": job["result"],
+    }
+
+
+def _count_active_jobs():
+    return sum(1 for j in _jobs.values() if j["status"] in ("queued", "running"))
+
+
+def _trim_finished_jobs():
+    finished = [j for j in _jobs.values() if j["status"] in ("success", "error")]
+    for job in sorted(finished, key=lambda j: j["created_at"])[:max(0, len(finished) - MAX_STORED_JOBS)]:
+        _jobs.pop(job["job_id"], None)
+
+
+def _run_job(job):
+    params = job["params"]
+    _add_event(job, {"status": "running"}, status="running")
+
+    def on_stage_done(name, result, error):
+        _add_event(job, {"stage": name, "ok": error is None, "error": error})
+
+    try:
+        result = app.run_pipeline(params["theme"], params["file_path"], params["keywords"], on_stage_done=on_stage_done)
+    except Exception as e:
+        result = {"status": "error", "message": f"서버 작업 오류: {e}"}
+    finally:
+        try:
+            os.remove(params["file_path"])
+        except OSError:
+            pass
+
+    job["result"] = result
+    status = result.get("status", "error")
+    _add_event(job, {"status": status}, status=status)
+
+
+def submit_job(theme, keywords, filename, file_bytes):
+    """
+    업로드된 파일을 저장하고 작업을 대기열에 넣습니다.
+    대기열이 가득 찼으면 None 을 반환합니다.
+    """
+    with _jobs_lock:
+        if _count_active_jobs() >= MAX_QUEUED_JOBS:
+            return None
+        _trim_finished_jobs()
+
+        extension = os.path.splitext(filename)[1].lower() or ".pdf"
+        job = _new_job({"theme": theme, "keywords": keywords, "filename": filename})
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        file_path = os.path.join(UPLOAD_DIR, f"{job['job_id']}{extension}")
+        with open(file_path, "wb") as f:
+            f.write(file_bytes)
+        job["params"]["file_path"] = file_path
+        _jobs[job["job_id"]] = job
+
+    _executor.submit(_run_job, job)
+    return job
+
+
+# ----------------------------------------------------
+# HTTP 요청 처리
+# ----------------------------------------------------
+def _parse_keywords(value):
+    # (쉼표로 구분한 문자열 또는 문자열 리스트만 받음 - 그 밖의 타입은 TypeError → 400)
+    if isinstance(value, list):
+        if not all(isinstance(k, str) for k in value):
+            raise TypeError("keywords 는 문자열 리스트여야 합니다.")
+        return [k.strip() for k in value if k.strip()]
+    if value is not None and not isinstance(value, str):
+        raise TypeError("keywords 는 문자열 또는 문자열 리스트여야 합니다.")
+    return [k.strip() for k in (value or "").split(",") if k.strip()]
+
+
+def _require_str(name, value):
+    if not isinstance(value, str):
+        raise TypeError(f"{name} 은(는) 문자열이어야 합니다.")
+    return value
+
+
+class FestivalRequestHandler(BaseHTTPRequestHandler):
+    server_version = "FestivalAI/1.0"
+
+    def _send_json(self, status_code, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _get_job(self, job_id):
+        with _jobs_lock:
+            return _jobs.get(job_id)
+
+    def do_GET(self):
+        parts = [p for p in urlparse(self.path).path.split("/") if p]
+
+        if parts == ["health"]:
+            with _jobs_lock:
+                active = _count_active_jobs()
+            return self._send_json(200, {
+                "status": "ok",
+                "active_jobs": active,
+                "workers": SERVER_WORKERS,
+                "analysis_cache": pdf_tools.get_cache_stats(),
+                "hwp_cache": pdf_tools.get_hwp_cache_stats(),
+            })
+
+        if len(parts) >= 2 and parts[0] == "jobs":
+            job = self._get_job(parts[1])
+            if job is None:
+                return self._send_json(404, {"error": "작업을 찾을 수 없습니다."})
+            if len(parts) == 2:
+                return self._send_json(200, _public_view(job))
+            if len(parts) == 3 and parts[2] == "events":
+                return self._stream_events(job)
+
+        self._send_json(404, {"error": "없는 주소입니다."})
+
+    def _stream_events(self, job):
+        """
+        상태 변화를 JSON Lines 로 하나씩 보내고, 작업이 끝나면 연결을 닫습니다.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        sent = 0
+        while True:
+            with job["condition"]:
+                while sent >= len(job["events"]):
+                    job["condition"].wait(timeout=15)
+                    if sent >= len(job["events"]):
+                        break  # (15초 동안 변화 없음 → 아래에서 keep-alive 줄 전송)
+                new_events = job["events"][sent:]
+                # (상태는 이벤트와 같은 잠금 안에서 바뀌므로, 여기서 끝났으면 마지막 이벤트도 new_events 까지 안에 있음)
+                finished = job["status"] in ("success", "error")
+            try:
+                if new_events:
+                    for event in new_events:
+                        self.wfile.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+                    sent += len(new_events)
+                else:
+                    self.wfile.write(b"\n")
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            if finished:
+                return
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/jobs":
+            return self._send_json(404, {"error": "없는 주소입니다."})
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_UPLOAD_BYTES * 2:
+            return self._send_json(413 if length else 400, {"error": "요청 본문이 비었거나 너무 큽니다."})
+        body = self.rfile.read(length)
+
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                payload = json.loads(body)
+                if not isinstance(payload, dict):
+                    raise ValueError("JSON 본문은 객체({...})여야 합니다.")
+                theme = _require_str("theme", payload.get("theme", ""))
+                keywords = _parse_keywords(payload.get("keywords"))
+                filename = _require_str("filename", payload.get("filename", "upload.pdf"))
+                file_bytes = base64.b64decode(payload.get("file_base64", ""))
+            else:
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                theme = query.get("theme", "")
+                keywords = _parse_keywords(query.get("keywords"))
+                filename = query.get("filename", "upload.pdf")
+                file_bytes = body
+        except (ValueError, TypeError) as e:
+            return self._send_json(400, {"error": f"요청 형식 오류: {e}"})
+
+        if not theme or not keywords or not file_bytes:
+            return self._send_json(400, {"error": "theme, keywords, 파일이 모두 필요합니다."})
+        if len(file_bytes) > MAX_UPLOAD_BYTES:
+            return self._send_json(413, {"error": "파일이 너무 큽니다."})
+        if os.path.splitext(filename)[1].lower() not in pdf_tools.SUPPORTED_EXTENSIONS:
+            return self._send_json(400, {"error": "PDF, DOCX, HWP 파일만 지원합니다."})
+
+        job = submit_job(theme, keywords, filename, file_bytes)
+        if job is None:
+            return self._send_json(503, {"error": "대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도하세요."})
+        self._send_json(202, {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "status_url": f"/jobs/{job['job_id']}",
+            "events_url": f"/jobs/{job['job_id']}/events",
+        })
+
+    def log_message(self, format, *args):
+        print(f"  [server] {self.address_string()} - {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="축제 기획서 분석 로컬 HTTP 서비스")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    httpd = ThreadingHTTPServer((args.host, args.port), FestivalRequestHandler)
+    print(f"--- [server] http://{args.host}:{args.port} 에서 요청 대기 중 (작업 스레드 {SERVER_WORKERS}개) ---")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n--- [server] 종료합니다 ---")
+    finally:
+        httpd.server_close()
+        _executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    main()
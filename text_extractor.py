@@ -0,0 +1,168 @@
+# text_extractor.py
+# (PDF 텍스트 추출 엔진 - 페이지를 여러 프로세스에 나눠서 병렬로 추출)
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import fitz  # PyMuPDF
+
+# --- 병렬 추출 설정 (.env 또는 환경 변수로 변경 가능) ---
+# PDF_EXTRACT_WORKERS=1 로 두면 항상 단일 프로세스로 추출합니다.
+DEFAULT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+# 이 페이지 수보다 작은 문서는 프로세스를 띄우는 비용이 더 크므로 단일 프로세스로 처리
+PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 32))
+# 글자 수 한도까지만 읽을 때(extract_text_within_budget) 한 프로세스에 맡기는 페이지 묶음 크기
+BUDGET_BATCH_PAGES = max(1, int(os.getenv("PDF_BUDGET_BATCH_PAGES", 16)))
+
+
+def _open_document(source):
+    """
+    source 가 파일 경로(str)면 파일을, bytes 면 메모리 스트림을 엽니다.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def _extract_page_range(source, start, end):
+    """
+    (워커 프로세스에서 실행) start~end-1 페이지의 텍스트를 리스트로 반환합니다.
+    각 워커는 자기만의 fitz 문서 핸들을 엽니다.
+    """
+    doc = _open_document(source)
+    try:
+        return [doc.load_page(page_num).get_text("text") for page_num in range(start, end)]
+    finally:
+        doc.close()
+
+
+def _split_ranges(page_count, workers):
+    """
+    전체 페이지를 workers 개의 연속된 구간 [(start, end), ...] 으로 나눕니다.
+    """
+    size, remainder = divmod(page_count, workers)
+    ranges = []
+    start = 0
+    for i in range(workers):
+        end = start + size + (1 if i < remainder else 0)
+        if end > start:
+            ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def extract_page_texts(source, workers=None):
+    """
+    PDF(파일 경로 또는 bytes)의 페이지별 텍스트를 '페이지 순서대로' 리스트로 반환합니다.
+
+    - 페이지 수가 PARALLEL_MIN_PAGES 이상이고 workers > 1 이면 프로세스 풀로 나눠서 추출
+    - 그보다 작은 문서는 현재 프로세스에서 바로 추출
+    (※ 프로세스 풀을 쓰므로, 이 함수를 부르는 스크립트는 if __name__ == "__main__": 안에서 실행되어야 합니다)
+    """
+    workers = DEFAULT_WORKERS if workers is None else max(1, workers)
+
+    doc = _open_document(source)
+    try:
+        page_count = doc.page_count
+        if workers == 1 or page_count < PARALLEL_MIN_PAGES:
+            return [doc.load_page(page_num).get_text("text") for page_num in range(page_count)]
+    finally:
+        doc.close()
+
+    ranges = _split_ranges(page_count, min(workers, page_count))
+    page_texts = []
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        # executor.map 은 입력 순서대로 결과를 돌려주므로 페이지 순서가 유지됩니다.
+        futures = executor.map(
+            _extract_page_range,
+            [source] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+        )
+        for chunk in futures:
+            page_texts.extend(chunk)
+    return page_texts
+
+
+def extract_pdf_text(source, workers=None):
+    """
+    PDF 전체 텍스트를 하나의 문자열로 반환합니다. (페이지 텍스트를 모은 뒤 마지막에 한 번만 join)
+    """
+    return "".join(extract_page_texts(source, workers=workers))
+
+
+# ----------------------------------------------------
+# 스트리밍 추출 (필요한 만큼만 페이지를 읽고 멈춤)
+# ----------------------------------------------------
+def _iter_doc_pages(doc):
+    for page_num in range(doc.page_count):
+        yield doc.load_page(page_num).get_text("text")
+
+
+def iter_page_texts(source):
+    """
+    PDF 페이지 텍스트를 한 페이지씩 '필요할 때' 읽어서 yield 하는 제너레이터입니다.
+    (중간에 반복을 멈추면 나머지 페이지는 열지 않습니다)
+    """
+    doc = _open_document(source)
+    try:
+        yield from _iter_doc_pages(doc)
+    finally:
+        doc.close()
+
+
+def extract_text_within_budget(source, max_chars, workers=None):
+    """
+    앞 페이지부터 읽다가 max_chars 글자를 채우는 순간 멈춥니다.
+    (AI에게 어차피 max_chars 까지만 보내므로, 뒤 페이지를 파싱할 필요가 없음)
+
+    페이지 수가 PARALLEL_MIN_PAGES 이상이고 workers > 1 이면, 앞에서부터 BUDGET_BATCH_PAGES 페이지씩
+    여러 프로세스에 나눠 읽고, 순서대로 모으다가 글자 수를 채우면 남은 묶음은 취소합니다.
+    (※ 프로세스 풀을 쓰므로, 이 함수를 부르는 스크립트는 if __name__ == "__main__": 안에서 실행되어야 합니다)
+
+    반환값: (텍스트, 실제로 읽은 페이지 수, 전체 페이지 수)
+    """
+    workers = DEFAULT_WORKERS if workers is None else max(1, workers)
+    page_texts = []
+    total_chars = 0
+    doc = _open_document(source)
+    try:
+        page_count = doc.page_count
+        if workers > 1 and page_count >= PARALLEL_MIN_PAGES:
+            parallel = True
+        else:
+            parallel = False
+            for text in _iter_doc_pages(doc):
+                page_texts.append(text)
+                total_chars += len(text)
+                if total_chars >= max_chars:
+                    break
+    finally:
+        doc.close()
+    if parallel:
+        page_texts = _extract_within_budget_parallel(source, max_chars, page_count, workers)
+    return "".join(page_texts)[:max_chars], len(page_texts), page_count
+
+
+def _extract_within_budget_parallel(source, max_chars, page_count, workers):
+    batch_ranges = iter([(start, min(start + BUDGET_BATCH_PAGES, page_count))
+                         for start in range(0, page_count, BUDGET_BATCH_PAGES)])
+    page_texts = []
+    total_chars = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # (묶음을 workers 개씩만 미리 걸어두고, 앞 묶음부터 순서대로 결과를 모음)
+        pending = deque(executor.submit(_extract_page_range, source, start, end)
+                        for start, end in islice(batch_ranges, workers))
+        while pending:
+            for text in pending.popleft().result():
+                page_texts.append(text)
+                total_chars += len(text)
+                if total_chars >= max_chars:
+                    for future in pending:
+                        future.cancel()
+                    return page_texts
+            for start, end in islice(batch_ranges, 1):
+                pending.append(executor.submit(_extract_page_range, source, start, end))
+    return page_texts
@@ -0,0 +1,300 @@
+# trend_analytics.py
+# (모아 둔 트렌드 시계열(데이터랩 / Google 트렌드)을 카드뉴스에 쓸 수 있는 '신호'로 바꾸는 분석 모음)
+#
+# 모든 계산은 키워드마다 반복하지 않고, 시계열 수천 개를 한 번에 NumPy/pandas 배열 연산으로 처리합니다.
+#   - rolling_growth    : 이동 평균(window 일)이 직전 window 일보다 얼마나 늘었는지 (날짜별)
+#   - week_over_week    : 주간 합계의 전주 대비 변화율
+#   - rank_rising       : 최근 window 일 증가율 기준 '뜨는 키워드' 순위
+#   - festival_seasonality : 축제 시작일/종료일(2025.csv) 기준으로 관심도가 언제 정점을 찍는지
+#   - keyword_signals   : 키워드 몇 개의 관심도를 조회해서 카드뉴스 프롬프트에 넣을 요약을 만듦
+#
+# 입력 형식:
+#   - wide: index = 날짜, columns = 시계열 이름 (interest_over_time / datalab_to_frame / to_wide 결과)
+#   - long: trend_collector 결과 파일의 행 형식 (festival_id, keyword, date, value, start_date, end_date ...)
+# (두 서비스 모두 '요청마다 최댓값 = 100' 으로 정규화하므로, 묶음이 다른 시계열끼리는 값 자체보다 비율(증가율)을 비교)
+#
+# 사용 예:
+#   long = load_collected("trends.parquet")
+#   ranking = rank_rising(to_wide(long), top=20)
+#   season = festival_seasonality(long)
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+
+# --- 분석 설정 (.env 또는 환경 변수로 변경 가능) ---
+TREND_GROWTH_WINDOW = int(os.getenv("TREND_GROWTH_WINDOW", 7))          # 증가율을 비교할 기간(일)
+TREND_RISING_TOP = int(os.getenv("TREND_RISING_TOP", 10))               # 뜨는 키워드 순위 개수
+TREND_MIN_LEVEL = float(os.getenv("TREND_MIN_LEVEL", 5))                # 최근 평균이 이보다 낮으면 순위 제외 (0~100 축, 잡음 방지)
+TREND_SEASON_LOOKBACK_DAYS = int(os.getenv("TREND_SEASON_LOOKBACK_DAYS", 30))  # 시작일 전 며칠을 '준비 기간'으로 볼지
+
+SERIES_KEYS = ["festival_id", "keyword"]
+
+
+# ----------------------------------------------------
+# 1. 불러오기 / 형식 바꾸기
+# ----------------------------------------------------
+def load_collected(path):
+    """
+    trend_collector 결과 파일(Parquet / Feather)을 long 형식 DataFrame 으로 읽습니다.
+    """
+    if path.endswith(".feather"):
+        return pd.read_feather(path)
+    return pd.read_parquet(path)
+
+
+def festival_calendar(csv_path=None, region=None):
+    """
+    축제 CSV(기본 2025.csv)의 연번 / 축제명 / 시작일 / 종료일을 DataFrame 으로 반환합니다.
+    """
+    from trend_collector import iter_festivals  # (분석만 할 때는 수집 모듈을 읽지 않도록)
+
+    festivals = list(iter_festivals(csv_path, region))
+    return pd.DataFrame({
+        "festival_id": [int(f["id"]) if f["id"].isdigit() else -1 for f in festivals],
+        "festival_name": [f["name"] for f in festivals],
+        "start_date": pd.to_datetime([f["start"] for f in festivals], errors="coerce"),
+        "end_date": pd.to_datetime([f["end"] for f in festivals], errors="coerce"),
+    })
+
+
+def to_wide(long, columns=SERIES_KEYS, value="value"):
+    """
+    long 형식을 wide 형식(index = 날짜, columns = 시계열)으로 바꿉니다.
+    columns 가 여러 개면 열 이름은 (festival_id, keyword) 같은 튜플(MultiIndex)입니다.
+    중간에 빠진 날짜는 0 으로 채웁니다. (데이터랩은 검색량이 없는 날을 응답에서 뺌)
+    """
+    if long.empty:
+        return pd.DataFrame()
+    wide = long.pivot_table(index="date", columns=list(columns), values=value, aggfunc="mean")
+    wide.index = pd.DatetimeIndex(wide.index).normalize()
+    full_range = pd.date_range(wide.index.min(), wide.index.max(), freq="D", name="date")
+    return wide.reindex(full_range).fillna(0.0).astype(np.float64)
+
+
+def _ratio(numerator, denominator, floor=0.0):
+    # (분모가 floor 이하이면 비율을 정할 수 없으므로 NaN)
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > floor)
+    return out
+
+
+# ----------------------------------------------------
+# 2. 증가율
+# ----------------------------------------------------
+def rolling_growth(wide, window=None):
+    """
+    날짜마다 '최근 window 일 평균 / 그 직전 window 일 평균 - 1' 을 계산합니다. (wide 와 같은 모양)
+    앞쪽 2 * window - 1 일과 직전 평균이 0 인 곳은 NaN.
+    """
+    window = window or TREND_GROWTH_WINDOW
+    mean = wide.rolling(window, min_periods=window).mean()
+    previous = mean.shift(window)
+    return pd.DataFrame(_ratio(mean.to_numpy() - previous.to_numpy(), previous.to_numpy()),
+                        index=wide.index, columns=wide.columns)
+
+
+def week_over_week(wide, week_end="SUN"):
+    """
+    주간 합계(week_end 요일에 끝나는 주)의 전주 대비 변화율을 반환합니다. (index = 주의 마지막 날)
+    7일이 다 차지 않은 주(처음/마지막 주)는 빼고 계산합니다.
+    """
+    resampler = wide.resample(f"W-{week_end}")
+    weekly = resampler.sum()
+    weekly = weekly[resampler.size() == 7]
+    values = weekly.to_numpy()
+    change = np.full(values.shape, np.nan)
+    if len(values) > 1:
+        change[1:] = _ratio(values[1:] - values[:-1], values[:-1])
+    return pd.DataFrame(change, index=weekly.index, columns=wide.columns)
+
+
+def rank_rising(wide, window=None, top=None, min_level=None):
+    """
+    최근 window 일 평균이 직전 window 일보다 많이 오른 순서로 시계열을 정렬합니다.
+    반환 DataFrame (index = 시계열 이름):
+      recent   : 최근 window 일 평균
+      previous : 직전 window 일 평균
+      growth   : recent / max(previous, min_level) - 1  (직전에 거의 0 이던 키워드가 무한대로 튀지 않도록)
+      slope    : 최근 2 * window 일 기울기를 평균 관심도로 나눈 값 (하루에 평균의 몇 % 씩 오르는지)
+    recent 가 min_level 보다 낮은 시계열은 뺍니다. top 을 주면 상위 top 개만.
+    """
+    window = window or TREND_GROWTH_WINDOW
+    min_level = TREND_MIN_LEVEL if min_level is None else min_level
+    if wide.empty or len(wide) < 2 * window:
+        return pd.DataFrame(columns=["recent", "previous", "growth", "slope"])
+
+    values = wide.to_numpy(dtype=np.float64)[-2 * window:]  # (날짜 수, 시계열 수)
+    previous = values[:window].mean(axis=0)
+    recent = values[window:].mean(axis=0)
+    growth = recent / np.maximum(previous, min_level) - 1
+
+    # (모든 시계열의 최소제곱 기울기를 행렬 곱 한 번으로)
+    x = np.arange(2 * window, dtype=np.float64)
+    x -= x.mean()
+    level = values.mean(axis=0)
+    slope = _ratio(x @ (values - level), (x @ x) * level)
+
+    ranking = pd.DataFrame({"recent": recent, "previous": previous, "growth": growth, "slope": slope},
+                           index=wide.columns)
+    ranking = ranking[ranking["recent"] >= min_level]
+    ranking = ranking.sort_values(["growth", "recent"], ascending=False, kind="stable")
+    return ranking.head(top) if top else ranking
+
+
+# ----------------------------------------------------
+# 3. 축제 기간 기준 계절성
+# ----------------------------------------------------
+def _shift_years(dates, years):
+    # (날짜마다 다른 햇수만큼 옮기기 - 2월 29일은 2월 28일로)
+    parts = pd.DataFrame({"year": dates.dt.year + years, "month": dates.dt.month, "day": dates.dt.day})
+    leap_fix = (parts["month"] == 2) & (parts["day"] == 29)
+    parts.loc[leap_fix, "day"] = 28
+    return pd.to_datetime(parts)
+
+
+def festival_seasonality(long, calendar=None, lookback_days=None, align_years=True):
+    """
+    축제별로 관심도 정점이 축제 시작일 기준 언제인지, 시작 전/기간 중에 평소보다 얼마나 오르는지 계산합니다.
+    long 에 start_date / end_date 가 없으면 calendar (기본: festival_calendar()) 에서 festival_id 로 붙입니다.
+    align_years 면 CSV 의 날짜(2025년)를 모은 기간과 가장 가까운 해의 같은 날짜로 옮겨서 비교합니다.
+    (start_date / end_date 열은 옮긴 날짜)
+
+    반환 DataFrame (index = (festival_id, keyword)):
+      festival_name, start_date, end_date,
+      peak_date, peak_value, peak_offset_days (정점 날짜 - 시작일, 음수면 시작 전),
+      peak_phase ("baseline" / "before" / "during" / "after"),
+      ramp_offset_days (정점의 절반을 처음 넘은 날 - 시작일: 관심이 오르기 시작하는 시점),
+      mean_baseline (시작 lookback_days 일 전보다 이전), mean_before (시작 전 lookback_days 일), mean_during,
+      lift_before / lift_during (평소 대비 배율)
+    """
+    lookback_days = TREND_SEASON_LOOKBACK_DAYS if lookback_days is None else lookback_days
+    if long.empty:
+        return pd.DataFrame()
+    frame = long
+    if "start_date" not in frame.columns or "end_date" not in frame.columns:
+        calendar = festival_calendar() if calendar is None else calendar
+        frame = frame.merge(calendar, on="festival_id", how="left", suffixes=("", "_calendar"))
+    frame = frame.dropna(subset=["start_date"]).reset_index(drop=True)  # (idxmax 가 행 위치를 돌려주도록)
+    if frame.empty:
+        return pd.DataFrame()
+
+    with instrumentation.stage("trend_seasonality", rows=len(frame)):
+        date = pd.to_datetime(frame["date"]).dt.normalize()
+        start = pd.to_datetime(frame["start_date"])
+        end = pd.to_datetime(frame["end_date"]).fillna(start)
+        keys = [frame[key].to_numpy() for key in SERIES_KEYS]
+        if align_years:
+            # (매년 열리는 축제로 보고, 시작일/종료일을 '모은 기간의 가운데 날짜'에 가장 가까운 해로 옮김)
+            center = date.groupby(keys).transform("mean")
+            years = np.round((center - start).dt.days / 365.2425).astype(int)
+            start, end = _shift_years(start, years), _shift_years(end, years)
+        offset = (date - start).dt.days.to_numpy()
+        value = frame["value"].to_numpy(dtype=np.float64)
+
+        is_during = ((date >= start) & (date <= end)).to_numpy()
+        is_after = (date > end).to_numpy()
+        is_before = (offset < 0) & (offset >= -lookback_days)
+        is_baseline = offset < -lookback_days
+        phase = np.select([is_baseline, is_before, is_during, is_after], ["baseline", "before", "during", "after"], "")
+
+        grouped = pd.DataFrame({
+            "value": value,
+            "offset": offset,
+            "baseline": np.where(is_baseline, value, np.nan),
+            "before": np.where(is_before, value, np.nan),
+            "during": np.where(is_during, value, np.nan),
+        }).groupby(keys)
+        peak_at = grouped["value"].idxmax().to_numpy()
+        peak_value = value[peak_at]
+
+        # (정점의 절반을 처음 넘은 날 - 시계열마다 자기 정점과 비교)
+        half_peak = grouped["value"].transform("max").to_numpy() / 2
+        ramp = pd.Series(np.where((value >= half_peak) & (half_peak > 0), offset, np.nan)).groupby(keys).min()
+
+        means = grouped[["baseline", "before", "during"]].mean()
+        result = pd.DataFrame({
+            "festival_name": frame["festival_name"].to_numpy()[peak_at] if "festival_name" in frame.columns else None,
+            "start_date": start.to_numpy()[peak_at],
+            "end_date": end.to_numpy()[peak_at],
+            "peak_date": date.to_numpy()[peak_at],
+            "peak_value": peak_value,
+            "peak_offset_days": offset[peak_at],
+            "peak_phase": phase[peak_at],
+            "ramp_offset_days": ramp.to_numpy(),
+            "mean_baseline": means["baseline"].to_numpy(),
+            "mean_before": means["before"].to_numpy(),
+            "mean_during": means["during"].to_numpy(),
+        }, index=means.index)
+        result.index.names = SERIES_KEYS
+        result["lift_before"] = _ratio(result["mean_before"], result["mean_baseline"])
+        result["lift_during"] = _ratio(result["mean_during"], result["mean_baseline"])
+    return result
+
+
+# ----------------------------------------------------
+# 4. 카드뉴스용 요약
+# ----------------------------------------------------
+def keyword_signals(keywords, days=90, window=None, service=None):
+    """
+    키워드들의 최근 days 일 Google 트렌드 관심도를 조회(trend_store 에 있는 날짜는 재사용)해서
+    카드뉴스 프롬프트에 넣을 신호를 만듭니다.
+    반환값: {"rising": [오르는 키워드...], "signals": {키워드: {...}}, "summary_lines": [문장...]}
+    """
+    window = window or TREND_GROWTH_WINDOW
+    print(f"  [trend_analytics] 키워드 관심도 변화 분석 시작: {keywords}")
+    try:
+        if service is None:
+            from trends_service import get_trends_service
+            service = get_trends_service()
+        wide = service.interest_series(keywords, days=days)
+        if wide.empty:
+            return {"rising": [], "signals": {}, "summary_lines": []}
+
+        ranking = rank_rising(wide, window=window, min_level=1.0)
+        weekly = week_over_week(wide)
+        last_week = weekly.iloc[-1] if len(weekly) else pd.Series(np.nan, index=wide.columns)
+        peak_dates = wide.idxmax()
+
+        signals, lines = {}, []
+        for keyword in ranking.index:  # (결과 정리만 키워드별로 - 계산은 위에서 한 번에)
+            row = ranking.loc[keyword]
+            signals[keyword] = {
+                "recent": round(float(row["recent"]), 2),
+                "growth": None if np.isnan(row["growth"]) else round(float(row["growth"]), 4),
+                "week_over_week": None if np.isnan(last_week[keyword]) else round(float(last_week[keyword]), 4),
+                "peak_date": peak_dates[keyword].strftime("%Y-%m-%d"),
+            }
+            lines.append(
+                f"{keyword}: 최근 {window}일 관심도 {row['growth'] * 100:+.0f}% "
+                f"(최근 {days}일 중 최고: {peak_dates[keyword]:%m-%d})"
+            )
+        rising = [keyword for keyword in ranking.index if ranking.loc[keyword, "growth"] > 0]
+        print(f"    - 관심도 분석 완료. (오르는 키워드 {len(rising)}개)")
+        return {"rising": rising, "signals": signals, "summary_lines": lines}
+
+    except Exception as e:
+        print(f"    - 관심도 분석 실패: {e}")
+        return {"error": str(e)}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="모아 둔 트렌드 결과 파일에서 뜨는 키워드 / 축제 시즌 정점을 계산합니다.")
+    parser.add_argument("path", help="trend_collector 결과 파일 (.parquet / .feather)")
+    parser.add_argument("--top", type=int, default=TREND_RISING_TOP)
+    parser.add_argument("--window", type=int, default=TREND_GROWTH_WINDOW)
+    args = parser.parse_args()
+
+    collected = load_collected(args.path)
+    print(f"시계열 {collected.groupby(SERIES_KEYS).ngroups}개, 행 {len(collected)}개")
+    print("\n[뜨는 키워드]")
+    print(rank_rising(to_wide(collected), window=args.window, top=args.top))
+    print("\n[축제 시작일 기준 관심도 정점]")
+    print(festival_seasonality(collected).head(args.top))
@@ -0,0 +1,350 @@
+# trend_collector.py
+# (2025.csv 의 모든 축제에 대해 검색 트렌드를 한꺼번에 모으는 배치 수집기)
+#
+# - CSV 는 한 줄씩 읽으면서 바로 요청을 보냅니다. (파일 전체를 메모리에 올리지 않음)
+# - 축제마다 키워드 그룹(축제명, 띄어쓰기 없는 이름, '지역 + 축제명' 등)을 만들어 조회
+# - 동시에 진행하는 요청 수는 --concurrency 로 제한 (Google 요청 속도는 trends_service 가 따로 조절)
+# - 다 모은 축제는 체크포인트에 기록 → 중간에 멈췄다가 다시 실행해도 이어서,
+#   밤마다 다시 돌려도 --max-age 시간 안에 모은 축제는 다시 요청하지 않음
+# - 결과는 열(column) 기반 파일(Parquet / Feather)로 저장
+#
+# 사용 예:
+#   python trend_collector.py --source google --out festival_trends.parquet
+#   python trend_collector.py --source naver --region 강원 --out gangwon.feather
+
+import argparse
+import csv
+import datetime
+import glob
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+from dotenv import load_dotenv
+
+import instrumentation
+from disk_cache import make_key
+from naver_datalab import QuotaExceededError
+from trend_extractor import get_naver_datalab_series
+from trends_service import get_trends_service
+
+load_dotenv()
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --- 수집 설정 (.env 또는 환경 변수로 변경 가능) ---
+FESTIVAL_CSV_PATH = os.getenv("FESTIVAL_CSV_PATH", os.path.join(SCRIPT_DIR, "2025.csv"))
+COLLECT_CONCURRENCY = int(os.getenv("TREND_COLLECT_CONCURRENCY", 4))      # 동시에 진행하는 요청 수
+COLLECT_MAX_AGE_HOURS = float(os.getenv("TREND_COLLECT_MAX_AGE_HOURS", 20))  # 이 시간 안에 모은 축제는 건너뜀
+COLLECT_FLUSH_EVERY = int(os.getenv("TREND_COLLECT_FLUSH_EVERY", 50))     # 축제 몇 개마다 중간 파일로 저장할지
+COLLECT_TIMEFRAME_DAYS = int(os.getenv("TREND_COLLECT_DAYS", 90))         # 최근 며칠을 모을지
+MAX_KEYWORDS_PER_FESTIVAL = 5
+
+# CSV 열 이름
+COLUMNS = {
+    "id": "연번",
+    "region": "광역자치단체명",
+    "city": "기초자치단체명",
+    "name": "축제명",
+    "type": "축제 유형",
+    "start": "시작일",
+    "end": "종료일",
+}
+
+_YEAR_PREFIX = re.compile(r"^\s*(?:\d{4}\s*년?\s*|제\s*\d+\s*회\s*)+")
+_CITY_SUFFIX = re.compile(r"(특별자치시|특별자치도|광역시|특별시|시|군|구)$")
+
+
+# ----------------------------------------------------
+# 1. 축제 목록 / 키워드
+# ----------------------------------------------------
+def iter_festivals(csv_path=None, region=None):
+    """
+    축제 CSV 를 한 줄씩 읽어 축제 딕셔너리를 yield 합니다. (region 을 주면 그 광역자치단체만)
+    {"id", "region", "city", "name", "type", "start", "end"}
+    """
+    with open(csv_path or FESTIVAL_CSV_PATH, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            festival = {key: " ".join((row.get(column) or "").split()) for key, column in COLUMNS.items()}
+            if not festival["name"]:
+                continue
+            if region and festival["region"] != region:
+                continue
+            yield festival
+
+
+def festival_keywords(festival, max_keywords=MAX_KEYWORDS_PER_FESTIVAL):
+    """
+    축제 하나의 검색 키워드 그룹을 만듭니다. 첫 번째가 대표 키워드입니다.
+    예: "제11회 치악산한우 축제" (원주시) → ["치악산한우 축제", "치악산한우축제", "원주 치악산한우 축제"]
+    """
+    name = _YEAR_PREFIX.sub("", festival["name"]).strip() or festival["name"]
+    keywords = [name, name.replace(" ", "")]
+    city = _CITY_SUFFIX.sub("", festival.get("city") or "")
+    if city and city not in name:
+        keywords.append(f"{city} {name}")
+    return list(dict.fromkeys(keywords))[:max_keywords]
+
+
+# ----------------------------------------------------
+# 2. 조회 방식 (Google 트렌드 / 네이버 데이터랩)
+# ----------------------------------------------------
+class GoogleTrendsFetcher:
+    """
+    축제 하나씩 Google 트렌드 관심도를 조회합니다. (캐시/속도 제한/429 재시도는 trends_service)
+    """
+
+    name = "google"
+    batch_size = 1
+
+    def __init__(self, days=COLLECT_TIMEFRAME_DAYS, geo="KR"):
+        self.days = days
+        self.geo = geo
+
+    def fingerprint(self):
+        return f"{self.name}:{self.days}:{self.geo}"
+
+    def fetch(self, festivals):
+        festival = festivals[0]
+        keywords = festival_keywords(festival)
+        # (trend_store 에 이미 있는 날짜는 다시 요청하지 않음)
+        frame = get_trends_service().interest_series(keywords, days=self.days, geo=self.geo)
+        rows = []
+        for keyword in frame.columns:
+            for date, value in frame[keyword].items():
+                rows.append((festival, keyword, date, value))
+        return rows
+
+
+class NaverDatalabFetcher:
+    """
+    네이버 데이터랩 검색어 트렌드로 조회합니다. 한 요청에 축제(키워드 그룹) 5개까지 같이 보냅니다.
+    (ratio 는 같은 요청에 들어간 그룹 중 최댓값 100 기준)
+    """
+
+    name = "naver"
+    batch_size = 5
+
+    def __init__(self, days=COLLECT_TIMEFRAME_DAYS, client_id=None, client_secret=None):
+        self.days = days
+        self.client_id = client_id or os.getenv("NAVER_CLIENT_ID")
+        self.client_secret = client_secret or os.getenv("NAVER_CLIENT_SECRET")
+        if not self.client_id or not self.client_secret:
+            raise ValueError("NAVER_CLIENT_ID / NAVER_CLIENT_SECRET이 없어 데이터랩을 사용할 수 없습니다.")
+
+    def fingerprint(self):
+        return f"{self.name}:{self.days}"
+
+    def fetch(self, festivals):
+        # (그룹 이름은 축제 연번 - 이름이 같은 축제가 있어도 결과를 구분할 수 있도록)
+        groups = [[festival["id"]] + festival_keywords(festival) for festival in festivals]
+        # (같은 묶음을 다시 조회하면 trend_store 에 없는 날짜만 요청)
+        frame = get_naver_datalab_series(self.client_id, self.client_secret, groups, days=self.days)
+        rows = []
+        for festival in festivals:
+            if festival["id"] not in frame.columns:
+                continue
+            keyword = festival_keywords(festival)[0]
+            for date, value in frame[festival["id"]].items():
+                rows.append((festival, keyword, date, value))
+        return rows
+
+
+FETCHERS = {
+    "google": GoogleTrendsFetcher,
+    "naver": NaverDatalabFetcher,
+}
+
+
+# ----------------------------------------------------
+# 3. 체크포인트 (이어서 수집 / 최근에 모은 축제 건너뛰기)
+# ----------------------------------------------------
+class Checkpoint:
+    """
+    다 모은 축제의 키와 수집 시각, 결과가 저장된 중간 파일 이름을 JSONL 로 기록합니다.
+    (중간 파일을 먼저 저장한 뒤 기록하므로, 기록된 축제는 결과가 항상 디스크에 있음)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # (기록 중에 멈춰서 잘린 마지막 줄)
+                    self.entries[entry["key"]] = entry
+
+    def is_current(self, key, max_age_seconds):
+        entry = self.entries.get(key)
+        return entry is not None and time.time() - entry["collected_at"] <= max_age_seconds
+
+    def mark(self, keys, part_name):
+        collected_at = time.time()
+        with open(self.path, "a", encoding="utf-8") as f:
+            for key in keys:
+                entry = {"key": key, "collected_at": collected_at, "part": part_name}
+                self.entries[key] = entry
+                f.write(json.dumps(entry) + "\n")
+
+
+def _festival_key(fetcher, festival):
+    return make_key(fetcher.fingerprint(), festival["id"], festival["name"], *festival_keywords(festival))
+
+
+def _rows_to_frame(rows, collected_at):
+    return pd.DataFrame({
+        "festival_id": [int(f["id"]) if f["id"].isdigit() else -1 for f, _, _, _ in rows],
+        "festival_name": [f["name"] for f, _, _, _ in rows],
+        "region": [f["region"] for f, _, _, _ in rows],
+        "city": [f["city"] for f, _, _, _ in rows],
+        "start_date": pd.to_datetime([f["start"] for f, _, _, _ in rows], errors="coerce"),
+        "end_date": pd.to_datetime([f["end"] for f, _, _, _ in rows], errors="coerce"),
+        "keyword": [keyword for _, keyword, _, _ in rows],
+        "date": pd.to_datetime([date for _, _, date, _ in rows]),
+        "value": pd.Series([value for _, _, _, value in rows], dtype="float32"),
+        "collected_at": pd.Timestamp(collected_at, unit="s"),
+    })
+
+
+# ----------------------------------------------------
+# 4. 수집 / 결과 파일
+# ----------------------------------------------------
+def collect(csv_path=None, work_dir="trend_batch", source="google", concurrency=None, max_age_hours=None,
+            region=None, limit=None, fetcher=None):
+    """
+    축제 CSV 를 읽으며 트렌드를 모아 work_dir 에 중간 파일(Parquet)과 체크포인트로 저장합니다.
+    반환값: {"festivals", "skipped", "collected", "failed", "requests", "rows"}
+    """
+    fetcher = fetcher or FETCHERS[source]()
+    concurrency = COLLECT_CONCURRENCY if concurrency is None else max(1, concurrency)
+    max_age_seconds = (COLLECT_MAX_AGE_HOURS if max_age_hours is None else max_age_hours) * 3600
+    parts_dir = os.path.join(work_dir, "parts")
+    os.makedirs(parts_dir, exist_ok=True)
+    checkpoint = Checkpoint(os.path.join(work_dir, f"checkpoint-{fetcher.name}.jsonl"))
+    stats = {"festivals": 0, "skipped": 0, "collected": 0, "failed": 0, "requests": 0, "rows": 0}
+    buffer_rows, buffer_keys = [], []
+    quota_exceeded = threading.Event()
+
+    def flush():
+        if not buffer_keys:
+            return
+        collected_at = time.time()
+        part_name = f"{fetcher.name}-{datetime.datetime.now():%Y%m%d-%H%M%S}-{len(os.listdir(parts_dir)):05d}.parquet"
+        _rows_to_frame(buffer_rows, collected_at).to_parquet(os.path.join(parts_dir, part_name), index=False)
+        checkpoint.mark(buffer_keys, part_name)
+        print(f"  [trend_collector] 중간 저장: 축제 {len(buffer_keys)}개 → {part_name}")
+        stats["rows"] += len(buffer_rows)
+        buffer_rows.clear()
+        buffer_keys.clear()
+
+    def handle(future, batch):
+        try:
+            rows = future.result()
+        except Exception as e:
+            stats["failed"] += len(batch)
+            names = ", ".join(festival["name"] for festival, _ in batch)
+            print(f"  [trend_collector] 수집 실패 ({names}): {e}")
+            if isinstance(e, QuotaExceededError):
+                quota_exceeded.set()  # (오늘 한도를 다 썼으면 남은 축제는 요청하지 않음 - 다음 실행 때 이어서)
+            return
+        stats["collected"] += len(batch)
+        buffer_rows.extend(rows)
+        buffer_keys.extend(key for _, key in batch)
+        if len(buffer_keys) >= COLLECT_FLUSH_EVERY:
+            flush()
+
+    with instrumentation.stage("trend_collect", source=fetcher.name), \
+            ThreadPoolExecutor(max_workers=concurrency) as pool:
+        running = {}
+        batch = []
+
+        def submit(batch):
+            future = instrumentation.submit_with_context(pool, fetcher.fetch, [festival for festival, _ in batch])
+            running[future] = batch
+            stats["requests"] += 1
+            # (CSV 를 끝까지 미리 읽어 두지 않도록, 진행 중인 요청이 concurrency 개를 넘으면 하나 끝날 때까지 대기)
+            while len(running) >= concurrency:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    handle(future, running.pop(future))
+
+        for festival in iter_festivals(csv_path, region):
+            if limit is not None and stats["festivals"] >= limit:
+                break
+            if quota_exceeded.is_set():
+                print("  [trend_collector] 호출 한도를 다 써서 수집을 멈춥니다. (다음 실행 때 이어서 수집)")
+                batch = []
+                break
+            stats["festivals"] += 1
+            key = _festival_key(fetcher, festival)
+            if checkpoint.is_current(key, max_age_seconds):
+                stats["skipped"] += 1
+                continue
+            batch.append((festival, key))
+            if len(batch) >= fetcher.batch_size:
+                submit(batch)
+                batch = []
+        if batch:
+            submit(batch)
+        for future in list(running):
+            handle(future, running.pop(future))
+        flush()
+        instrumentation.add_counters(**{f"festivals_{k}": v for k, v in stats.items() if k != "festivals"})
+    return stats
+
+
+def write_output(work_dir, output_path, source="google"):
+    """
+    중간 파일들을 합쳐 축제별 '가장 최근에 모은' 결과만 남긴 하나의 열 기반 파일로 저장합니다.
+    확장자가 .feather 면 Feather, 그 외는 Parquet. 반환값: 저장한 행 수
+    """
+    checkpoint = Checkpoint(os.path.join(work_dir, f"checkpoint-{source}.jsonl"))
+    latest_parts = {entry["part"] for entry in checkpoint.entries.values()}
+    frames = [
+        pd.read_parquet(path)
+        for path in sorted(glob.glob(os.path.join(work_dir, "parts", f"{source}-*.parquet")))
+        if os.path.basename(path) in latest_parts
+    ]
+    if not frames:
+        return 0
+    combined = pd.concat(frames, ignore_index=True)
+    # (같은 축제를 여러 번 모았으면 마지막 수집분만)
+    latest = combined.groupby(["festival_id", "festival_name"])["collected_at"].transform("max")
+    combined = combined[combined["collected_at"] == latest].reset_index(drop=True)
+    if output_path.endswith(".feather"):
+        combined.to_feather(output_path)
+    else:
+        combined.to_parquet(output_path, index=False)
+    return len(combined)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="축제 목록(CSV)의 모든 축제에 대해 검색 트렌드를 모아 Parquet/Feather 로 저장합니다.")
+    parser.add_argument("--csv", default=FESTIVAL_CSV_PATH, help="축제 목록 CSV 경로")
+    parser.add_argument("--source", choices=sorted(FETCHERS), default="google", help="트렌드 데이터 출처")
+    parser.add_argument("--out", default="festival_trends.parquet", help="결과 파일 경로 (.parquet 또는 .feather)")
+    parser.add_argument("--work-dir", default="trend_batch", help="중간 파일/체크포인트 폴더")
+    parser.add_argument("--concurrency", type=int, default=COLLECT_CONCURRENCY, help="동시에 진행하는 요청 수")
+    parser.add_argument("--max-age", type=float, default=COLLECT_MAX_AGE_HOURS, help="이 시간(시간 단위) 안에 모은 축제는 건너뜀")
+    parser.add_argument("--region", help="이 광역자치단체의 축제만 (예: 강원)")
+    parser.add_argument("--limit", type=int, help="CSV 앞에서부터 이 개수의 축제만")
+    args = parser.parse_args()
+
+    print(f"--- [trend_collector] '{args.csv}' 축제 트렌드 수집 시작 (출처: {args.source}, 동시 {args.concurrency}개) ---")
+    started = time.perf_counter()
+    stats = collect(args.csv, args.work_dir, args.source, args.concurrency, args.max_age, args.region, args.limit)
+    rows = write_output(args.work_dir, args.out, args.source)
+    print(f"--- [trend_collector] 완료: 축제 {stats['festivals']}개 중 새로 수집 {stats['collected']}개, "
+          f"최근 수집분 재사용 {stats['skipped']}개, 실패 {stats['failed']}개 "
+          f"({time.perf_counter() - started:.1f}초) → {args.out} ({rows}행) ---")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,63 @@
-import requests
-import json
 import datetime
 import os  # .env 파일을 읽기 위해 os 라이브러리 추가
 from dotenv import load_dotenv  # .env 파일을 로드하는 함수 추가
+import pandas as pd
+from naver_datalab import DatalabClient, QuotaExceededError
+from trend_store import get_trend_store
 
-def get_naver_datalab_trend(client_id, client_secret, keywords_groups):
+def get_naver_datalab_trend(client_id, client_secret, keywords_groups, start_date=None, end_date=None):
     """
     네이버 데이터랩 API를 호출하여 키워드 트렌드 데이터를 가져오는 함수입니다.
-    (함수 내용은 이전과 동일합니다)
+    (기간을 주지 않으면 최근 90일 / 그룹이 5개를 넘으면 나눠서 동시에 요청 - naver_datalab.DatalabClient)
     """
-    
-    url = "https://openapi.naver.com/v1/datalab/search"
-    headers = {
-        "X-Naver-Client-Id": client_id,
-        "X-Naver-Client-Secret": client_secret,
-        "Content-Type": "application/json"
-    }
-    end_date = datetime.date.today().strftime("%Y-%m-%d")
-    start_date = (datetime.date.today() - datetime.timedelta(days=90)).strftime("%Y-%m-%d")
-
-    body = {
-        "startDate": start_date,
-        "endDate": end_date,
-        "timeUnit": "date",
-        "keywordGroups": [
-            {
-                "groupName": group[0],
-                "keywords": group[1:]
-            } for group in keywords_groups
-        ]
-    }
-
     try:
-        response = requests.post(url, headers=headers, data=json.dumps(body))
-        
-        if response.status_code == 200:
-            print(" 네이버 데이터랩 API 호출 성공!")
-            return response.json()
-        else:
-            print(f" 오류 발생: {response.status_code}")
-            print(f"오류 메시지: {response.text}")
-            return None
-            
+        client = DatalabClient(client_id, client_secret)
+        response = client.search(keywords_groups, start_date, end_date)
+        print(f" 네이버 데이터랩 API 호출 성공! (오늘 남은 호출: {client.remaining()}회)")
+        return response
+
+    except QuotaExceededError as e:
+        print(f" 호출 한도 초과: {e}")
+        return None
     except Exception as e:
         print(f" API 요청 중 예외 발생: {e}")
         return None
 
+def datalab_to_frame(response):
+    """
+    데이터랩 응답을 DataFrame (index = 날짜, columns = 그룹 이름, 값 = ratio) 으로 바꿉니다.
+    """
+    series = {
+        result["title"]: pd.Series(
+            [point["ratio"] for point in result["data"]],
+            index=pd.to_datetime([point["period"] for point in result["data"]]),
+            dtype=float,
+        )
+        for result in (response or {}).get("results", [])
+    }
+    frame = pd.DataFrame(series).fillna(0.0)  # (검색량이 없는 날은 응답에서 빠짐)
+    frame.index.name = "date"
+    # (그룹이 5개를 넘어 여러 요청으로 나뉘었으면 요청마다 최댓값 = 100 이므로, 저장소가 묶음별로 배율을 맞추도록 표시)
+    frame.attrs["batches"] = {result["title"]: result.get("batch", 0) for result in (response or {}).get("results", [])}
+    return frame
+
+
+def get_naver_datalab_series(client_id, client_secret, keywords_groups, days=90, store=None):
+    """
+    최근 days 일의 데이터랩 시계열을 DataFrame 으로 반환합니다.
+    로컬 저장소(trend_store)에 이미 있는 날짜는 요청하지 않고, 모자란 날짜만 받아서 합칩니다.
+    (매일 새로 고침하면 90일 전체가 아니라 하루치 + 배율 맞추기용 며칠만 요청)
+    """
+    store = store or get_trend_store()
+    end = datetime.date.today()
+    start = end - datetime.timedelta(days=days)
+
+    def fetch(fetch_start, fetch_end):
+        # (한도 초과/요청 실패는 예외 그대로 - 일괄 수집(trend_collector)이 한도 초과를 보고 멈출 수 있도록)
+        return datalab_to_frame(DatalabClient(client_id, client_secret).search(keywords_groups, fetch_start, fetch_end))
+
+    return store.refresh("naver", keywords_groups, start, end, fetch)
+
 # --- [여기서부터 실제 코드 실행] ---
 if __name__ == "__main__":
     
@@ -0,0 +1,242 @@
+# trend_store.py
+# (네이버 데이터랩 / Google 트렌드 시계열을 로컬 SQLite 에 쌓아 두고, 모자란 날짜만 받아 오는 저장소)
+#
+# 매일 최근 90일을 통째로 다시 받는 대신:
+#   1. 저장된 기간을 보고 '없는 날짜'만 요청합니다. (앞쪽 며칠(overlap_days)은 겹치게 요청)
+#   2. 두 서비스 모두 '요청한 기간 안에서 최댓값 = 100' 으로 정규화해서 주므로,
+#      겹치는 날짜의 값 합이 같아지도록 새로 받은 값의 배율을 맞춘 뒤 합칩니다.
+#   3. 읽을 때는 DataFrame 또는 NumPy 배열로 돌려줍니다. (normalize=True 면 읽은 기간의 최댓값 = 100)
+#
+# 사용 예:
+#   store = TrendStore()
+#   frame = store.refresh("naver", groups, start, end, fetch=lambda s, e: ...)
+#   dates, names, values = store.read_arrays("naver", groups)
+
+import datetime
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from disk_cache import CACHE_ROOT, make_key
+
+# --- 저장소 설정 (.env 또는 환경 변수로 변경 가능) ---
+TREND_STORE_PATH = os.getenv("TREND_STORE_PATH", os.path.join(CACHE_ROOT, "trend_store.sqlite"))
+TREND_OVERLAP_DAYS = int(os.getenv("TREND_OVERLAP_DAYS", 7))  # 배율을 맞추기 위해 겹쳐서 다시 받는 날 수
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    series_id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    series_key TEXT NOT NULL UNIQUE,
+    groups TEXT NOT NULL,
+    geo TEXT NOT NULL DEFAULT '',
+    covered_start TEXT,
+    covered_end TEXT,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS points (
+    series_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (series_id, name, date)
+) WITHOUT ROWID;
+"""
+
+
+def _day(value):
+    return pd.Timestamp(value).date()
+
+
+def series_key(source, groups, geo=""):
+    """
+    시계열 묶음의 키. groups 는 한 번에 요청하는 키워드 그룹 목록입니다. (순서도 요청의 일부로 취급)
+    (데이터랩: [[그룹이름, 키워드...], ...] / Google: [키워드, ...])
+    """
+    return make_key(source, geo, json.dumps(groups, ensure_ascii=False))
+
+
+class TrendStore:
+    """
+    SQLite 시계열 저장소입니다. 여러 스레드에서 같이 써도 됩니다. (연결 하나 + 잠금)
+    """
+
+    def __init__(self, path=None):
+        self.path = path or TREND_STORE_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------------------------------
+    # 내부 도우미
+    # ---------------------------------
+    def _series(self, source, groups, geo, create=False):
+        key = series_key(source, groups, geo)
+        row = self._conn.execute(
+            "SELECT series_id, covered_start, covered_end FROM series WHERE series_key = ?", (key,)
+        ).fetchone()
+        if row is None and create:
+            cursor = self._conn.execute(
+                "INSERT INTO series (source, series_key, groups, geo) VALUES (?, ?, ?, ?)",
+                (source, key, json.dumps(groups, ensure_ascii=False), geo),
+            )
+            row = (cursor.lastrowid, None, None)
+        return row
+
+    def _read_frame(self, series_id, start=None, end=None):
+        query = "SELECT name, date, value FROM points WHERE series_id = ?"
+        params = [series_id]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(str(_day(start)))
+        if end is not None:
+            query += " AND date <= ?"
+            params.append(str(_day(end)))
+        rows = self._conn.execute(query, params).fetchall()
+        if not rows:
+            return pd.DataFrame()
+        long = pd.DataFrame(rows, columns=["name", "date", "value"])
+        frame = long.pivot(index="date", columns="name", values="value")
+        frame.index = pd.DatetimeIndex(pd.to_datetime(frame.index), name="date")
+        frame.columns.name = None
+        return frame.sort_index()
+
+    # ---------------------------------
+    # 조회 / 저장
+    # ---------------------------------
+    def coverage(self, source, groups, geo=""):
+        """
+        저장된 기간 (시작일, 종료일) 을 반환합니다. 없으면 None.
+        """
+        with self._lock:
+            row = self._series(source, groups, geo)
+        if row is None or row[1] is None:
+            return None
+        return _day(row[1]), _day(row[2])
+
+    def missing_range(self, source, groups, start, end, geo="", overlap_days=None):
+        """
+        [start, end] 를 채우려면 요청해야 하는 기간 (요청 시작일, 요청 종료일) 을 반환합니다. 다 있으면 None.
+        (뒤쪽만 모자라면 overlap_days 만큼 앞에서부터 겹쳐서 요청 → 배율 맞추기용)
+        """
+        overlap_days = TREND_OVERLAP_DAYS if overlap_days is None else overlap_days
+        start, end = _day(start), _day(end)
+        covered = self.coverage(source, groups, geo)
+        if covered is None or start < covered[0] or covered[1] < start:
+            return start, end  # (저장된 것이 없거나 앞쪽이 비면 전체를 다시 받음)
+        if end <= covered[1]:
+            return None
+        return max(start, covered[1] - datetime.timedelta(days=overlap_days - 1)), end
+
+    def upsert(self, source, groups, frame, geo="", rescale=True, batches=None):
+        """
+        받은 시계열(index = 날짜, columns = 그룹/키워드 이름)을 저장합니다.
+        rescale 이면 이미 저장된 날짜와 겹치는 부분의 값 합이 같아지도록 배율을 맞춘 뒤 저장합니다.
+        batches ({이름: 묶음 번호}) 를 주면 묶음마다 따로 배율을 맞춥니다.
+        (데이터랩처럼 한 번에 받은 frame 이 여러 요청으로 나뉘어 요청마다 최댓값 = 100 인 경우)
+        (겹치는 날짜가 없거나 합이 0 이라 배율을 정할 수 없는 묶음은 배율 1 로 그대로 저장 - 저장된 값은 지우지 않음)
+        반환값: {묶음 번호: 적용한 배율}
+        """
+        if frame is None or frame.empty:
+            return {}
+        frame = frame.copy()
+        frame.index = pd.DatetimeIndex(pd.to_datetime(frame.index)).normalize()
+        batches = batches or {}
+        batch_of = {name: batches.get(name, 0) for name in frame.columns}
+        with self._lock, self._conn:
+            series_id, covered_start, covered_end = self._series(source, groups, geo, create=True)
+            scales = {}
+            if rescale and covered_start is not None:
+                stored = self._read_frame(series_id, frame.index.min(), frame.index.max())
+                overlap = stored.index.intersection(frame.index)
+                for batch in sorted(set(batch_of.values())):
+                    names = [name for name in frame.columns if batch_of[name] == batch and name in stored.columns]
+                    stored_sum = stored.loc[overlap, names].to_numpy(dtype=float).sum() if names else 0.0
+                    new_sum = frame.loc[overlap, names].to_numpy(dtype=float).sum() if names else 0.0
+                    # (검색량이 0 인 주가 흔한 키워드는 겹치는 구간이 전부 0 일 수 있음 → 배율 없이 그대로)
+                    scales[batch] = float(stored_sum / new_sum) if stored_sum > 0 and new_sum > 0 else 1.0
+                frame = frame * np.array([scales[batch_of[name]] for name in frame.columns])
+
+            records = [
+                (series_id, str(name), date.strftime("%Y-%m-%d"), float(value))
+                for name in frame.columns
+                for date, value in frame[name].items()
+                if pd.notna(value)
+            ]
+            self._conn.executemany("INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?)", records)
+            new_start = frame.index.min().date() if covered_start is None else min(_day(covered_start), frame.index.min().date())
+            new_end = frame.index.max().date() if covered_end is None else max(_day(covered_end), frame.index.max().date())
+            self._conn.execute(
+                "UPDATE series SET covered_start = ?, covered_end = ?, updated_at = strftime('%s', 'now') WHERE series_id = ?",
+                (str(new_start), str(new_end), series_id),
+            )
+        return scales
+
+    def read(self, source, groups, start=None, end=None, geo="", normalize=False):
+        """
+        저장된 시계열을 DataFrame (index = 날짜, columns = 이름) 으로 반환합니다.
+        normalize 면 읽은 기간 전체의 최댓값이 100 이 되도록 맞춥니다. (서비스가 주는 값과 같은 축)
+        """
+        with self._lock:
+            row = self._series(source, groups, geo)
+            frame = self._read_frame(row[0], start, end) if row is not None else pd.DataFrame()
+        if normalize and not frame.empty:
+            peak = np.nanmax(frame.to_numpy(dtype=float))
+            if peak > 0:
+                frame = frame * (100.0 / peak)
+        return frame
+
+    def read_arrays(self, source, groups, start=None, end=None, geo="", normalize=False):
+        """
+        read 와 같지만 NumPy 로 반환합니다: (날짜 배열 datetime64[D], 이름 리스트, 값 배열 (날짜 수, 이름 수) float64)
+        """
+        frame = self.read(source, groups, start, end, geo, normalize)
+        return frame.index.to_numpy(dtype="datetime64[D]"), list(frame.columns), frame.to_numpy(dtype=np.float64)
+
+    def refresh(self, source, groups, start, end, fetch, geo="", overlap_days=None, normalize=False):
+        """
+        [start, end] 기간이 저장소에 다 있도록 모자란 기간만 fetch(요청 시작일, 요청 종료일) 로 받아 합친 뒤,
+        그 기간을 read 해서 반환합니다. fetch 는 DataFrame (index = 날짜, columns = 이름) 을 반환해야 합니다.
+        (frame.attrs["batches"] 에 {이름: 묶음 번호} 가 있으면 묶음마다 따로 배율을 맞춤 - datalab_to_frame)
+        """
+        missing = self.missing_range(source, groups, start, end, geo, overlap_days)
+        if missing is not None:
+            frame = fetch(*missing)
+            if frame is not None and not frame.empty:
+                self.upsert(source, groups, frame, geo, batches=frame.attrs.get("batches"))
+        return self.read(source, groups, start, end, geo, normalize)
+
+
+# ----------------------------------------------------
+# 공유 저장소
+# ----------------------------------------------------
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_trend_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TrendStore()
+    return _store
+
+
+def set_trend_store(store):
+    """
+    공유 저장소를 바꿔 끼웁니다. (테스트/벤치마크에서 임시 저장소 주입용, None 이면 다음 호출 때 새로 만듦)
+    """
+    global _store
+    with _store_lock:
+        _store = store
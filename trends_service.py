@@ -0,0 +1,283 @@
+# trends_service.py
+# (Google 트렌드(pytrends) 조회를 묶어서 보내고, 캐시하고, 속도를 조절하는 서비스)
+#
+# pytrends 는 한 번에 키워드 5개까지만 비교할 수 있고, 요청이 몰리면 Google 이 429 로 막습니다.
+# - 키워드가 5개를 넘으면 '기준 키워드(anchor)' 1개 + 나머지 4개씩 묶어 여러 번 요청한 뒤,
+#   모든 묶음에 들어 있는 기준 키워드의 값으로 비율을 맞춰 하나의 축(최댓값 100)으로 합칩니다.
+# - 응답은 (키워드 묶음, 기간, 지역) 기준으로 디스크에 캐시합니다. (TRENDS_CACHE_TTL 초 동안 재사용)
+# - 실제 요청은 토큰 버킷으로 분당 TRENDS_RATE_PER_MINUTE 회까지만 보내고,
+#   429 를 받으면 모든 스레드가 같이 지수 백오프로 기다린 뒤 다시 시도합니다.
+#
+# 사용 예:
+#   service = get_trends_service()
+#   frame = service.interest_over_time(["담양 산타 축제", "겨울 축제", ...], timeframe="today 3-m")
+#   related = service.related_queries(["크리스마스", "가족 나들이"])
+
+import datetime
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from pytrends.request import TrendReq
+
+import instrumentation
+from disk_cache import DiskCache, make_key
+from trend_store import get_trend_store
+
+# --- 트렌드 조회 설정 (.env 또는 환경 변수로 변경 가능) ---
+TRENDS_CACHE_TTL = int(os.getenv("TRENDS_CACHE_TTL", 6 * 60 * 60))          # 같은 조회를 재사용할 시간(초)
+TRENDS_RATE_PER_MINUTE = float(os.getenv("TRENDS_RATE_PER_MINUTE", 10))     # 분당 최대 요청 수 (0 이면 제한 없음)
+TRENDS_BURST = int(os.getenv("TRENDS_BURST", 3))                            # 쉬었다가 한꺼번에 보낼 수 있는 요청 수
+TRENDS_MAX_RETRIES = int(os.getenv("TRENDS_MAX_RETRIES", 4))                # 429 재시도 횟수
+TRENDS_BACKOFF_SECONDS = float(os.getenv("TRENDS_BACKOFF_SECONDS", 5))      # 첫 재시도 대기 시간(초)
+TRENDS_MAX_BACKOFF_SECONDS = 120.0
+TRENDS_MAX_CONCURRENCY = int(os.getenv("TRENDS_MAX_CONCURRENCY", 2))        # 동시에 진행하는 묶음 수
+TRENDS_CACHE_MAX_BYTES = int(os.getenv("TRENDS_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+
+DEFAULT_TIMEFRAME = "today 3-m"
+DEFAULT_GEO = "KR"
+MAX_KEYWORDS_PER_PAYLOAD = 5  # (pytrends / Google 트렌드 제한)
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _is_rate_limited(error):
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 429 or "429" in str(error)
+
+
+class TokenBucket:
+    """
+    초당 rate 개씩 토큰이 차는 버킷입니다. (최대 capacity 개)
+    acquire() 는 토큰이 생길 때까지 기다렸다가 하나를 가져갑니다. (여러 스레드에서 같이 사용 가능)
+    penalize(초) 를 부르면 그 시간 동안은 아무도 토큰을 가져가지 못합니다. (429 를 받았을 때)
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def penalize(self, seconds):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+class TrendsService:
+    """
+    Google 트렌드 조회 서비스입니다. (프로그램 전체에서 하나를 같이 쓰는 것을 권장: get_trends_service)
+    """
+
+    def __init__(self, hl="ko-KR", tz=540, geo=DEFAULT_GEO, rate_per_minute=None, burst=None,
+                 ttl=None, max_retries=None, backoff_seconds=None, max_concurrency=None, cache_root=None):
+        self.hl = hl
+        self.tz = tz
+        self.geo = geo
+        rate_per_minute = TRENDS_RATE_PER_MINUTE if rate_per_minute is None else rate_per_minute
+        self.bucket = TokenBucket(rate_per_minute / 60.0, TRENDS_BURST if burst is None else burst)
+        self.ttl = TRENDS_CACHE_TTL if ttl is None else ttl
+        self.max_retries = TRENDS_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_seconds = TRENDS_BACKOFF_SECONDS if backoff_seconds is None else backoff_seconds
+        self.max_concurrency = max(1, max_concurrency or TRENDS_MAX_CONCURRENCY)
+        self.cache = DiskCache("google_trends", max_bytes=TRENDS_CACHE_MAX_BYTES, root=cache_root)
+        self._local = threading.local()
+
+    # ---------------------------------
+    # 내부 도우미
+    # ---------------------------------
+    def _client(self):
+        # (TrendReq 는 만들 때 쿠키를 받으러 요청을 한 번 보내므로 스레드마다 하나를 만들어 재사용)
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = TrendReq(hl=self.hl, tz=self.tz)
+            self._local.client = client
+        return client
+
+    def _cached(self, key):
+        value = self.cache.get(key)
+        if value is None or time.time() - value.get("fetched_at", 0) > self.ttl:
+            return None
+        return value
+
+    def _request(self, kind, keywords, timeframe, geo, call):
+        """
+        캐시를 확인하고, 없으면 속도 제한/429 재시도를 지키며 call(pytrends) 을 실행한 뒤 결과를 캐시합니다.
+        """
+        key = make_key(kind, *keywords, timeframe, geo, self.tz)
+        cached = self._cached(key)
+        if cached is not None:
+            instrumentation.add_counters(trends_cache_hits=1)
+            return cached["data"]
+
+        with instrumentation.stage("google_trends_request", kind=kind, keywords=len(keywords)):
+            for attempt in range(self.max_retries + 1):
+                self.bucket.acquire()
+                try:
+                    client = self._client()
+                    client.build_payload(list(keywords), cat=0, timeframe=timeframe, geo=geo, gprop="")
+                    data = call(client)
+                    break
+                except Exception as e:
+                    if not _is_rate_limited(e) or attempt == self.max_retries:
+                        raise
+                    delay = min(TRENDS_MAX_BACKOFF_SECONDS, self.backoff_seconds * 2 ** attempt) * (0.5 + random.random())
+                    instrumentation.add_counters(trends_retries=1)
+                    print(f"    - [trends_service] 429 (요청 제한) → {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                    self.bucket.penalize(delay)  # (다른 스레드도 같이 기다림)
+
+        self.cache.set(key, {"fetched_at": time.time(), "data": data})
+        return data
+
+    def _payload_interest(self, keywords, timeframe, geo):
+        def call(client):
+            frame = client.interest_over_time()
+            if frame is None or frame.empty:
+                return {"index": [], "values": {}}
+            return {
+                "index": [ts.isoformat() for ts in frame.index],
+                "values": {kw: frame[kw].astype(float).tolist() for kw in keywords if kw in frame.columns},
+            }
+
+        data = self._request("interest", keywords, timeframe, geo, call)
+        index = pd.DatetimeIndex(pd.to_datetime(data["index"]), name="date")
+        return pd.DataFrame({kw: data["values"].get(kw, [0.0] * len(index)) for kw in keywords}, index=index)
+
+    def _map(self, func, items):
+        if not items:
+            return []  # (작업 수 0 으로 스레드 풀을 만들면 ValueError)
+        if len(items) == 1:
+            return [func(items[0])]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items))) as pool:
+            futures = [instrumentation.submit_with_context(pool, func, item) for item in items]
+            return [future.result() for future in futures]
+
+    # ---------------------------------
+    # 조회
+    # ---------------------------------
+    def interest_over_time(self, keywords, timeframe=DEFAULT_TIMEFRAME, geo=None, anchor=None):
+        """
+        키워드 개수와 상관없이 시간별 관심도를 하나의 축(전체 최댓값 100)으로 반환합니다.
+        반환값: DataFrame (index = 날짜, columns = 키워드 (입력 순서), 값 = 0~100 float)
+
+        anchor: 모든 묶음에 같이 넣을 기준 키워드 (없으면 첫 번째 키워드)
+                (너무 인기 많은 키워드를 기준으로 하면 나머지 값이 0 근처로 뭉개지므로, 중간 정도 키워드가 좋음)
+        """
+        geo = self.geo if geo is None else geo
+        keywords = list(dict.fromkeys(keywords))
+        if not keywords:
+            return pd.DataFrame()
+        if len(keywords) <= MAX_KEYWORDS_PER_PAYLOAD:
+            return self._payload_interest(keywords, timeframe, geo)
+
+        anchor = anchor or keywords[0]
+        others = [kw for kw in keywords if kw != anchor]
+        payloads = [[anchor] + chunk for chunk in _chunks(others, MAX_KEYWORDS_PER_PAYLOAD - 1)]
+        frames = self._map(lambda payload: self._payload_interest(payload, timeframe, geo), payloads)
+
+        # (묶음마다 따로 100 기준으로 정규화돼 있으므로, 기준 키워드의 합이 첫 묶음과 같아지도록 배율을 맞춤)
+        reference = frames[0][anchor].sum()
+        if reference <= 0:
+            raise ValueError(f"기준 키워드 '{anchor}' 의 검색량이 없어 묶음끼리 비교할 수 없습니다. (다른 anchor 를 지정하세요)")
+        combined = frames[0].copy()
+        for frame in frames[1:]:
+            anchor_sum = frame[anchor].sum()
+            scale = reference / anchor_sum if anchor_sum > 0 else float("nan")
+            combined = combined.join(frame.drop(columns=[anchor]) * scale, how="outer")
+
+        peak = combined.max().max()
+        if peak > 0:
+            combined = combined * (100.0 / peak)
+        return combined[keywords].round(2)
+
+    def interest_series(self, keywords, days=90, geo=None, anchor=None, store=None):
+        """
+        최근 days 일의 관심도를 반환합니다. (반환 형식은 interest_over_time 과 같음)
+        로컬 저장소(trend_store)에 이미 있는 날짜는 요청하지 않고, 모자란 날짜만 받아서 합칩니다.
+        (Google 은 269일 이하 기간만 일 단위로 주므로 days 는 그 안에서 사용)
+        """
+        geo = self.geo if geo is None else geo
+        keywords = list(dict.fromkeys(keywords))
+        store = store or get_trend_store()
+        end = datetime.date.today()
+        start = end - datetime.timedelta(days=days)
+
+        def fetch(fetch_start, fetch_end):
+            return self.interest_over_time(keywords, timeframe=f"{fetch_start} {fetch_end}", geo=geo, anchor=anchor)
+
+        frame = store.refresh("google", keywords, start, end, fetch, geo=geo, normalize=True)
+        return frame[[kw for kw in keywords if kw in frame.columns]].round(2) if not frame.empty else frame
+
+    def related_queries(self, keywords, timeframe=DEFAULT_TIMEFRAME, geo=None):
+        """
+        키워드별 연관 검색어를 반환합니다. (5개씩 묶어서 요청)
+        반환값: {키워드: {"top": [{"query": ..., "value": ...}, ...], "rising": [...]}}
+        """
+        geo = self.geo if geo is None else geo
+        keywords = list(dict.fromkeys(keywords))
+
+        def fetch(payload):
+            def call(client):
+                related = client.related_queries() or {}
+                result = {}
+                for kw in payload:
+                    entry = related.get(kw) or {}
+                    result[kw] = {
+                        kind: (entry.get(kind).to_dict("records") if entry.get(kind) is not None else [])
+                        for kind in ("top", "rising")
+                    }
+                return result
+
+            return self._request("related", payload, timeframe, geo, call)
+
+        results = {}
+        for part in self._map(fetch, _chunks(keywords, MAX_KEYWORDS_PER_PAYLOAD)):
+            results.update(part)
+        return results
+
+
+# ----------------------------------------------------
+# 공유 서비스 (속도 제한은 프로그램 전체에서 같이 지켜야 하므로 하나만 사용)
+# ----------------------------------------------------
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_trends_service():
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = TrendsService()
+    return _service
+
+
+def set_trends_service(service):
+    """
+    공유 서비스를 바꿔 끼웁니다. (테스트/벤치마크에서 가짜 서비스 주입용, None 이면 다음 호출 때 새로 만듦)
+    """
+    global _service
+    with _service_lock:
+        _service = service
@@ -2,83 +2,322 @@
 
 # visual_analyzer.py
 
-import requests
-from colorthief import ColorThief
-import io  # 이미지를 파일이 아닌 '메모리'에서 처리하기 위해 필요합니다.
-
-# --- (1. 크롤링을 시뮬레이션할 테스트용 이미지 URL 리스트) ---
-# (나중에 이 리스트를 '진짜 크롤링' 결과물로 교체할 겁니다)
-SAMPLE_IMAGE_URLS = [
-    # 1. 따뜻한 베이지/갈색 톤의 실내 이미지
-    "https://images.pexels.com/photos/271816/pexels-photo-271816.jpeg",
-    # 2. 파란색/녹색 톤의 자연(폭포) 이미지
-    "https://images.pexels.com/photos/3225517/pexels-photo-3225517.jpeg",
-    # 3. 강렬한 붉은색/검은색 톤의 도시(네온) 이미지
-    "https://images.pexels.com/photos/1654498/pexels-photo-1654498.jpeg"
-]
-
-def get_dominant_colors(image_urls):
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import image_dedup
+import image_sources
+import instrumentation
+import palette_engine
+from http_clients import get_http_session
+from image_cache import ImageCache
+from image_sources import SAMPLE_IMAGE_URLS  # (예전 코드 호환용)
+
+# --- 이미지 분석 설정 (.env 또는 환경 변수로 변경 가능) ---
+IMAGE_DOWNLOAD_WORKERS = int(os.getenv("IMAGE_DOWNLOAD_WORKERS", 8))   # 동시에 받는 이미지 수
+IMAGE_DOWNLOAD_TIMEOUT = float(os.getenv("IMAGE_DOWNLOAD_TIMEOUT", 10))
+COLOR_WORKERS = int(os.getenv("COLOR_WORKERS", min(4, os.cpu_count() or 1)))  # 색상 추출 프로세스 수
+# 이 이미지 수보다 적으면 프로세스를 띄우는 비용이 더 크므로 현재 프로세스에서 처리
+COLOR_PARALLEL_MIN_IMAGES = int(os.getenv("COLOR_PARALLEL_MIN_IMAGES", 4))
+
+# 받은 이미지/계산한 팔레트 캐시 (팔레트 설정이 바뀌면 다시 계산되도록 설정값을 키에 포함)
+_image_cache = ImageCache(palette_key=(
+    f"numpy-kmeans:{palette_engine.PALETTE_SIZE}:{palette_engine.ANALYSIS_SIZE}:{palette_engine.KMEANS_ITERATIONS}"
+))
+
+
+def _download_image(session, url, use_cache=True):
     """
-    이미지 URL 리스트를 받아서, 각 이미지의 '주요 색상'을
-    HEX 코드(예: '#FF0000') 리스트로 반환합니다.
+    1. 이미지 데이터를 인터넷에서 다운로드 (공유 세션의 연결 풀 사용)
+    반환값: (이미지 bytes, 내용 해시 또는 None, 상태)
+    캐시를 쓰면 TTL 안의 이미지는 받지 않고, 지난 이미지는 바뀌었는지만 확인합니다. (image_cache)
     """
-    print("  [get_dominant_colors] 이미지 URL에서 색상 추출 시작...")
-    palette = []
-    
-    for url in image_urls:
+    if use_cache:
+        return _image_cache.fetch(session, url, timeout=IMAGE_DOWNLOAD_TIMEOUT)
+    response = session.get(url, timeout=IMAGE_DOWNLOAD_TIMEOUT)  # 10초 이상 걸리면 중단
+    response.raise_for_status()  # HTTP 오류(404 등)가 있으면 예외 발생
+    return response.content, None, "downloaded"
+
+
+def _image_palette(image_bytes):
+    """
+    (워커 프로세스에서 실행) 이미지를 분석 크기로 줄인 뒤 상위 색상과 비율을 반환합니다. (palette_engine)
+    """
+    return palette_engine.extract_palette(image_bytes)
+
+
+def _perceptual_hashes(image_bytes, content_hash, use_cache):
+    """
+    이미지의 지각 해시(aHash/dHash)를 반환합니다. 같은 내용이면 캐시에 저장해 둔 값을 씁니다. (실패하면 None)
+    """
+    if use_cache and content_hash:
+        cached = _image_cache.get_hashes(content_hash)
+        if cached is not None:
+            return cached
+    try:
+        hashes = image_dedup.image_hashes(image_bytes)
+    except Exception:
+        return None  # (디코딩이 안 되는 이미지는 중복 판별 없이 색상 추출 단계에서 실패 처리)
+    if use_cache and content_hash:
+        _image_cache.set_hashes(content_hash, hashes)
+    return hashes
+
+
+def iter_image_palettes(image_urls, download_workers=None, color_workers=None, use_cache=True):
+    """
+    이미지 URL 들을 받아서, 팔레트가 나오는 대로 (순번, URL, 팔레트, 대표 순번) 을 yield 합니다.
+    - image_urls 는 리스트여도 되고, URL 을 찾는 대로 하나씩 내놓는 이터레이터(image_sources)여도 됩니다.
+      (URL 수집은 별도 스레드에서 돌고, 찾은 URL 은 바로 다운로드를 시작)
+    - 팔레트: 실패한 이미지는 None
+    - 대표 순번: 거의 같은 이미지로 판단되어 색상 추출을 생략했으면 그 대표 이미지의 순번, 아니면 None
+      (대표 이미지의 팔레트가 나온 뒤에 같이 yield)
+
+    - 다운로드는 스레드 풀(download_workers)에서 동시에
+    - 받은 직후 지각 해시로 거의 같은 이미지(크기만 다른 포스터 등)를 찾아서, 그 이미지는 색상 추출을 생략하고
+      원래 순서상 앞에 있는 대표 이미지의 팔레트를 같이 씀 (image_dedup)
+      (다운로드가 끝난 순서와 상관없이, 앞 순번 이미지가 모두 색인에 들어간 뒤에 넣어서 대표가 매번 같게 정해짐)
+    - 색상 추출은 받은 이미지부터 바로 프로세스 풀(color_workers)에 넘겨서 병렬로
+    - use_cache 면 새로 받았거나 바뀐 이미지만 다운로드/색상 계산 (image_cache)
+    (※ 프로세스 풀을 쓰므로, 이 함수를 부르는 스크립트는 if __name__ == "__main__": 안에서 실행되어야 합니다)
+    """
+    download_workers = IMAGE_DOWNLOAD_WORKERS if download_workers is None else max(1, download_workers)
+    color_workers = COLOR_WORKERS if color_workers is None else max(1, color_workers)
+    session = get_http_session()  # 같은 호스트(Pexels 등)는 연결을 재사용
+    total = len(image_urls) if hasattr(image_urls, "__len__") else None
+    urls = []      # 순번 -> URL (수집 스레드가 추가)
+    hashes = {}    # 순번 -> 이미지 내용 해시 (팔레트 캐시 키)
+    resolved = {}  # 순번 -> 팔레트 (결과가 나온 대표 이미지)
+    waiting = {}   # 대표 순번 -> [팔레트를 기다리는 중복 이미지 순번...]
+    unindexed = {}  # 순번 -> (지각 해시, 대표가 정해진 뒤 할 일) - 앞 순번이 아직 색인에 안 들어간 이미지
+    next_index = [0]  # 다음에 색인에 넣을 순번
+    duplicates = image_dedup.NearDuplicateIndex()
+    events = queue.Queue()  # (종류, 순번, 값) - 수집 스레드/다운로드/색상 추출 결과가 모두 여기로 모임
+    stopping = threading.Event()
+
+    def collect(download_pool):
+        # (수집 스레드) URL 을 찾는 대로 캐시 확인 → 없으면 다운로드 시작
         try:
-            # 1. 'requests'로 이미지 데이터를 인터넷에서 다운로드
-            print(f"    - 다운로드 중: {url[:50]}...")
-            response = requests.get(url, timeout=10) # 10초 이상 걸리면 중단
-            response.raise_for_status() # HTTP 오류(404 등)가 있으면 예외 발생
-            
-            # 2. 다운로드한 데이터를 '파일'처럼 메모리에 임시 저장
-            image_data_io = io.BytesIO(response.content)
-            
-            # 3. 'ColorThief'로 메모리에 있는 이미지 데이터 분석
-            color_thief = ColorThief(image_data_io)
-            
-            # 4. 이미지의 '주요 색상' 1개를 (R, G, B) 튜플로 가져오기
-            dominant_color_rgb = color_thief.get_color(quality=1)
-            
-            # 5. (R, G, B) 튜플을 '#RRGGBB' HEX 코드 문자열로 변환
-            hex_color = f"#{dominant_color_rgb[0]:02x}{dominant_color_rgb[1]:02x}{dominant_color_rgb[2]:02x}"
-            palette.append(hex_color)
-            
-            print(f"    분석 성공. 주요 색상: {hex_color}")
-            
+            for url in image_urls:
+                if stopping.is_set():
+                    break
+                index = len(urls)
+                urls.append(url)
+                cached = _image_cache.cached_palette_for_url(url) if use_cache else None
+                if cached is not None:
+                    events.put(("cached", index, cached))
+                    continue
+                download = instrumentation.submit_with_context(download_pool, _download_image, session, url, use_cache)
+                download.add_done_callback(lambda future, index=index: events.put(("downloaded", index, future)))
         except Exception as e:
+            if not stopping.is_set():
+                events.put(("source_error", None, e))
+        finally:
+            events.put(("collected", None, len(urls)))
+
+    def record(index, compute_palette):
+        url = urls[index]
+        try:
+            palette = compute_palette()
+            if use_cache and hashes.get(index):
+                _image_cache.set_palette(hashes[index], palette)
+            instrumentation.add_counters(images_ok=1)
+            print(f"    분석 성공: {url[:50]}... 주요 색상: {palette[0]['hex'] if palette else '-'}")
+            return palette
+        except Exception as e:
+            instrumentation.add_counters(images_failed=1)
             print(f"    분석 실패: {url[:50]}... (오류: {e})")
-            
-    # 중복된 색상을 제거하고 리스트로 반환
-    return list(set(palette))
+            return None
+
+    def duplicate_result(index, representative):
+        palette = resolved[representative]
+        if use_cache and hashes.get(index) and palette is not None:
+            _image_cache.set_palette(hashes[index], palette)  # (다음 실행에서는 다운로드도 생략)
+        return index, urls[index], palette, representative
+
+    def resolve(index, palette):
+        # (대표 이미지의 결과가 나오면, 그 팔레트를 기다리던 중복 이미지도 같이 내보냄)
+        resolved[index] = palette
+        return [(index, urls[index], palette, None)] + [
+            duplicate_result(duplicate, index) for duplicate in waiting.pop(index, [])
+        ]
+
+    def find_representative(index, perceptual_hashes, proceed):
+        # (완료 순서가 아니라 순번 순서로 색인에 넣음 → 같은 묶음에서는 항상 가장 앞 순번이 대표)
+        unindexed[index] = (perceptual_hashes, proceed)
+        ready = []
+        while next_index[0] in unindexed:
+            current = next_index[0]
+            next_index[0] += 1
+            current_hashes, current_proceed = unindexed.pop(current)
+            representative = None if current_hashes is None else duplicates.add(current, current_hashes)
+            if representative is not None:
+                instrumentation.add_counters(images_duplicate=1)
+                print(f"    중복 이미지: {urls[current][:50]}... (= {urls[representative][:50]}...)")
+            ready += current_proceed(representative)
+        return ready
+
+    def as_duplicate(index, representative):
+        if representative in resolved:
+            return [duplicate_result(index, representative)]
+        waiting.setdefault(representative, []).append(index)
+        return []
+
+    def process_downloaded(index, image_bytes, representative):
+        nonlocal color_pool
+        cached = _image_cache.get_palette(hashes[index]) if use_cache and hashes[index] else None
+        if representative is not None:
+            return as_duplicate(index, representative)
+        if cached is not None:
+            # (같은 내용의 이미지는 URL 이 달라도 색상 계산 생략)
+            instrumentation.add_counters(images_ok=1, images_cached=1)
+            return resolve(index, cached)
+        if color_pool is None and color_workers > 1 and (total or len(urls)) >= COLOR_PARALLEL_MIN_IMAGES:
+            color_pool = ProcessPoolExecutor(max_workers=color_workers)
+        if color_pool is not None:
+            color_future = color_pool.submit(_image_palette, image_bytes)
+            color_future.add_done_callback(lambda future: events.put(("palette", index, future)))
+            return []
+        return resolve(index, record(index, lambda: _image_palette(image_bytes)))
 
-def analyze_visual_trends(keyword):
+    color_pool = None
+    with instrumentation.stage("get_image_palettes", images=total):
+        collector_pool = ThreadPoolExecutor(max_workers=1)
+        download_pool = ThreadPoolExecutor(max_workers=download_workers)
+        try:
+            instrumentation.submit_with_context(collector_pool, collect, download_pool)
+            collected, finished = None, 0
+            while collected is None or finished < collected:
+                kind, index, value = events.get()
+                ready = []
+                if kind == "collected":
+                    collected = value
+                elif kind == "source_error":
+                    print(f"    이미지 URL 수집 중단: {value} (지금까지 찾은 이미지만 분석)")
+                elif kind == "cached":
+                    hashes[index], palette = value
+                    instrumentation.add_counters(images_ok=1, images_cached=1)
+                    ready = find_representative(
+                        index, _image_cache.get_hashes(hashes[index]),
+                        lambda representative, index=index, palette=palette:
+                            resolve(index, palette) if representative is None else as_duplicate(index, representative),
+                    )
+                elif kind == "palette":
+                    ready = resolve(index, record(index, value.result))
+                elif kind == "downloaded":
+                    try:
+                        image_bytes, content_hash, fetch_status = value.result()
+                    except Exception as e:
+                        instrumentation.add_counters(images_failed=1)
+                        print(f"    다운로드 실패: {urls[index][:50]}... (오류: {e})")
+                        ready = find_representative(index, None, lambda _, index=index: resolve(index, None))
+                    else:
+                        if fetch_status == "downloaded":
+                            instrumentation.add_counters(bytes_downloaded=len(image_bytes))
+                        else:
+                            instrumentation.add_counters(images_revalidated=1)
+                        hashes[index] = content_hash
+                        ready = find_representative(
+                            index, _perceptual_hashes(image_bytes, content_hash, use_cache),
+                            lambda representative, index=index, image_bytes=image_bytes:
+                                process_downloaded(index, image_bytes, representative),
+                        )
+                finished += len(ready)
+                yield from ready
+        finally:
+            # (다 받기 전에 호출한 쪽에서 멈춰도 남은 수집/다운로드는 버리고 돌아감)
+            stopping.set()
+            collector_pool.shutdown(wait=False, cancel_futures=True)
+            download_pool.shutdown(wait=False, cancel_futures=True)
+            if color_pool is not None:
+                color_pool.shutdown(wait=True, cancel_futures=True)
+
+
+def get_image_palettes(image_urls, download_workers=None, color_workers=None, use_cache=True):
+    """
+    이미지 URL 리스트를 받아서, 각 이미지의 팔레트(상위 색상 + 픽셀 비율)를 URL 순서대로 반환합니다.
+    반환값: (팔레트 리스트 (실패한 이미지 자리는 None), 거의 같은 이미지로 묶인 URL 그룹 리스트)
+    (모든 결과가 나올 때까지 기다립니다. 나오는 대로 받으려면 iter_image_palettes)
+    """
+    image_urls = list(image_urls)
+    palettes = [None] * len(image_urls)
+    groups = {}
+    for index, _, palette, representative in iter_image_palettes(image_urls, download_workers, color_workers, use_cache):
+        palettes[index] = palette
+        if representative is not None:
+            groups.setdefault(representative, [representative]).append(index)
+    if groups:
+        print(f"    - 중복 이미지 {sum(len(g) - 1 for g in groups.values())}개는 색상 추출 생략")
+    return palettes, [[image_urls[i] for i in sorted(group)] for _, group in sorted(groups.items())]
+
+
+def get_dominant_colors(image_urls, download_workers=None, color_workers=None):
+    """
+    이미지 URL 리스트를 받아서, 각 이미지의 '주요 색상'을
+    HEX 코드(예: '#FF0000') 리스트로 반환합니다.
+    """
+    print("  [get_dominant_colors] 이미지 URL에서 색상 추출 시작...")
+    palettes, _ = get_image_palettes(image_urls, download_workers, color_workers)
+    # 중복된 색상을 제거하고 (입력 순서를 유지한) 리스트로 반환
+    return list(dict.fromkeys(palette[0]["hex"] for palette in palettes if palette))
+
+
+def _visual_summary(keyword, source_name, results, complete):
+    # results: {순번: (URL, 팔레트, 대표 순번)} → analyze_visual_trends 반환 형식
+    ordered = [results[index] for index in sorted(results)]
+    palettes = [palette for _, palette, _ in ordered]
+    groups = {}
+    for index in sorted(results):
+        representative = results[index][2]
+        if representative is not None:
+            groups.setdefault(representative, [results[representative][0]]).append(results[index][0])
+    return {
+        "analyzed_keyword": keyword,
+        "image_source": source_name,
+        "recommended_colors": list(dict.fromkeys(palette[0]["hex"] for palette in palettes if palette)),
+        # (전체 이미지를 합친 대표 팔레트 - 색상별 비율 포함, 거의 같은 이미지는 대표 이미지만 반영)
+        "color_palette": palette_engine.aggregate_palette(
+            [palette for _, palette, representative in ordered if representative is None]
+        ),
+        "source_image_urls": [url for url, _, _ in ordered],
+        # (거의 같은 이미지로 판단되어 하나로 묶인 URL 들 - 첫 번째가 대표)
+        "duplicate_groups": list(groups.values()),
+        "images_analyzed": sum(1 for palette in palettes if palette),
+        # (False 면 아직 분석 중인 중간 결과)
+        "complete": complete,
+    }
+
+
+def analyze_visual_trends(keyword, source=None, limit=None, on_partial=None):
     """
     [메인 함수] 키워드를 받아 시각 트렌드(색상 등)를 분석합니다.
+
+    source: 이미지 소스 이름("pexels", "sample", "fixture") 또는 소스 객체 (없으면 image_sources 설정대로)
+    limit: 모을 이미지 수 (없으면 IMAGE_SOURCE_LIMIT)
+    on_partial(중간 결과): 이미지 팔레트가 하나 나올 때마다 지금까지의 결과(반환값과 같은 형식)로 호출
+                          (카드뉴스 생성 등 다음 단계가 분석이 끝나기 전에 일부 결과를 먼저 쓸 수 있도록)
     """
     print(f"\n--- [시각 분석 모듈] '{keyword}' 분석 시작 ---")
-    
-    # ----------------------------------------------------
-    # TODO: (미래 과제) 
-    # 여기에 'requests'와 'BeautifulSoup4' (또는 Selenium)를 사용해서
-    # 'keyword'로 Behance/Pinterest를 '진짜' 크롤링하고,
-    # image_urls_to_analyze 리스트를 채우는 코드가 들어가야 함.
-    print("  1. (시뮬레이션) 트렌디한 이미지 URL 수집...")
-    image_urls_to_analyze = SAMPLE_IMAGE_URLS # 지금은 샘플 URL 사용
-    # ----------------------------------------------------
-    
-    print("  2. 수집된 이미지에서 주요 색상 추출...")
-    dominant_colors = get_dominant_colors(image_urls_to_analyze)
-    
+    try:
+        source = image_sources.get_image_source(source)
+    except Exception as e:
+        print(f"  [visual_analyzer] 이미지 소스 준비 실패: {e}")
+        return {"error": f"이미지 소스 오류: {e}"}
+    source_name = getattr(source, "name", type(source).__name__)
+
+    print(f"  1. '{source_name}' 소스에서 이미지 URL 수집 → 찾는 대로 색상 팔레트 추출...")
+    results = {}
+    image_urls = source.iter_image_urls(keyword, limit)
+    for index, url, palette, representative in iter_image_palettes(image_urls):
+        results[index] = (url, palette, representative)
+        if on_partial:
+            on_partial(_visual_summary(keyword, source_name, results, complete=False))
+
     print(f"--- [시각 분석 모듈] 분석 완료 ---")
-    
+
     # 이 모듈의 최종 결과물 (JSON으로 변환될 딕셔너리)
-    return {
-        "analyzed_keyword": keyword,
-        "recommended_colors": dominant_colors,
-        "source_image_urls": image_urls_to_analyze
-    }
+    return _visual_summary(keyword, source_name, results, complete=True)
 
 # --- (3. 이 파일 자체를 테스트하기 위한 실행 코드) ---
 # (다른 파일에서 'import'할 때는 이 부분은 실행되지 않습니다)